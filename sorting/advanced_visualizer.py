@@ -2,18 +2,30 @@
 """
 Advanced Real-Time Sorting Visualizer
 Features: Smooth animations, progress tracking, multiple algorithms, beautiful UI
+
+The algorithm runs on a background thread while the animation plays: its
+events reach the GUI timer through a bounded queue (TraceProducer), and
+each frame applies the events due by then (StreamingTracePlayer).  Long
+sorts start animating at once and never freeze the window.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-import numpy as np
 import time
+from functools import partial
+from itertools import islice
+
+from render_engine import (DEFAULT_FPS, PlaybackSchedule, StreamingTracePlayer,
+                           TimelineControls, TracePlayer, add_playback_arguments, make_chart)
 from sorting_algorithms import ALGORITHMS
-import threading
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.trace import COMPARE, SWAP, WRITE, TraceProducer, decode, record
+
+# matplotlib loads when a visualizer is created, not at import
+plt = lazy_import("matplotlib.pyplot")
+animation = lazy_import("matplotlib.animation")
 
 
 class AdvancedSortingVisualizer:
-    def __init__(self, algorithm_name="bubble"):
+    def __init__(self, algorithm_name="bubble", fig=None):
         """Initialize the advanced visualizer."""
         self.algorithm_name = algorithm_name
         self.algorithm_func = ALGORITHMS.get(algorithm_name)
@@ -22,8 +34,14 @@ class AdvancedSortingVisualizer:
         
         # Setup the plot with better styling
         plt.style.use('seaborn-v0_8')
-        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(14, 10), 
-                                                       gridspec_kw={'height_ratios': [3, 1]})
+        if fig is None:
+            self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(14, 10), 
+                                                           gridspec_kw={'height_ratios': [3, 1]})
+        else:
+            # Redraw on a figure that is already open (the demo runner's window)
+            fig.clear()
+            self.fig = fig
+            self.ax1, self.ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
         
         self.fig.suptitle(f'🎯 {algorithm_name.title()} Sort - Real-Time Visualization', 
                          fontsize=18, fontweight='bold', color='#2E86AB')
@@ -41,6 +59,8 @@ class AdvancedSortingVisualizer:
         # Animation settings
         self.animation_speed = 0.3
         self.pause_between_steps = 0.1
+        self.fps = DEFAULT_FPS
+        self.duration = None  # seconds for the whole sort, if fixed
         
         # Statistics
         self.comparisons = 0
@@ -49,6 +69,8 @@ class AdvancedSortingVisualizer:
         
     def setup_plot(self, arr):
         """Setup the enhanced plot with better styling."""
+        if getattr(self, "chart", None) is not None:
+            self.chart.disconnect()
         # Main sorting visualization
         self.ax1.clear()
         self.ax1.set_facecolor(self.colors['background'])
@@ -68,27 +90,15 @@ class AdvancedSortingVisualizer:
         self.ax2.set_title('Sorting Progress', fontsize=14, fontweight='bold', pad=20)
         self.ax2.grid(True, alpha=0.3)
         
-        # Create bars with enhanced styling
-        x_positions = np.arange(len(arr))
-        self.bars = self.ax1.bar(x_positions, arr, 
-                                color=self.colors['default'],
-                                edgecolor='black', 
-                                linewidth=2, 
-                                alpha=0.8,
-                                width=0.8)
-        
-        # Add value labels with better styling
-        self.value_labels = []
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            height = bar.get_height()
-            label = self.ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                 f'{value}', ha='center', va='bottom', 
-                                 fontweight='bold', fontsize=11,
-                                 bbox=dict(boxstyle="round,pad=0.3", 
-                                          facecolor='white', 
-                                          edgecolor='black', 
-                                          alpha=0.8))
-            self.value_labels.append(label)
+        # Bars with value labels (a raster for large arrays); only changes are redrawn
+        self.chart = make_chart(self.ax1, arr, self.colors,
+                                alphas={'comparing': 1.0, 'swapping': 1.0, 'sorted': 0.9},
+                                bar_kwargs=dict(edgecolor='black', linewidth=2, alpha=0.8, width=0.8),
+                                label_kwargs=dict(fontweight='bold', fontsize=11,
+                                                  bbox=dict(boxstyle="round,pad=0.3",
+                                                            facecolor='white',
+                                                            edgecolor='black',
+                                                            alpha=0.8)))
         
         # Progress bar
         self.progress_bar = self.ax2.bar(0, 0.8, width=0, 
@@ -106,141 +116,253 @@ class AdvancedSortingVisualizer:
         
         plt.tight_layout()
         
-    def update_bars(self, arr, comparing_indices=None, swapping_indices=None, 
-                   sorted_indices=None, progress=0):
-        """Update the visualization with smooth transitions."""
-        # Update bar heights and colors
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            # Smooth height transition
-            current_height = bar.get_height()
-            target_height = value
-            bar.set_height(target_height)
-            
-            # Update colors based on state
-            if comparing_indices and i in comparing_indices:
-                bar.set_color(self.colors['comparing'])
-                bar.set_alpha(1.0)
-            elif swapping_indices and i in swapping_indices:
-                bar.set_color(self.colors['swapping'])
-                bar.set_alpha(1.0)
-            elif sorted_indices and i in sorted_indices:
-                bar.set_color(self.colors['sorted'])
-                bar.set_alpha(0.9)
-            else:
-                bar.set_color(self.colors['default'])
-                bar.set_alpha(0.8)
-            
-            # Update value labels
-            height = bar.get_height()
-            self.value_labels[i].set_position((bar.get_x() + bar.get_width()/2., height + 0.1))
-            self.value_labels[i].set_text(f'{value}')
-        
-        # Update progress bar
+    def update_stats(self, player):
+        """Per-frame hook: refresh progress and counters from the player."""
+        self.comparisons, self.swaps, _, self.passes = player.counts
+        progress = 100 if player.finished else 100 * player.played / max(player.total, 1)
         self.progress_bar[0].set_width(progress)
-        
-        # Update statistics
         self.stats_text.set_text(f'Comparisons: {self.comparisons} | Swaps: {self.swaps} | Passes: {self.passes}')
+        return [self.progress_bar[0], self.stats_text]
         
-        # Force redraw
-        self.fig.canvas.draw()
-        plt.pause(self.pause_between_steps)
+    def finish(self, player):
+        """Show the success message and final statistics."""
+        producer = getattr(player, "producer", None)
+        if producer is not None and (producer.error is not None or producer.output is None):
+            self.show_unavailable(producer.error)
+            return
+        self.ax1.set_title('🎉 Sorting Complete! Array is now sorted!', 
+                          fontsize=16, color='green', fontweight='bold')
+        self.comparisons, self.swaps, _, self.passes = player.counts
+        self.stats_text.set_text(f'✅ Final: Comparisons: {self.comparisons} | Swaps: {self.swaps} | Passes: {self.passes}')
+        self.fig.canvas.draw_idle()
         
-    def visualize_bubble_sort(self, arr):
-        """Enhanced bubble sort visualization with real-time statistics."""
-        arr_copy = arr.copy()
-        n = len(arr_copy)
+    def make_player(self, words):
+        """Build the player that replays words onto the current chart."""
+        return TracePlayer(self.chart, words, speed=self.pause_between_steps,
+                           duration=self.duration, fps=self.fps,
+                           on_frame=self.update_stats, on_finish=self.finish)
         
-        # Setup initial plot
-        self.setup_plot(arr_copy)
-        plt.show(block=False)
+    def show_unavailable(self, error=None):
+        """Title for an algorithm that produced no result (a stub) or failed."""
+        if error is not None:
+            self.ax1.set_title(f'❌ {self.algorithm_name.title()} Sort failed: {error}',
+                              fontsize=16, color='red')
+        else:
+            # Placeholder for algorithms that are not implemented yet
+            self.ax1.set_title(f'🚧 {self.algorithm_name.title()} Sort (Coming Soon!)', 
+                              fontsize=16, color='orange')
+        self.fig.canvas.draw_idle()
         
-        # Reset statistics
-        self.comparisons = 0
-        self.swaps = 0
-        self.passes = 0
+    def make_streaming_player(self, arr):
+        """Start the algorithm on a producer thread and build a player that follows it."""
+        producer = TraceProducer(self.algorithm_func, list(arr)).start()
+        return StreamingTracePlayer(self.chart, producer, speed=self.pause_between_steps,
+                                    duration=self.duration, fps=self.fps,
+                                    on_frame=self.update_stats, on_finish=self.finish)
+        
+    def visualize_sort(self, arr, recorded=None, show=True):
+        """
+        Animate the algorithm on arr with real-time statistics.
+
+        The algorithm runs on a background thread and is played as it
+        produces events.  recorded is an (output, trace) pair from record()
+        to replay instead; with show=False the animation starts without
+        blocking in plt.show().
+        """
+        self.comparisons = self.swaps = self.passes = 0
+        self.setup_plot(arr)
+        if recorded is None:
+            self.player = self.make_streaming_player(arr)
+        elif recorded[0] is None:
+            self.show_unavailable()
+            if show:
+                plt.show()
+            return
+        else:
+            self.player = self.make_player(recorded[1].words)
+        self.player.start()
+        self.controls = TimelineControls(self.player)
+        if show:
+            plt.show()
+
+
+class RaceVisualizer:
+    """
+    Race several algorithms on the same input in one figure.
+
+    Each algorithm gets a lane (its own axes and chart) in a single blitted
+    FuncAnimation.  Lanes advance on a shared operation clock: after tick T
+    every lane has replayed its first T trace events, so a lane that needs
+    fewer compares and writes visibly finishes first.
+    """
+
+    def __init__(self, algorithm_names, clock=time.perf_counter):
+        """Initialize one lane per algorithm."""
+        self.algorithm_names = list(algorithm_names)
+        for name in self.algorithm_names:
+            if name not in ALGORITHMS:
+                raise ValueError(f"Algorithm '{name}' not found")
+        self.clock = clock
+        
+        plt.style.use('seaborn-v0_8')
+        self.fig, axes = plt.subplots(len(self.algorithm_names), 1, squeeze=False,
+                                      figsize=(14, 2.5 * len(self.algorithm_names) + 1.5))
+        self.axes = list(axes[:, 0])
+        self.fig.suptitle('🏁 Sorting Race', fontsize=18, fontweight='bold', color='#2E86AB')
+        
+        self.colors = {
+            'default': '#2E86AB',      # Blue
+            'comparing': '#A23B72',    # Pink
+            'swapping': '#F18F01',     # Orange
+            'sorted': '#C73E1D',       # Red
+            'current': '#7209B7',      # Purple
+            'background': '#F8F9FA'    # Light gray
+        }
         
-        # Track sorted elements
-        sorted_count = 0
+        # Animation settings
+        self.pause_between_steps = 0.1
+        self.fps = DEFAULT_FPS
+        self.duration = None  # seconds for the whole race, if fixed
         
-        for pass_num in range(n - 1):
-            self.passes += 1
-            swapped = False
-            
-            for i in range(n - 1 - pass_num):
-                self.comparisons += 1
-                
-                # Highlight comparing elements
-                comparing = [i, i + 1]
-                progress = ((pass_num * (n - 1) + i) / ((n - 1) * (n - 1))) * 100
-                self.update_bars(arr_copy, comparing_indices=comparing, progress=progress)
-                
-                if arr_copy[i] > arr_copy[i + 1]:
-                    self.swaps += 1
-                    
-                    # Highlight swapping elements
-                    self.update_bars(arr_copy, swapping_indices=comparing, progress=progress)
-                    
-                    # Perform swap with animation
-                    temp = arr_copy[i]
-                    arr_copy[i] = arr_copy[i + 1]
-                    arr_copy[i + 1] = temp
-                    
-                    # Update plot after swap
-                    self.update_bars(arr_copy, swapping_indices=comparing, progress=progress)
-                    swapped = True
-                
-                # Mark elements as sorted if they're in final position
-                if i >= n - 1 - pass_num - sorted_count:
-                    sorted_indices = list(range(n - sorted_count, n))
-                    self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=progress)
-            
-            # Mark the largest element as sorted
-            sorted_count += 1
-            sorted_indices = list(range(n - sorted_count, n))
-            progress = ((pass_num + 1) * (n - 1) / ((n - 1) * (n - 1))) * 100
-            self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=progress)
-            
-            if not swapped:
-                # Array is sorted, mark all as sorted
-                sorted_indices = list(range(n))
-                self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=100)
-                break
+        self.players = {}
+        self._events = {}
+        self.finish_order = []
+        self.tick = 0
+        self.total = 0
+        self.animation = None
         
-        # Final state - all sorted
-        self.update_bars(arr_copy, sorted_indices=list(range(n)), progress=100)
+    def lane_text(self, name, player):
+        """Counter line for one lane."""
+        writes = 2 * player.counts[SWAP] + player.counts[WRITE]
+        text = f'{name.title()}: {player.counts[COMPARE]:,} comparisons | {writes:,} writes'
+        if player.finished:
+            place = self.finish_order.index(name) + 1
+            text += f' | finished #{place} at operation {player.total:,}'
+        return text
         
-        # Success message
-        self.ax1.set_title('🎉 Sorting Complete! Array is now sorted!', 
-                          fontsize=16, color='green', fontweight='bold')
+    def update_lane(self, name, text, player):
+        """Per-frame hook for one lane: refresh its counters."""
+        text.set_text(self.lane_text(name, player))
+        return [text]
         
-        # Final statistics
-        self.stats_text.set_text(f'✅ Final: Comparisons: {self.comparisons} | Swaps: {self.swaps} | Passes: {self.passes}')
+    def setup_plot(self, arr):
+        """Record every algorithm on arr and build its lane."""
+        for player in self.players.values():
+            player.chart.disconnect()
+            player.disconnect()
+        self.players = {}
+        self.finish_order = []
+        self.tick = 0
+        self._events = {}
+        for ax, name in zip(self.axes, self.algorithm_names):
+            ax.clear()
+            ax.set_facecolor(self.colors['background'])
+            ax.set_xlim(-0.5, len(arr) - 0.5)
+            ax.set_ylim(min(arr) - 1, max(arr) + 1)
+            ax.set_ylabel(name.title(), fontsize=12, fontweight='bold')
+            ax.grid(True, alpha=0.3, linestyle='--')
+            text = ax.text(0.01, 0.95, '', transform=ax.transAxes, va='top',
+                           fontsize=11, fontweight='bold',
+                           bbox=dict(boxstyle="round,pad=0.3", facecolor='white',
+                                     edgecolor='black', alpha=0.9))
+            output, trace = record(ALGORITHMS[name], arr)
+            if output is None:
+                # Stubs sit the race out
+                text.set_text(f'{name.title()}: not implemented yet')
+                continue
+            chart = make_chart(ax, arr, self.colors, labels=len(arr) <= 30,
+                               alphas={'comparing': 1.0, 'swapping': 1.0, 'sorted': 0.9},
+                               bar_kwargs=dict(edgecolor='black', linewidth=1, alpha=0.8))
+            self.players[name] = TracePlayer(chart, trace.words,
+                                             on_frame=partial(self.update_lane, name, text))
+            self._events[name] = decode(trace.words)
+        self.axes[-1].set_xlabel('Array Index', fontsize=12, fontweight='bold')
+        self.total = max((player.total for player in self.players.values()), default=0)
+        plt.tight_layout()
         
-        plt.show()
+    def frames(self):
+        """Yield the shared operation tick for each frame."""
+        schedule = PlaybackSchedule(self.total, self.pause_between_steps, self.duration, self.fps)
+        start = None
+        tick = 0
+        # One tick past the longest trace lets the last lanes finish
+        while tick <= self.total:
+            now = self.clock()
+            start = now if start is None else start
+            tick = max(schedule.due(now - start), tick + 1)
+            yield tick
         
-    def visualize_sort(self, arr):
-        """Main method to visualize sorting."""
-        if self.algorithm_name == "bubble":
-            self.visualize_bubble_sort(arr)
-        else:
-            # Placeholder for other algorithms
-            self.setup_plot(arr)
-            self.ax1.set_title(f'🚧 {self.algorithm_name.title()} Sort (Coming Soon!)', 
+    def step(self, tick):
+        """FuncAnimation callback: bring every lane up to tick."""
+        self.tick = tick
+        artists = []
+        for name, player in self.players.items():
+            if player.finished:
+                continue
+            if player.played < player.total:
+                batch = list(islice(self._events[name], tick - player.played))
+                artists += player.step(batch)
+            else:
+                self.finish_order.append(name)
+                artists += player.step(None)
+        if self.players and all(player.finished for player in self.players.values()):
+            self.finish()
+        return artists
+        
+    def finish(self):
+        """Announce the winner once every lane is done."""
+        winner = self.finish_order[0]
+        self.fig.suptitle(f'🏆 {winner.title()} wins in {self.players[winner].total:,} operations',
+                          fontsize=18, fontweight='bold', color='green')
+        self.fig.canvas.draw_idle()
+        
+    def _init(self):
+        artists = []
+        for player in self.players.values():
+            artists += player._init()
+        return artists
+        
+    def visualize_race(self, arr):
+        """Replay every lane on the shared clock in one blitted animation."""
+        self.setup_plot(arr)
+        if not self.players:
+            self.fig.suptitle('🚧 None of these algorithms are implemented yet',
                               fontsize=16, color='orange')
             plt.show()
+            return
+        
+        interval = PlaybackSchedule(self.total, self.pause_between_steps, self.duration,
+                                    self.fps).interval
+        # Animate the counters before the first full draw, as TracePlayer.start() does
+        self._init()
+        self.animation = animation.FuncAnimation(
+            self.fig, self.step, frames=self.frames(), init_func=self._init,
+            interval=interval, blit=True, repeat=False, cache_frame_data=False)
+        plt.show()
 
 
 def main():
     """Main function to run the advanced visualizer."""
     import argparse
+    import random
+    from video_export import add_export_arguments, export_from_args
     
     parser = argparse.ArgumentParser(description="🎨 Advanced Sorting Visualizer")
-    parser.add_argument("--algo", choices=["bubble", "merge", "quick"], default="bubble",
+    parser.add_argument("--algo", choices=ALGORITHMS.names(element_type="int"), default="bubble",
                        help="Algorithm to visualize")
     parser.add_argument("--array", type=str, default="7,1,4,9,2,8,3,6,5",
                        help="Comma-separated array to sort")
+    parser.add_argument("--size", type=int, default=None,
+                       help="Sort a shuffled range of this many elements instead of --array "
+                            "(large arrays are drawn as a raster)")
     parser.add_argument("--speed", type=float, default=0.3,
-                       help="Animation speed (lower = faster)")
+                       help="Seconds per operation (lower = faster)")
+    parser.add_argument("--race", type=str, default=None, metavar="ALGOS",
+                       help="Comma-separated algorithms (or 'all') to race side by side "
+                            "on the same input instead of --algo")
+    
+    add_playback_arguments(parser)
+    add_export_arguments(parser)
     
     args = parser.parse_args()
     
@@ -251,13 +373,43 @@ def main():
         print("Invalid array format. Using default: [7, 1, 4, 9, 2, 8, 3, 6, 5]")
         arr = [7, 1, 4, 9, 2, 8, 3, 6, 5]
     
-    print(f"🎯 Visualizing {args.algo} sort on array: {arr}")
+    shown = arr
+    if args.size:
+        arr = random.sample(range(1, args.size + 1), args.size)
+        shown = f"{args.size} shuffled elements"
+    
+    if args.race:
+        if args.race == "all":
+            names = ALGORITHMS.names(element_type="int")
+        else:
+            names = [n.strip() for n in args.race.split(",")]
+            unknown = [n for n in names if n not in ALGORITHMS]
+            if unknown:
+                parser.error(f"--race: unknown algorithm(s) {', '.join(unknown)}; "
+                             f"choose from {', '.join(ALGORITHMS.names())}")
+        if args.export:
+            parser.error("--export records a single algorithm; it cannot be combined with --race")
+        print(f"🏁 Racing {', '.join(names)} on array: {shown}")
+        visualizer = RaceVisualizer(names)
+        visualizer.fps = args.fps
+        visualizer.duration = args.duration
+        visualizer.pause_between_steps = args.speed
+        visualizer.visualize_race(arr)
+        return
+    
+    if args.export:
+        export_from_args(args, AdvancedSortingVisualizer, arr)
+        return
+    
+    print(f"🎯 Visualizing {args.algo} sort on array: {shown}")
     print(f"⚡ Animation speed: {args.speed}s per step")
     print("🖱️  Close the plot window when done!")
     
     # Create and run visualizer
     try:
         visualizer = AdvancedSortingVisualizer(args.algo)
+        visualizer.fps = args.fps
+        visualizer.duration = args.duration
         visualizer.animation_speed = args.speed
         visualizer.pause_between_steps = args.speed
         visualizer.visualize_sort(arr)
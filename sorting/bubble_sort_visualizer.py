@@ -4,14 +4,18 @@ Final Polished Sorting Visualizer
 Beautiful, smooth animations with professional styling
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-import time
+from render_engine import (DEFAULT_FPS, TimelineControls, TracePlayer, add_playback_arguments,
+                           make_chart)
 from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.trace import record
+
+# matplotlib loads when a visualizer is created, not at import
+plt = lazy_import("matplotlib.pyplot")
 
 
 class FinalSortingVisualizer:
-    def __init__(self, algorithm_name="bubble"):
+    def __init__(self, algorithm_name="bubble", fig=None):
         """Initialize the final visualizer."""
         self.algorithm_name = algorithm_name
         self.algorithm_func = ALGORITHMS.get(algorithm_name)
@@ -20,8 +24,14 @@ class FinalSortingVisualizer:
         
         # Setup the plot with professional styling
         plt.style.use('default')
-        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(14, 10), 
-                                                       gridspec_kw={'height_ratios': [3, 1]})
+        if fig is None:
+            self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(14, 10), 
+                                                           gridspec_kw={'height_ratios': [3, 1]})
+        else:
+            # Redraw on a figure that is already open (the demo runner's window)
+            fig.clear()
+            self.fig = fig
+            self.ax1, self.ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
         
         self.fig.suptitle(f'{algorithm_name.title()} Sort - Real-Time Visualization', 
                          fontsize=18, fontweight='bold', color='#2E86AB')
@@ -39,6 +49,8 @@ class FinalSortingVisualizer:
         # Animation settings
         self.animation_speed = 0.3
         self.pause_between_steps = 0.1
+        self.fps = DEFAULT_FPS
+        self.duration = None  # seconds for the whole sort, if fixed
         
         # Statistics
         self.comparisons = 0
@@ -47,6 +59,8 @@ class FinalSortingVisualizer:
         
     def setup_plot(self, arr):
         """Setup the enhanced plot with professional styling."""
+        if getattr(self, "chart", None) is not None:
+            self.chart.disconnect()
         # Main sorting visualization
         self.ax1.clear()
         self.ax1.set_facecolor(self.colors['background'])
@@ -66,27 +80,15 @@ class FinalSortingVisualizer:
         self.ax2.set_title('Sorting Progress', fontsize=14, fontweight='bold', pad=20)
         self.ax2.grid(True, alpha=0.3)
         
-        # Create bars with enhanced styling
-        x_positions = np.arange(len(arr))
-        self.bars = self.ax1.bar(x_positions, arr, 
-                                color=self.colors['default'],
-                                edgecolor='black', 
-                                linewidth=2, 
-                                alpha=0.8,
-                                width=0.8)
-        
-        # Add value labels with better styling
-        self.value_labels = []
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            height = bar.get_height()
-            label = self.ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                 f'{value}', ha='center', va='bottom', 
-                                 fontweight='bold', fontsize=11,
-                                 bbox=dict(boxstyle="round,pad=0.3", 
-                                          facecolor='white', 
-                                          edgecolor='black', 
-                                          alpha=0.8))
-            self.value_labels.append(label)
+        # Bars with value labels (a raster for large arrays); only changes are redrawn
+        self.chart = make_chart(self.ax1, arr, self.colors,
+                                alphas={'comparing': 1.0, 'swapping': 1.0, 'sorted': 0.9},
+                                bar_kwargs=dict(edgecolor='black', linewidth=2, alpha=0.8, width=0.8),
+                                label_kwargs=dict(fontweight='bold', fontsize=11,
+                                                  bbox=dict(boxstyle="round,pad=0.3",
+                                                            facecolor='white',
+                                                            edgecolor='black',
+                                                            alpha=0.8)))
         
         # Progress bar
         self.progress_bar = self.ax2.bar(0, 0.8, width=0, 
@@ -104,141 +106,73 @@ class FinalSortingVisualizer:
         
         plt.tight_layout()
         
-    def update_bars(self, arr, comparing_indices=None, swapping_indices=None, 
-                   sorted_indices=None, progress=0):
-        """Update the visualization with smooth transitions."""
-        # Update bar heights and colors
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            # Smooth height transition
-            current_height = bar.get_height()
-            target_height = value
-            bar.set_height(target_height)
-            
-            # Update colors based on state
-            if comparing_indices and i in comparing_indices:
-                bar.set_color(self.colors['comparing'])
-                bar.set_alpha(1.0)
-            elif swapping_indices and i in swapping_indices:
-                bar.set_color(self.colors['swapping'])
-                bar.set_alpha(1.0)
-            elif sorted_indices and i in sorted_indices:
-                bar.set_color(self.colors['sorted'])
-                bar.set_alpha(0.9)
-            else:
-                bar.set_color(self.colors['default'])
-                bar.set_alpha(0.8)
-            
-            # Update value labels
-            height = bar.get_height()
-            self.value_labels[i].set_position((bar.get_x() + bar.get_width()/2., height + 0.1))
-            self.value_labels[i].set_text(f'{value}')
-        
-        # Update progress bar
+    def update_stats(self, player):
+        """Per-frame hook: refresh progress and counters from the player."""
+        self.comparisons, self.swaps, _, self.passes = player.counts
+        progress = 100 if player.finished else 100 * player.played / max(player.total, 1)
         self.progress_bar[0].set_width(progress)
-        
-        # Update statistics
         self.stats_text.set_text(f'Comparisons: {self.comparisons} | Swaps: {self.swaps} | Passes: {self.passes}')
+        return [self.progress_bar[0], self.stats_text]
         
-        # Force redraw
-        self.fig.canvas.draw()
-        plt.pause(self.pause_between_steps)
-        
-    def visualize_bubble_sort(self, arr):
-        """Enhanced bubble sort visualization with real-time statistics."""
-        arr_copy = arr.copy()
-        n = len(arr_copy)
-        
-        # Setup initial plot
-        self.setup_plot(arr_copy)
-        plt.show(block=False)
-        
-        # Reset statistics
-        self.comparisons = 0
-        self.swaps = 0
-        self.passes = 0
-        
-        # Track sorted elements
-        sorted_count = 0
-        
-        for pass_num in range(n - 1):
-            self.passes += 1
-            swapped = False
-            
-            for i in range(n - 1 - pass_num):
-                self.comparisons += 1
-                
-                # Highlight comparing elements
-                comparing = [i, i + 1]
-                progress = ((pass_num * (n - 1) + i) / ((n - 1) * (n - 1))) * 100
-                self.update_bars(arr_copy, comparing_indices=comparing, progress=progress)
-                
-                if arr_copy[i] > arr_copy[i + 1]:
-                    self.swaps += 1
-                    
-                    # Highlight swapping elements
-                    self.update_bars(arr_copy, swapping_indices=comparing, progress=progress)
-                    
-                    # Perform swap with animation
-                    temp = arr_copy[i]
-                    arr_copy[i] = arr_copy[i + 1]
-                    arr_copy[i + 1] = temp
-                    
-                    # Update plot after swap
-                    self.update_bars(arr_copy, swapping_indices=comparing, progress=progress)
-                    swapped = True
-                
-                # Mark elements as sorted if they're in final position
-                if i >= n - 1 - pass_num - sorted_count:
-                    sorted_indices = list(range(n - sorted_count, n))
-                    self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=progress)
-            
-            # Mark the largest element as sorted
-            sorted_count += 1
-            sorted_indices = list(range(n - sorted_count, n))
-            progress = ((pass_num + 1) * (n - 1) / ((n - 1) * (n - 1))) * 100
-            self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=progress)
-            
-            if not swapped:
-                # Array is sorted, mark all as sorted
-                sorted_indices = list(range(n))
-                self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=100)
-                break
-        
-        # Final state - all sorted
-        self.update_bars(arr_copy, sorted_indices=list(range(n)), progress=100)
-        
-        # Success message
+    def finish(self, player):
+        """Show the success message and final statistics."""
         self.ax1.set_title('SORTING COMPLETE! Array is now sorted!', 
                           fontsize=16, color='green', fontweight='bold')
-        
-        # Final statistics
+        self.comparisons, self.swaps, _, self.passes = player.counts
         self.stats_text.set_text(f'FINAL: Comparisons: {self.comparisons} | Swaps: {self.swaps} | Passes: {self.passes}')
+        self.fig.canvas.draw_idle()
         
-        plt.show()
+    def make_player(self, words):
+        """Build the player that replays words onto the current chart."""
+        return TracePlayer(self.chart, words, speed=self.pause_between_steps,
+                           duration=self.duration, fps=self.fps,
+                           on_frame=self.update_stats, on_finish=self.finish)
         
-    def visualize_sort(self, arr):
-        """Main method to visualize sorting."""
-        if self.algorithm_name == "bubble":
-            self.visualize_bubble_sort(arr)
-        else:
-            # Placeholder for other algorithms
-            self.setup_plot(arr)
+    def visualize_sort(self, arr, recorded=None, show=True):
+        """
+        Replay the algorithm's recorded trace with real-time statistics.
+
+        recorded is an (output, trace) pair from record() to play instead of
+        recording again; with show=False the animation starts without
+        blocking in plt.show().
+        """
+        output, trace = recorded or record(self.algorithm_func, arr)
+        self.comparisons = self.swaps = self.passes = 0
+        self.setup_plot(arr)
+        if output is None:
+            # Placeholder for algorithms that are not implemented yet
             self.ax1.set_title(f'{self.algorithm_name.title()} Sort (Coming Soon!)', 
                               fontsize=16, color='orange')
+            if show:
+                plt.show()
+            return
+        
+        self.player = self.make_player(trace.words)
+        self.player.start()
+        self.controls = TimelineControls(self.player)
+        if show:
             plt.show()
 
 
 def main():
     """Main function to run the final visualizer."""
     import argparse
+    import random
+    from video_export import add_export_arguments, export_from_args
     
     parser = argparse.ArgumentParser(description="Beautiful Sorting Visualizer")
-    parser.add_argument("--algo", choices=["bubble", "merge", "quick"], default="bubble",
+    parser.add_argument("--algo", choices=ALGORITHMS.names(element_type="int"), default="bubble",
                        help="Algorithm to visualize")
     parser.add_argument("--array", type=str, default="7,1,4,9,2,8,3,6,5",
                        help="Comma-separated array to sort")
+    parser.add_argument("--size", type=int, default=None,
+                       help="Sort a shuffled range of this many elements instead of --array "
+                            "(large arrays are drawn as a raster)")
     parser.add_argument("--speed", type=float, default=0.3,
-                       help="Animation speed (lower = faster)")
+                       help="Seconds per operation (lower = faster)")
+    
+    add_playback_arguments(parser)
+    add_export_arguments(parser)
     
     args = parser.parse_args()
     
@@ -249,13 +183,24 @@ def main():
         print("Invalid array format. Using default: [7, 1, 4, 9, 2, 8, 3, 6, 5]")
         arr = [7, 1, 4, 9, 2, 8, 3, 6, 5]
     
-    print(f"Visualizing {args.algo} sort on array: {arr}")
+    shown = arr
+    if args.size:
+        arr = random.sample(range(1, args.size + 1), args.size)
+        shown = f"{args.size} shuffled elements"
+    
+    if args.export:
+        export_from_args(args, FinalSortingVisualizer, arr)
+        return
+    
+    print(f"Visualizing {args.algo} sort on array: {shown}")
     print(f"Animation speed: {args.speed}s per step")
     print("Close the plot window when done!")
     
     # Create and run visualizer
     try:
         visualizer = FinalSortingVisualizer(args.algo)
+        visualizer.fps = args.fps
+        visualizer.duration = args.duration
         visualizer.animation_speed = args.speed
         visualizer.pause_between_steps = args.speed
         visualizer.visualize_sort(arr)
@@ -1,59 +1,159 @@
 #!/usr/bin/env python3
 """
 Demo script showcasing all the sorting visualizers
+
+Every demo runs in this one process.  matplotlib is imported once, and all
+graphical scenes play in the same window: each visualizer class rebuilds
+its axes on the shared figure instead of opening a new one.  While a scene
+plays, the next scene's trace is recorded on a background thread, so
+switching scenes only costs building the new axes.  Close the window to
+stop the demo.
 """
 
-import subprocess
-import sys
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from advanced_visualizer import AdvancedSortingVisualizer
+from bubble_sort_visualizer import FinalSortingVisualizer
+from selection_sort_visualizer import SelectionSortVisualizer
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.terminal import visualize as visualize_in_terminal
+from sorting_algorithms.trace import record
+from sorting_visualizer import SortingVisualizer
+
+plt = lazy_import("matplotlib.pyplot")
+
+# Seconds a finished scene stays on screen before the next one
+HOLD_SECONDS = 2.0
+
+# Seconds per GUI event-loop slice while waiting for a scene
+POLL_INTERVAL = 0.05
+
+Scene = namedtuple("Scene", ["description", "visualizer", "algorithm", "array", "duration"])
+Scene.__doc__ = """
+One demo.
+
+    description: Heading printed before the scene
+    visualizer: Visualizer class, or None for the terminal view
+    algorithm: Registry name of the algorithm
+    array: Input array
+    duration: Seconds the replay takes (graphical scenes)
+"""
+
+SCENES = (
+    Scene("Basic Text Visualizer (CLI)", None, "bubble", [7, 1, 4, 9, 2, 8, 3, 6, 5], None),
+    Scene("Simple Graphical Visualizer", SortingVisualizer, "bubble", [7, 1, 4, 9, 2], 4),
+    Scene("Advanced Real-Time Visualizer", AdvancedSortingVisualizer, "bubble",
+          [7, 1, 4, 9, 2, 8, 3, 6, 5], 8),
+    Scene("Selection Sort Visualizer", SelectionSortVisualizer, "selection",
+          [7, 1, 4, 9, 2, 8, 3, 6, 5], 6),
+    Scene("Final Polished Visualizer", FinalSortingVisualizer, "bubble",
+          [7, 1, 4, 9, 2, 8, 3, 6, 5], 6),
+)
+
+
+class DemoRunner:
+    """Play scenes one after another in a single process and window."""
+
+    def __init__(self, scenes=SCENES, hold=HOLD_SECONDS):
+        self.scenes = list(scenes)
+        self.hold = hold
+        self.fig = None
+        self.visualizer = None
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+    def preload(self, scene):
+        """Start recording a graphical scene's trace in the background."""
+        if scene.visualizer is None:
+            return None
+        return self._pool.submit(record, ALGORITHMS[scene.algorithm], list(scene.array))
+
+    def run(self):
+        """Play every scene; return False if the window was closed early."""
+        try:
+            pending = self.preload(self.scenes[0]) if self.scenes else None
+            for index, scene in enumerate(self.scenes):
+                recorded = pending.result() if pending is not None else None
+                if index + 1 < len(self.scenes):
+                    pending = self.preload(self.scenes[index + 1])
+                announce(scene)
+                if not self.play(scene, recorded):
+                    return False
+            return True
+        finally:
+            self._pool.shutdown(cancel_futures=True)
 
-def run_visualizer(script_name, description, args=""):
-    """Run a visualizer with the given arguments."""
+    def play(self, scene, recorded):
+        """Play one scene and wait for it; return False if the window was closed."""
+        if scene.visualizer is None:
+            visualize_in_terminal(ALGORITHMS[scene.algorithm], list(scene.array))
+            return True
+        if self.fig is None:
+            self.fig = plt.figure(figsize=(14, 10))
+        self.teardown()
+        self.visualizer = scene.visualizer(scene.algorithm, fig=self.fig)
+        self.visualizer.duration = scene.duration
+        self.visualizer.visualize_sort(list(scene.array), recorded=recorded, show=False)
+        player = getattr(self.visualizer, "player", None)
+        done_at = None
+        while plt.fignum_exists(self.fig.number):
+            if player is None or player.finished:
+                done_at = done_at or time.perf_counter()
+                if time.perf_counter() - done_at >= self.hold:
+                    return True
+            plt.pause(POLL_INTERVAL)
+        return False
+
+    def teardown(self):
+        """Detach the previous scene's chart and player from the shared canvas."""
+        if self.visualizer is None:
+            return
+        player = getattr(self.visualizer, "player", None)
+        if player is not None:
+            if player.animation is not None and player.animation.event_source is not None:
+                player.animation.event_source.stop()
+            player.disconnect()
+        self.visualizer.chart.disconnect()
+        self.visualizer = None
+
+
+def announce(scene):
+    """Print a scene's heading."""
     print(f"\n{'='*60}")
-    print(f"🎨 {description}")
+    print(f"🎨 {scene.description}")
     print(f"{'='*60}")
-    print(f"Running: python {script_name} {args}")
-    print("Close the plot window to continue to the next demo...")
-    
-    try:
-        subprocess.run([sys.executable, script_name] + args.split(), check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {script_name}: {e}")
-    except KeyboardInterrupt:
-        print("Demo interrupted by user")
+
 
 def main():
     """Main demo function."""
     print("🚀 SORTING ALGORITHM VISUALIZER DEMO")
     print("=" * 60)
     print("This demo will showcase different visualization styles:")
-    print("1. Basic text-based visualizer")
-    print("2. Advanced graphical visualizer")
-    print("3. Final polished visualizer")
+    for number, scene in enumerate(SCENES, 1):
+        print(f"{number}. {scene.description}")
+    print("\nAll demos play in one window; close it to stop early.")
     print("\nPress Enter to start the demo...")
     input()
-    
-    # Demo 1: Basic text visualizer
-    run_visualizer("main.py", "Basic Text Visualizer (CLI)", "--algo bubble --visualize")
-    
-    # Demo 2: Simple graphical visualizer
-    run_visualizer("sorting_visualizer.py", "Simple Graphical Visualizer", "--algo bubble --array 7,1,4,9,2")
-    
-    # Demo 3: Advanced visualizer
-    run_visualizer("advanced_visualizer.py", "Advanced Real-Time Visualizer", "--algo bubble --array 7,1,4,9,2,8,3,6,5 --speed 0.4")
-    
-    # Demo 4: Final polished visualizer
-    run_visualizer("final_visualizer.py", "Final Polished Visualizer", "--algo bubble --array 7,1,4,9,2,8,3,6,5 --speed 0.3")
-    
+
+    try:
+        completed = DemoRunner().run()
+    except KeyboardInterrupt:
+        print("Demo interrupted by user")
+        return
+    if not completed:
+        print("Demo window closed")
+        return
+
     print(f"\n{'='*60}")
     print("🎉 DEMO COMPLETE!")
     print(f"{'='*60}")
     print("You've seen all the visualizers:")
-    print("✅ Text-based CLI visualizer")
-    print("✅ Simple graphical visualizer")
-    print("✅ Advanced real-time visualizer")
-    print("✅ Final polished visualizer")
+    for scene in SCENES:
+        print(f"✅ {scene.description}")
     print("\nChoose your favorite and use it for your sorting needs!")
 
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -4,9 +4,16 @@ Entry point to run tests and select algorithm.
 """
 
 import argparse
+import contextlib
 import json
+import os
 import sys
 from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.cache import (MAX_ENTRIES, DatasetStore, ResultCache, algorithm_version,
+                                     content_hash)
+from sorting_algorithms.datasets import load_datasets
+from sorting_algorithms.fileio import FORMATS, read_values, write_values
+from sorting_algorithms.verify import verify_sorted
 
 # Fixed datasets as specified in SPEC.md (exact values; not to be printed by CLI)
 DATASETS = {
@@ -43,7 +50,6 @@ DATASETS = {
 
     # Fixed “random” (deterministic)
     "random5_fixed": [7, 1, 4, 9, 2],
-    "random10_fixed": [12, -3, 7, 7, 0, -11, 25, 4, 4, -3],
 
     # Length variety (odd/even/prime-ish)
     "odd_length": [9, -1, 8, 0, -2],
@@ -53,84 +59,263 @@ DATASETS = {
 
 
 
-def run_algorithm_on_datasets(algorithm_name, algorithm_func, report_type="text", visualize=False):
-    """Run algorithm on all datasets and return results."""
+def run_algorithm_on_datasets(algorithm_name, algorithm_func, report_type="text", visualize=False,
+                              memory=False, datasets=None, oversize="skip", output_sink=None,
+                              profiler=None, cache=None, fps=None):
+    """
+    Run algorithm on all datasets (default: DATASETS) and return results.
+    
+    Datasets the registry marks as unsupported for the algorithm (element
+    type, or longer than its max_n) are skipped.  With oversize="truncate"
+    oversize datasets are cut down to max_n instead.  If given,
+    output_sink(dataset_name, output) receives each verified output, and
+    profiler.run() wraps each algorithm call.  With visualize, each run is
+    drawn live in the terminal at up to fps frames per second; on stderr
+    for the json/ndjson reports, so stdout stays machine-readable.
+    
+    Datasets with identical contents run once; later names reuse the result
+    and record "duplicate_of".  A ResultCache, if given, answers plain runs
+    (no visualize/memory/profiler/output_sink) without calling the algorithm.
+    """
     results = []
+    store = datasets if isinstance(datasets, DatasetStore) else DatasetStore(
+        DATASETS if datasets is None else datasets)
+    spec = ALGORITHMS.spec(algorithm_name)
+    if visualize:
+        from sorting_algorithms.terminal import DEFAULT_FPS, visualize as visualize_run
+        view_stream = sys.stdout if report_type == "text" else sys.stderr
+    if memory:
+        # tracemalloc is only imported when memory reporting is requested
+        from sorting_algorithms.memory import check_memory, measure_memory
+    use_cache = cache is not None and not (visualize or memory or profiler or output_sink)
+    version = algorithm_version(algorithm_func) if use_cache else None
+    first_runs = {}  # content hash -> result of the first dataset with that content
     
-    for dataset_name in DATASETS.keys():
-        dataset = DATASETS[dataset_name]
+    for dataset_name in store:
+        dataset = store[dataset_name]
+        result = {"dataset": dataset_name}
+        
+        if oversize == "truncate" and spec.max_n is not None and len(dataset) > spec.max_n:
+            dataset = dataset[:spec.max_n]
+            result["truncated_to"] = spec.max_n
+        
+        reason = ALGORITHMS.unsupported_reason(algorithm_name, dataset)
+        if reason:
+            result["passed"] = None
+            result["skipped"] = reason
+            if report_type == "text":
+                print(f"ALGO={algorithm_name} DATASET={dataset_name} RESULT=SKIP REASON={reason}")
+            elif report_type == "ndjson":
+                print_record("result", algorithm=algorithm_name, **result)
+            results.append(result)
+            continue
         
-        if visualize:
-            print(f"\n{'='*50}")
-            print(f"Testing {algorithm_name} on {dataset_name} dataset")
-            print(f"{'='*50}")
-            algo_output = algorithm_func(dataset.copy(), visualize=True)
+        input_hash = store.hash(dataset_name) if "truncated_to" not in result else content_hash(dataset)
+        first = first_runs.get(input_hash)
+        cached = cache.get(version, input_hash) if use_cache and first is None else None
+        if first is not None:
+            result.update((k, v) for k, v in first.items() if k not in ("dataset", "duplicate_of", "truncated_to"))
+            result["duplicate_of"] = first["dataset"]
+        elif cached is not None:
+            result.update(cached)
+            result["cached"] = True
         else:
-            algo_output = algorithm_func(dataset.copy())
+            if visualize:
+                print(f"\n{'='*50}", file=view_stream)
+                print(f"Testing {algorithm_name} on {dataset_name} dataset", file=view_stream)
+                print(f"{'='*50}", file=view_stream)
+                algo_output = visualize_run(algorithm_func, dataset.copy(), view_stream,
+                                            fps=fps or DEFAULT_FPS)
+            elif memory:
+                algo_output, memory_stats = measure_memory(algorithm_func, dataset.copy())
+                memory_stats["aux_space"] = spec.space_class
+                memory_stats["deviation"] = check_memory(memory_stats, spec.space_class, len(dataset))
+            elif profiler is not None:
+                algo_output = profiler.run(algorithm_name, dataset_name, algorithm_func, dataset.copy())
+            else:
+                algo_output = algorithm_func(dataset.copy())
             
-        expected = sorted(dataset)
-        passed = algo_output == expected
+            passed = verify_sorted(dataset, algo_output)
+            
+            result["passed"] = passed
+            if passed and output_sink is not None:
+                output_sink(dataset_name, algo_output)
+            if memory and not visualize:
+                result["memory"] = memory_stats
+            if use_cache:
+                cache.put(version, input_hash, {"passed": passed})
+        first_runs.setdefault(input_hash, result)
         
         if report_type == "text":
-            print(f"ALGO={algorithm_name} RESULT={'PASS' if passed else 'FAIL'}")
+            line = f"ALGO={algorithm_name} DATASET={dataset_name} RESULT={'PASS' if result['passed'] else 'FAIL'}"
+            if "memory" in result:
+                line += format_memory(result["memory"])
+            print(line)
+        elif report_type == "ndjson":
+            print_record("result", algorithm=algorithm_name, **result)
         
-        results.append({
-            "dataset": dataset_name,
-            "passed": passed
-        })
+        results.append(result)
     
     return results
 
 
+def summarize(results):
+    """Return (passed, total, skipped) counts; skipped datasets are not in total."""
+    passed_count = sum(1 for r in results if r["passed"] is True)
+    skipped_count = sum(1 for r in results if "skipped" in r)
+    return passed_count, len(results) - skipped_count, skipped_count
+
+
+def format_memory(memory_stats):
+    """Format memory stats as extra fields for a text report line."""
+    fields = (f" PEAK={memory_stats['peak_bytes']} BLOCKS={memory_stats['blocks']}"
+              f" LARGEST={memory_stats['largest_block']} AUX={memory_stats['aux_space']}")
+    if memory_stats["deviation"]:
+        fields += " MEMORY=DEVIATION"
+    return fields
+
+
+def format_analysis(dataset_name, measures):
+    """Format presortedness measures as a text report line."""
+    fields = [f"ANALYSIS DATASET={dataset_name}", f"N={measures['n']}",
+              f"INV={measures['inversions']}", f"INV_RATIO={measures['inversion_ratio']:.3f}",
+              f"RUNS={measures['runs']}", f"DESC_RUNS={measures['descending_runs']}",
+              f"LONGEST_RUN={measures['longest_run']}", f"REM={measures['rem']}",
+              f"OSC={measures['osc']}", f"MAX_DISP={measures['max_displacement']}",
+              f"DISTINCT={measures['distinct']}"]
+    if measures["key_range"] is not None:
+        fields.append(f"RANGE={measures['key_range']}")
+    if measures["sampled"]:
+        fields.append(f"SAMPLED={measures['sampled']}")
+    return " ".join(fields)
+
+
 def print_text_summary(algorithm_name, results):
     """Print text summary for an algorithm."""
-    passed_count = sum(1 for r in results if r["passed"])
-    total_count = len(results)
-    print(f"SUMMARY ALGO={algorithm_name} PASSED={passed_count} TOTAL={total_count}")
+    passed_count, total_count, skipped_count = summarize(results)
+    line = f"SUMMARY ALGO={algorithm_name} PASSED={passed_count} TOTAL={total_count}"
+    if skipped_count:
+        line += f" SKIPPED={skipped_count}"
+    print(line)
 
 
-def print_json_report(algorithms_results):
-    """Print JSON report."""
+def algorithm_summary(results):
+    """Return the JSON summary object for one algorithm's results."""
+    passed_count, total_count, skipped_count = summarize(results)
+    summary = {
+        "passed": passed_count,
+        "total": total_count
+    }
+    if skipped_count:
+        summary["skipped"] = skipped_count
+    if any("memory" in r for r in results):
+        summary["memory_deviations"] = sum(1 for r in results if r.get("memory", {}).get("deviation"))
+    return summary
+
+
+def overall_status(summaries):
+    """Return "OK" if every summary passed all of its datasets, else "FAIL"."""
+    return "OK" if all(s["passed"] == s["total"] for s in summaries) else "FAIL"
+
+
+def print_json_report(algorithms_results, analysis=None):
+    """Print JSON report (with per-dataset presortedness measures, if given)."""
     algorithms_data = []
-    overall_status = "OK"
-    
     for algo_name, results in algorithms_results.items():
-        passed_count = sum(1 for r in results if r["passed"])
-        total_count = len(results)
-        
-        if passed_count < total_count:
-            overall_status = "FAIL"
-        
         algorithms_data.append({
             "name": algo_name,
             "results": results,
-            "summary": {
-                "passed": passed_count,
-                "total": total_count
-            }
+            "summary": algorithm_summary(results)
         })
     
     json_report = {
         "algorithms": algorithms_data,
-        "status": overall_status
+        "status": overall_status(a["summary"] for a in algorithms_data)
     }
+    if analysis is not None:
+        json_report["analysis"] = analysis
     
     print(json.dumps(json_report))
 
 
+def print_record(record_type, **fields):
+    """Print one NDJSON record and flush, so readers can tail a running report."""
+    print(json.dumps({"type": record_type, **fields}), flush=True)
+
+
+def print_ndjson_summary(summaries):
+    """Print the trailing NDJSON record: per-algorithm summaries and the overall status."""
+    print_record("summary",
+                 algorithms=[{"name": name, "summary": summary} for name, summary in summaries.items()],
+                 status=overall_status(summaries.values()))
+
+
 def main():
     """Main function implementing the exact CLI contract from SPEC.md."""
     parser = argparse.ArgumentParser(description="Sorting Algorithms Testing Project")
-    parser.add_argument("--algo", choices=["bubble", "merge", "quick", "insertion", "all"], required=True,
+    parser.add_argument("--algo", choices=list(ALGORITHMS) + ["all"], required=True,
                        help="Algorithm to use")
-    parser.add_argument("--report", choices=["text", "json"], default="text",
-                       help="Report format (default: text)")
+    parser.add_argument("--report", choices=["text", "json", "ndjson"], default="text",
+                       help="Report format: text, one JSON document, or NDJSON records "
+                            "streamed per dataset (default: text)")
     parser.add_argument("--failfast", action="store_true",
                        help="Stop on first failure")
     parser.add_argument("--visualize", action="store_true",
-                       help="Show sorting process step by step")
+                       help="Show the sorting process live in the terminal")
+    parser.add_argument("--fps", type=float, default=None,
+                       help="Most frames per second drawn by --visualize (default: 30)")
+    parser.add_argument("--memory", action="store_true",
+                       help="Record peak and auxiliary memory per dataset (tracemalloc)")
+    parser.add_argument("--analyze", action="store_true",
+                       help="Report presortedness measures (inversions, runs, Rem, Osc, "
+                            "duplicates) per dataset")
+    parser.add_argument("--datasets-file", action="append", default=[], metavar="PATH",
+                       help="Also run named datasets from a JSON file (repeatable)")
+    parser.add_argument("--oversize", choices=["skip", "truncate"], default="skip",
+                       help="Datasets longer than an algorithm's max_n: skip them or cut them "
+                            "down to max_n (default: skip)")
+    parser.add_argument("--input-file", metavar="PATH",
+                       help="Sort values from a file instead of the built-in datasets ('-' for stdin)")
+    parser.add_argument("--input-format", choices=FORMATS, default="text",
+                       help="Input format: newline-delimited text, a CSV column, or raw "
+                            "little-endian int32/int64 (default: text)")
+    parser.add_argument("--column", default="0",
+                       help="CSV column index or header name (default: 0)")
+    parser.add_argument("--output-file", metavar="PATH",
+                       help="Write the sorted input to a file ('-' for stdout; the report "
+                            "then goes to stderr)")
+    parser.add_argument("--output-format", choices=FORMATS,
+                       help="Output format (default: same as --input-format)")
+    parser.add_argument("--profile", choices=["cprofile", "sampling"],
+                       help="Profile each run; writes <algo>-<dataset>.pstats (cprofile) and "
+                            ".collapsed flamegraph stacks")
+    parser.add_argument("--profile-dir", default="profiles",
+                       help="Directory for profile output (default: profiles)")
+    parser.add_argument("--profile-lines", action="store_true",
+                       help="With --profile, also count line hits in the algorithm's loops")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                       help="Reuse verified results across runs, keyed by algorithm source "
+                            "and input contents")
+    parser.add_argument("--cache-size", type=int, default=MAX_ENTRIES,
+                       help=f"Most results kept in the cache (default: {MAX_ENTRIES})")
     
     args = parser.parse_args()
+    if args.output_file and not args.input_file:
+        parser.error("--output-file requires --input-file")
+    if args.output_file and args.algo == "all":
+        parser.error("--output-file requires a single --algo")
+    if args.output_file and args.datasets_file:
+        # Only the --input-file dataset may reach the output
+        parser.error("--output-file cannot be combined with --datasets-file")
+    if args.profile_lines and not args.profile:
+        parser.error("--profile-lines requires --profile")
+    if args.profile and args.memory:
+        # Each run is measured one way; tracemalloc would also skew the profile
+        parser.error("--profile cannot be combined with --memory")
+    for option in ("profile", "memory"):
+        # A visualized run replaces the measured one, so the measurement would be lost
+        if args.visualize and getattr(args, option):
+            parser.error(f"--visualize cannot be combined with --{option}")
     
     # Resolve selected algorithm(s)
     if args.algo == "all":
@@ -138,31 +323,110 @@ def main():
     else:
         selected_algorithms = {args.algo: ALGORITHMS[args.algo]}
     
-    # Execute harness
+    if args.input_file:
+        name = "stdin" if args.input_file == "-" else os.path.basename(args.input_file)
+        try:
+            datasets = {name: read_values(args.input_file, args.input_format, args.column)}
+        except (OSError, ValueError, IndexError) as e:
+            parser.error(f"cannot read --input-file {args.input_file}: {e}")
+    else:
+        datasets = dict(DATASETS)
+    for path in args.datasets_file:
+        datasets.update(load_datasets(path))
+    
+    output_sink = None
+    written = set()
+    report_redirect = contextlib.nullcontext()
+    if args.output_file:
+        reason = ALGORITHMS.unsupported_reason(args.algo, datasets[name])
+        if reason:
+            # Skipping or truncating would leave the output missing or partial
+            parser.error(f"--algo {args.algo} cannot sort all of {name} ({reason}); "
+                         f"--output-file needs the whole input sorted")
+        output_path = sys.stdout.buffer if args.output_file == "-" else args.output_file
+        output_format = args.output_format or args.input_format
+        
+        def output_sink(dataset_name, output):
+            write_values(output, output_path, output_format)
+            written.add(dataset_name)
+        
+        if args.output_file == "-":
+            # Sorted data owns stdout; the report moves to stderr
+            report_redirect = contextlib.redirect_stdout(sys.stderr)
+    
+    with report_redirect:
+        exit_code = run_harness(selected_algorithms, datasets, args, output_sink)
+    if args.output_file and name not in written:
+        print(f"Error: no sorted output for {name}: --algo {args.algo} did not produce a "
+              f"verified result", file=sys.stderr)
+        exit_code = 1
+    sys.exit(exit_code)
+
+
+def run_harness(selected_algorithms, datasets, args, output_sink=None):
+    """Run the selected algorithms, print the report and return the exit code."""
     algorithms_results = {}
     exit_code = 0
+    store = DatasetStore(datasets)
     
-    for algo_name, algo_func in selected_algorithms.items():
-        results = run_algorithm_on_datasets(algo_name, algo_func, args.report, args.visualize)
-        algorithms_results[algo_name] = results
-        
-        # Check for failures
-        if any(not r["passed"] for r in results):
-            exit_code = 1
-            if args.failfast:
-                # Print summary for current algorithm before exiting
-                if args.report == "text":
-                    print_text_summary(algo_name, results)
-                sys.exit(exit_code)
+    profiler = None
+    if args.profile:
+        # cProfile and threading are only imported when profiling
+        from sorting_algorithms.profiling import Profiler
+        profiler = Profiler(args.profile, args.profile_dir, args.profile_lines)
+    cache = ResultCache(args.cache_dir, args.cache_size) if args.cache_dir else None
+    analysis = None
+    if args.analyze:
+        # Only imported when presortedness analysis is requested
+        from sorting_algorithms.presortedness import analyze
+        analysis = {}
+        for name in store:
+            measures = analyze(store[name])
+            if args.report == "text":
+                print(format_analysis(name, measures))
+            elif args.report == "ndjson":
+                print_record("analysis", dataset=name, **measures)
+            else:
+                analysis[name] = measures
+    ndjson_summaries = {}
+    
+    try:
+        for algo_name, algo_func in selected_algorithms.items():
+            results = run_algorithm_on_datasets(algo_name, algo_func, args.report, args.visualize,
+                                                args.memory, store, args.oversize, output_sink,
+                                                profiler, cache, args.fps)
+            if args.report == "ndjson":
+                # Records are already out; keep only the counts for the trailer
+                ndjson_summaries[algo_name] = algorithm_summary(results)
+            else:
+                algorithms_results[algo_name] = results
+            
+            # Check for failures
+            if any(r["passed"] is False for r in results):
+                exit_code = 1
+                if args.failfast:
+                    # Print summary for current algorithm before exiting
+                    if args.report == "text":
+                        print_text_summary(algo_name, results)
+                    elif args.report == "ndjson":
+                        print_ndjson_summary(ndjson_summaries)
+                    return exit_code
+    finally:
+        if cache is not None:
+            cache.save()
     
     # Print summaries
     if args.report == "text":
         for algo_name, results in algorithms_results.items():
             print_text_summary(algo_name, results)
+        if cache is not None:
+            print(f"CACHE HITS={cache.hits} MISSES={cache.misses}")
+    elif args.report == "ndjson":
+        print_ndjson_summary(ndjson_summaries)
     else:  # JSON
-        print_json_report(algorithms_results)
+        print_json_report(algorithms_results, analysis)
     
-    sys.exit(exit_code)
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,848 @@
+"""
+Shared rendering engine for the matplotlib visualizers.
+
+BarChart draws one bar (and optional value label) per element.  Bar state
+lives in plain lists, a bytearray bitmap of sorted positions and a dict of
+this frame's highlights, so a frame restyles only the bars whose height or
+highlight changed.  Redrawing is dirty-region: the chart keeps a copy of
+the empty axes and of the last frame, restores just the columns under the
+changed bars and draws those bars (plus any neighbours whose labels
+overlap) on top.  A frame therefore costs about the same at 50 or 5,000
+elements.
+
+RasterChart is the large-array mode: one image, decimated to the axes'
+pixel width with a min/max range per column and no labels, for watching
+algorithms on 10^5-10^6 elements.  make_chart() picks it above
+RASTER_THRESHOLD elements.
+
+TracePlayer replays an event trace recorded by the real algorithm (see
+sorting_algorithms.trace) through a blitted FuncAnimation.  A
+PlaybackSchedule decouples events from frames: frames come at a fixed rate,
+and each one applies every event that is due by then, so a long sort
+plays in bounded wall time.  StreamingTracePlayer plays a trace while the
+algorithm is still producing it on a background thread (a TraceProducer),
+so the window opens and animates at once instead of waiting for a long
+recording.
+
+Players can pause and seek: seek() rebuilds the chart from the nearest
+Timeline snapshot plus the events after it.  TimelineControls adds a
+slider, a jump-to-operation box and keys (space, left/right,
+shift+left/right, home/end) to a player's figure.
+"""
+
+import bisect
+import math
+import time
+from array import array
+
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.trace import COMPARE, SORTED, SWAP, WRITE, Timeline, decode
+
+plt = lazy_import("matplotlib.pyplot")
+animation = lazy_import("matplotlib.animation")
+martist = lazy_import("matplotlib.artist")
+mcolors = lazy_import("matplotlib.colors")
+mtransforms = lazy_import("matplotlib.transforms")
+mwidgets = lazy_import("matplotlib.widgets")
+np = lazy_import("numpy")
+
+# Transient highlight roles, highest priority first
+ROLE_ORDER = ("current", "minimum_tracked", "comparing", "swapping")
+
+# Above this many elements make_chart() draws a RasterChart instead of bars
+RASTER_THRESHOLD = 500
+
+# Playback frame rate, and the longest a replay takes unless a duration is given
+DEFAULT_FPS = 30
+MAX_DURATION = 120.0
+
+_DIRTY_ARTIST = None
+
+
+def _dirty_artist_class():
+    """Define the Artist subclass on first use, so importing stays light."""
+    global _DIRTY_ARTIST
+    if _DIRTY_ARTIST is None:
+        class DirtyBars(martist.Artist):
+            """Artist whose draw() redraws only a chart's dirty columns."""
+
+            def __init__(self, chart):
+                super().__init__()
+                self.chart = chart
+                self.axes = chart.ax
+                self.set_figure(chart.ax.figure)
+                self.set_animated(True)
+
+            def draw(self, renderer):
+                self.chart.draw_dirty(renderer)
+
+        _DIRTY_ARTIST = DirtyBars
+    return _DIRTY_ARTIST
+
+
+def event_roles(op, i, j):
+    """Default highlights for one trace event: (role, indices) pairs."""
+    if op == COMPARE:
+        return (("comparing", (i, j)),)
+    if op == SWAP:
+        return (("swapping", (i, j)),)
+    if op == WRITE:
+        return (("swapping", (i,)),)
+    return ()
+
+
+def _merge_spans(spans):
+    """Merge overlapping (x0, x1) pixel spans."""
+    merged = []
+    for x0, x1 in sorted(spans):
+        if merged and x0 <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], x1)
+        else:
+            merged.append([x0, x1])
+    return merged
+
+
+class _ChartState:
+    """Per-element state shared by the chart types; updates mark indices dirty."""
+
+    def __init__(self, ax, heights, colors):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.colors = colors
+        self.heights = heights
+        self.sorted = bytearray(len(heights))
+        self.roles = {}
+        self.dirty = set()
+        self.touched = 0  # elements restyled so far (a frame touches only dirty ones)
+        self._draw_cid = self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def __len__(self):
+        return len(self.heights)
+
+    def set_value(self, i, value):
+        """Set the height of element i."""
+        if self.heights[i] != value:
+            self.heights[i] = value
+            self.dirty.add(i)
+
+    def swap(self, i, j):
+        """Swap the heights of elements i and j."""
+        self.heights[i], self.heights[j] = self.heights[j], self.heights[i]
+        self.dirty.add(i)
+        self.dirty.add(j)
+
+    def highlight(self, role, indices):
+        """Highlight indices with role until clear_highlights()."""
+        for i in indices:
+            current = self.roles.get(i)
+            if current is None or ROLE_ORDER.index(role) < ROLE_ORDER.index(current):
+                self.roles[i] = role
+                self.dirty.add(i)
+
+    def clear_highlights(self):
+        """Drop this frame's highlights."""
+        self.dirty.update(self.roles)
+        self.roles.clear()
+
+    def mark_sorted(self, i):
+        """Mark position i as final."""
+        if not self.sorted[i]:
+            self.sorted[i] = 1
+            self.dirty.add(i)
+
+    def mark_all_sorted(self):
+        """Mark every position as final."""
+        for i in range(len(self.sorted)):
+            self.mark_sorted(i)
+
+    def load(self, heights, done):
+        """Replace every height and final flag (a seek); highlights are dropped."""
+        self.clear_highlights()
+        for i, value in enumerate(heights):
+            if self.heights[i] != value:
+                self.heights[i] = value
+                self.dirty.add(i)
+        for i, flag in enumerate(done):
+            if self.sorted[i] != flag:
+                self.sorted[i] = flag
+                self.dirty.add(i)
+
+    def disconnect(self):
+        """Stop listening for full redraws (before reusing the axes)."""
+        self.canvas.mpl_disconnect(self._draw_cid)
+
+
+class BarChart(_ChartState):
+    """Bar chart on ax that restyles and redraws only changed bars."""
+
+    def __init__(self, ax, values, colors, alphas=None, labels=True,
+                 bar_kwargs=None, label_kwargs=None):
+        self.alphas = alphas or {}
+        heights = list(values)
+        n = len(heights)
+
+        bar_kwargs = dict(bar_kwargs or {})
+        bar_kwargs.setdefault("alpha", self.alphas.get("default"))
+        self.base_alpha = bar_kwargs["alpha"]
+        self.bars = ax.bar(range(n), heights, color=colors["default"], **bar_kwargs)
+        self.labels = []
+        if labels:
+            for bar, value in zip(self.bars, heights):
+                label = ax.text(bar.get_x() + bar.get_width() / 2., value + 0.1, f'{value}',
+                                ha='center', va='bottom', **(label_kwargs or {}))
+                label.set_clip_path(ax.patch)
+                label.set_clip_on(True)
+                self.labels.append(label)
+        # Bars are drawn by the chart, never by a full figure redraw
+        for artist in list(self.bars) + self.labels:
+            artist.set_animated(True)
+
+        self._pending = set()
+        self._clean = None
+        self._frame = None
+        self._renderer = None
+        self._centers = []
+        self._spans = [None] * n
+        self._max_half = 0.0
+        self._pad = 2
+        super().__init__(ax, heights, colors)
+        self.artist = _dirty_artist_class()(self)
+
+    def apply(self):
+        """Push dirty state into the bar and label artists."""
+        for i in self.dirty:
+            role = self.roles.get(i) or ("sorted" if self.sorted[i] else "default")
+            bar = self.bars[i]
+            bar.set_height(self.heights[i])
+            bar.set_facecolor(self.colors[role])
+            bar.set_alpha(self.alphas.get(role, self.base_alpha))
+            if self.labels:
+                self.labels[i].set_position((bar.get_x() + bar.get_width() / 2., self.heights[i] + 0.1))
+                self.labels[i].set_text(f'{self.heights[i]}')
+        self.touched += len(self.dirty)
+        self._pending |= self.dirty
+        self.dirty.clear()
+
+    # Drawing
+
+    def _span(self, renderer, i):
+        """Pixel x-range covered by bar i (edge included) and its label."""
+        x0, x1 = self.bars[i].get_window_extent(renderer).intervalx
+        if self.labels:
+            label = self.labels[i]
+            lx0, lx1 = label.get_window_extent(renderer).intervalx
+            x0, x1 = min(x0, lx0), max(x1, lx1)
+            patch = label.get_bbox_patch()
+            if patch is not None:
+                label.update_bbox_position_size(renderer)
+                lx0, lx1 = patch.get_window_extent(renderer).intervalx
+                x0, x1 = min(x0, lx0), max(x1, lx1)
+        x0, x1 = int(x0) - self._pad, int(x1) + self._pad + 1
+        self._max_half = max(self._max_half, self._centers[i] - x0, x1 - self._centers[i])
+        return x0, x1
+
+    def _draw_index(self, renderer, indices, clip=None):
+        """Draw bars, then labels, of indices; clip limits them to a Bbox."""
+        artists = [self.bars[i] for i in indices] + [self.labels[i] for i in indices if self.labels]
+        for artist in artists:
+            if clip is None:
+                artist.draw(renderer)
+                continue
+            clip_box = artist.get_clip_box()
+            artist.set_clip_box(clip)
+            artist.draw(renderer)
+            artist.set_clip_box(clip_box)
+
+    def _on_draw(self, event):
+        """After a full redraw: cache the empty axes, then draw every bar once."""
+        if self.canvas.is_saving():
+            return
+        renderer = event.renderer
+        self._renderer = renderer
+        self._clean = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.apply()
+        to_pixels = self.ax.transData.transform
+        self._centers = [to_pixels((bar.get_x() + bar.get_width() / 2., 0))[0] for bar in self.bars]
+        self._max_half = 0.0
+        # Antialiased edges reach about a line width past the bar
+        linewidth = max((bar.get_linewidth() for bar in self.bars), default=0)
+        self._pad = int(linewidth * self.ax.figure.dpi / 72) + 2
+        self._spans = [self._span(renderer, i) for i in range(len(self.bars))]
+        self._draw_index(renderer, range(len(self.bars)))
+        self._frame = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._pending.clear()
+
+    def draw_dirty(self, renderer):
+        """Redraw the columns of bars changed since the last frame."""
+        if self.canvas.is_saving():
+            return  # savefig draws the (animated) bars itself
+        self.apply()
+        if self._frame is None or renderer is not self._renderer:
+            self._draw_index(renderer, range(len(self.bars)))
+            self._pending.clear()
+            return
+        self.canvas.restore_region(self._frame)
+        if self._pending:
+            spans = []
+            for i in self._pending:
+                spans.append(self._spans[i])
+                self._spans[i] = self._span(renderer, i)
+                spans.append(self._spans[i])
+            ax_x0, ax_y0, ax_x1, ax_y1 = self._clean.get_extents()
+            for x0, x1 in _merge_spans(spans):
+                x0, x1 = max(x0, ax_x0), min(x1, ax_x1)
+                if x0 >= x1:
+                    continue
+                # restore_region's bbox is inclusive, the clip box is not
+                self.canvas.restore_region(self._clean, bbox=(x0, ax_y0, x1 - 1, ax_y1),
+                                           xy=(ax_x0, ax_y0))
+                # Redraw everything that reaches into the column, clipped to it,
+                # so neighbours' antialiased edges are not drawn twice
+                lo = bisect.bisect_left(self._centers, x0 - self._max_half)
+                hi = bisect.bisect_right(self._centers, x1 + self._max_half)
+                overlapping = [k for k in range(lo, hi)
+                               if self._spans[k][0] < x1 and self._spans[k][1] > x0]
+                clip = mtransforms.Bbox.from_extents(x0, self.ax.bbox.y0, x1, self.ax.bbox.y1)
+                self._draw_index(renderer, overlapping, clip)
+            self._pending.clear()
+        self._frame = self.canvas.copy_from_bbox(self.ax.bbox)
+
+
+class RasterChart(_ChartState):
+    """
+    Large-array chart drawn as one image, decimated to the axes' pixel width.
+
+    Element i falls in pixel column i * columns // n.  Each column shows the
+    [min, max] value range of its elements, in the highlight colour of its
+    highest-priority highlighted element, else the sorted colour once every
+    element in it is final.  Heights live in a NumPy array, and an update
+    repaints only the columns of dirty elements in an RGBA pixel array that
+    is handed to a single AxesImage, so there are no per-element artists or
+    labels and a frame costs the same at 10^4 or 10^6 elements.
+    """
+
+    def __init__(self, ax, values, colors):
+        heights = np.array(values)
+        n = len(heights)
+        self.columns = max(1, min(n, int(ax.bbox.width)))
+        self.rows = max(2, int(ax.bbox.height))
+        # Column c holds elements bounds[c] <= i < bounds[c + 1]
+        self._bounds = (np.arange(self.columns + 1) * n + self.columns - 1) // self.columns
+        self._low, high = heights.min(), heights.max()
+        self._scale = (self.rows - 1) / ((high - self._low) or 1)
+        self._rgba = {role: np.array(mcolors.to_rgba(color)) * 255 for role, color in colors.items()}
+        self.pixels = np.zeros((self.rows, self.columns, 4), dtype=np.uint8)
+        self.image = ax.imshow(self.pixels, origin="lower", aspect="auto", interpolation="nearest",
+                               extent=(-0.5, n - 0.5, self._low, max(high, self._low + 1)))
+        self.image.set_animated(True)
+
+        self._clean = None
+        self._renderer = None
+        super().__init__(ax, heights, colors)
+        self._sorted = np.frombuffer(self.sorted, dtype=np.uint8)
+        self.artist = _dirty_artist_class()(self)
+        self.dirty.update(range(n))
+
+    def _row(self, values):
+        return ((values - self._low) * self._scale).astype(np.intp)
+
+    def _paint_all(self, role_columns):
+        """Repaint every column at once."""
+        starts = self._bounds[:-1]
+        low = self._row(np.minimum.reduceat(self.heights, starts))
+        high = self._row(np.maximum.reduceat(self.heights, starts))
+        done = np.minimum.reduceat(self._sorted, starts).astype(bool)
+        color = np.where(done[:, None], self._rgba["sorted"], self._rgba["default"])
+        for c, role in role_columns.items():
+            color[c] = self._rgba[role]
+        rows = np.arange(self.rows)[:, None]
+        mask = (rows >= low) & (rows <= high)
+        self.pixels[:] = np.where(mask[..., None], color[None].astype(np.uint8), 0)
+
+    def _paint(self, c, role):
+        """Repaint column c."""
+        lo, hi = self._bounds[c], self._bounds[c + 1]
+        values = self.heights[lo:hi]
+        if role is None:
+            role = "sorted" if self._sorted[lo:hi].all() else "default"
+        column = self.pixels[:, c]
+        column[:] = 0
+        column[self._row(values.min()):self._row(values.max()) + 1] = self._rgba[role]
+
+    def mark_all_sorted(self):
+        """Mark every position as final."""
+        self._sorted[:] = 1
+        self.dirty.update(range(len(self.heights)))
+
+    def load(self, heights, done):
+        """Replace every height and final flag (a seek); highlights are dropped."""
+        self.clear_highlights()
+        self.heights[:] = heights
+        self._sorted[:] = np.frombuffer(done, dtype=np.uint8)
+        self.dirty.update(range(len(self.heights)))
+
+    def apply(self):
+        """Repaint the columns holding dirty elements."""
+        if not self.dirty:
+            return
+        n, columns = len(self.heights), self.columns
+        role_columns = {}
+        for i, role in self.roles.items():
+            c = i * columns // n
+            current = role_columns.get(c)
+            if current is None or ROLE_ORDER.index(role) < ROLE_ORDER.index(current):
+                role_columns[c] = role
+        if len(self.dirty) >= columns:
+            self._paint_all(role_columns)
+        else:
+            for c in {i * columns // n for i in self.dirty}:
+                self._paint(c, role_columns.get(c))
+        self.image.set_data(self.pixels)
+        self.touched += len(self.dirty)
+        self.dirty.clear()
+
+    def _on_draw(self, event):
+        """After a full redraw: cache the empty axes, then draw the image."""
+        if self.canvas.is_saving():
+            return
+        self._renderer = event.renderer
+        self._clean = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.apply()
+        self.image.draw(event.renderer)
+
+    def draw_dirty(self, renderer):
+        """Redraw the image over the empty axes."""
+        if self.canvas.is_saving():
+            return
+        self.apply()
+        if self._clean is not None and renderer is self._renderer:
+            self.canvas.restore_region(self._clean)
+        self.image.draw(renderer)
+
+
+def make_chart(ax, values, colors, raster=None, **bar_options):
+    """
+    Build the chart for values: bars, or a RasterChart for large arrays.
+
+    Args:
+        ax: Axes to draw on
+        values: The array to show
+        colors: {role: colour} for default, sorted and the highlight roles
+        raster: Force (True) or forbid (False) raster mode; None picks
+            raster above RASTER_THRESHOLD elements
+        **bar_options: BarChart options (alphas, labels, bar_kwargs, ...)
+
+    Returns:
+        BarChart or RasterChart
+    """
+    if raster is None:
+        raster = len(values) > RASTER_THRESHOLD
+    if raster:
+        return RasterChart(ax, values, colors)
+    return BarChart(ax, values, colors, **bar_options)
+
+
+class PlaybackSchedule:
+    """
+    Decide how many trace events each frame shows.
+
+    Events play at one per speed seconds, sped up so the whole trace takes
+    at most max_duration seconds; duration instead fixes the total time.
+    Frames come at most fps times a second, and due() maps elapsed time to
+    the events that should have played by then, so a slow frame is followed
+    by a bigger batch rather than falling behind.
+    """
+
+    def __init__(self, total, speed=None, duration=None, fps=DEFAULT_FPS,
+                 max_duration=MAX_DURATION):
+        self.total = total
+        self.fps = fps
+        if duration:
+            rate = total / duration
+        else:
+            rate = 1 / speed if speed else fps
+            if max_duration:
+                rate = max(rate, total / max_duration)
+        self.rate = rate or fps  # events per second
+        self.interval = 1000 / min(fps, self.rate)  # milliseconds between frames
+
+    def due(self, elapsed):
+        """Number of events that should have played after elapsed seconds."""
+        return min(self.total, int(elapsed * self.rate) + 1)
+
+    def events_per_frame(self):
+        """Events per frame when frames are not paced by a clock (export)."""
+        return max(1, math.ceil(self.rate / self.fps))
+
+
+def add_playback_arguments(parser):
+    """Add --fps and --duration to a visualizer's argument parser."""
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS,
+                        help="Frames per second of the animation (and of --export)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Play the whole sort in this many seconds, batching as many "
+                             f"operations per frame as needed (default: --speed, capped at "
+                             f"{MAX_DURATION:.0f}s)")
+
+
+class TracePlayer:
+    """Replay a trace onto a BarChart through a blitted FuncAnimation."""
+
+    def __init__(self, chart, words, speed=None, duration=None, fps=DEFAULT_FPS,
+                 roles=event_roles, on_frame=None, on_finish=None, clock=time.perf_counter):
+        """
+        Args:
+            chart: BarChart or RasterChart showing the trace's input
+            words: Trace words (Trace.words)
+            speed: Seconds per event; with neither speed nor duration every
+                frame shows exactly one event
+            duration: Seconds for the whole replay (overrides speed)
+            fps: Frame rate
+            roles: roles(op, i, j) -> (role, indices) pairs to highlight
+            on_frame: Optional on_frame(player) -> extra artists to blit
+            on_finish: Optional on_finish(player), called after the last event
+            clock: Time source for the schedule
+        """
+        self.chart = chart
+        self.words = words
+        self.total = len(words) // 2
+        self.schedule = None
+        if speed or duration:
+            self.schedule = PlaybackSchedule(self.total, speed, duration, fps)
+        self.interval = self.schedule.interval if self.schedule else 1000 / fps
+        self.clock = clock
+        self.roles = roles
+        self.on_frame = on_frame
+        self.on_finish = on_finish
+        self.counts = [0, 0, 0, 0]  # per op: compare, swap, write, sorted
+        self.played = 0
+        self.finished = False
+        self.paused = False
+        self.animation = None
+        self.controls = None  # TimelineControls, if any
+        heights = chart.heights
+        self._initial = heights.tolist() if hasattr(heights, "tolist") else list(heights)
+        self._timeline = None
+        self._extra = []
+        self._done = False
+        self._draw_cid = chart.canvas.mpl_connect("draw_event", self._on_draw)
+
+    @property
+    def timeline(self):
+        """Timeline of the trace, built on the first seek."""
+        if self._timeline is None:
+            self._timeline = Timeline(self._initial, self.words)
+        return self._timeline
+
+    def apply(self, op, i, j):
+        """Apply one event to the chart state (no drawing)."""
+        chart = self.chart
+        chart.clear_highlights()
+        for role, indices in self.roles(op, i, j):
+            chart.highlight(role, indices)
+        if op == SWAP:
+            chart.swap(i, j)
+        elif op == WRITE:
+            chart.set_value(i, j)
+        elif op == SORTED:
+            chart.mark_sorted(i)
+        self.counts[op] += 1
+        self.played += 1
+
+    def apply_batch(self, events):
+        """
+        Apply a frame's events; only the last one's highlights are shown.
+
+        Earlier events just update heights and the sorted bitmap, so each
+        bar ends up redrawn once, in its latest state.
+        """
+        chart = self.chart
+        for op, i, j in events[:-1]:
+            if op == SWAP:
+                chart.swap(i, j)
+            elif op == WRITE:
+                chart.set_value(i, j)
+            elif op == SORTED:
+                chart.mark_sorted(i)
+            self.counts[op] += 1
+        self.played += len(events) - 1
+        self.apply(*events[-1])
+
+    def finish(self):
+        """Clear highlights and mark everything sorted."""
+        self.chart.clear_highlights()
+        self.chart.mark_all_sorted()
+        self.finished = True
+
+    def rate(self):
+        """Events per second (None: one event per frame)."""
+        return self.schedule.rate if self.schedule is not None else None
+
+    def _fetch(self, count):
+        """Make at least count events past played available in words, if possible."""
+
+    def _complete(self):
+        """True once words holds the whole trace."""
+        return True
+
+    def frames(self):
+        """
+        Yield each frame's list of due events, then None for the final frame.
+
+        Empty lists are yielded while paused (or waiting for events).  The
+        position is read from played on every frame, so a seek() takes
+        effect at the next frame, and the clock restarts after a pause or
+        seek instead of catching up.
+        """
+        last = None
+        owed = 0.0
+        expected = None  # played after the previous batch, unless a seek moved it
+        while True:
+            if self.paused:
+                last = None
+                yield []
+                continue
+            position = self.played
+            if position != expected:
+                last = None
+                owed = 0.0
+            rate = self.rate()
+            count = 1
+            if rate is not None:
+                now = self.clock()
+                owed += (now - last) * rate if last is not None else 1
+                last = now
+                count = max(int(owed), 1)
+            self._fetch(count)
+            end = min(position + count, self.total)
+            batch = list(decode(self.words[2 * position:2 * end]))
+            owed = max(owed - len(batch), 0.0)
+            expected = end
+            if not batch and self._complete():
+                break
+            yield batch
+        yield None
+
+    def pause(self):
+        """Hold playback; frames keep coming but apply no events."""
+        self.paused = True
+
+    def resume(self):
+        """Continue playback from the current position."""
+        self.paused = False
+
+    def seek(self, position):
+        """
+        Show the state after the first position events (clamped to the trace).
+
+        The chart is rebuilt from the nearest Timeline snapshot, and the last
+        event before position is highlighted.  Seeking a finished replay
+        pauses it at position and restarts the animation.
+        """
+        values, done, counts, last = self.timeline.state_at(position)
+        chart = self.chart
+        chart.load(values, done)
+        if last is not None:
+            for role, indices in self.roles(*last):
+                chart.highlight(role, indices)
+        self.counts = counts
+        self.played = sum(counts)
+        if self.finished:
+            self.finished = self._done = False
+            self.paused = True
+            if self.animation is not None:
+                self.start()
+        chart.canvas.draw_idle()
+
+    def step(self, events):
+        """FuncAnimation callback: apply a frame's events and return the artists to blit."""
+        if events is None:
+            self.finish()
+        elif events:
+            self.apply_batch(events)
+        self._extra = self._extras()
+        if self.finished and self.on_finish is not None:
+            self.on_finish(self)
+        self._done = self.finished
+        return [self.chart.artist, *self._extra]
+
+    def _on_draw(self, event):
+        """After the last frame, put the animated extras back on full redraws."""
+        # Inside the final step FuncAnimation still blits the extras itself
+        if self._done and not self.chart.canvas.is_saving():
+            for artist in self._extra:
+                artist.axes.draw_artist(artist)
+
+    def _extras(self):
+        """Artists updated by on_frame and the controls, blitted with the chart."""
+        extra = list(self.on_frame(self)) if self.on_frame is not None else []
+        if self.controls is not None:
+            extra += self.controls.update()
+        return extra
+
+    def _init(self):
+        self._extra = self._extras()
+        for artist in self._extra:
+            artist.set_animated(True)
+        return [self.chart.artist, *self._extra]
+
+    def start(self):
+        """Create the animation (kept on self so it is not garbage collected)."""
+        # Animate the extras before the first full draw, so they stay out of
+        # the blit background
+        self._init()
+        self.animation = animation.FuncAnimation(
+            self.chart.ax.figure, self.step, frames=self.frames(), init_func=self._init,
+            interval=self.interval, blit=True, repeat=False, cache_frame_data=False)
+        return self.animation
+
+    def disconnect(self):
+        """Stop listening for full redraws and keys (before replacing the player)."""
+        self.chart.canvas.mpl_disconnect(self._draw_cid)
+        if self.controls is not None:
+            self.controls.disconnect()
+            self.controls = None
+
+
+class StreamingTracePlayer(TracePlayer):
+    """
+    TracePlayer fed live by a TraceProducer.
+
+    Frames come every 1/fps seconds.  Each frame polls the producer's queue
+    only for the events due by the PlaybackSchedule (rebuilt as the known
+    total grows), so events the player has not reached stay queued and the
+    producer waits: the frame budget, not the algorithm, sets the pace.
+    Events received are appended to words (8 bytes each), which keeps them
+    available for seeking.  total counts the events received so far; it is
+    final once the producer is exhausted.
+    """
+
+    def __init__(self, chart, producer, speed=None, duration=None, fps=DEFAULT_FPS, **options):
+        super().__init__(chart, array("i"), fps=fps, **options)
+        self.producer = producer
+        self.speed = speed
+        self.duration = duration
+        self.fps = fps
+        self.interval = 1000 / fps
+
+    def rate(self):
+        """Events per second for the events known so far (None: one per frame)."""
+        if not (self.speed or self.duration):
+            return None
+        return PlaybackSchedule(self.total, self.speed, self.duration, self.fps).rate
+
+    def _fetch(self, count):
+        """Poll the producer until count events past played are received, or it runs dry."""
+        missing = self.played + count - self.total
+        if missing > 0:
+            for chunk in self.producer.poll(missing):
+                self.words.extend(chunk)
+                self.total += len(chunk) // 2
+
+    def _complete(self):
+        return self.producer.exhausted
+
+    def disconnect(self):
+        """Stop listening for redraws and abandon the producer."""
+        super().disconnect()
+        self.producer.stop()
+
+
+class TimelineControls:
+    """
+    Seek controls under a player's figure: a slider, a "Go to" box and keys.
+
+    Keys: space pauses and resumes (and replays a finished sort), left and
+    right step one event, shift+left and shift+right jump one Timeline
+    interval, home and end go to the first and last event.  Stepping,
+    dragging and jumping pause playback.  The slider and position readout
+    are blitted with the player's frames.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        fig = player.chart.ax.figure
+        self.figure = fig
+        fig.subplots_adjust(bottom=fig.subplotpars.bottom + 0.06)
+        self.slider = mwidgets.Slider(fig.add_axes([0.12, 0.015, 0.52, 0.025]), "Operation",
+                                      0, max(player.total, 1), valinit=player.played, valstep=1)
+        self.slider.valtext.set_visible(False)
+        self.slider.on_changed(self._on_slide)
+        readout = fig.add_axes([0.65, 0.005, 0.12, 0.045])
+        readout.set_axis_off()
+        self.readout = readout.text(0, 0.5, "", va="center")
+        self.goto = mwidgets.TextBox(fig.add_axes([0.84, 0.01, 0.08, 0.035]), "Go to ")
+        self.goto.on_submit(self._on_submit)
+        self.axes = [self.slider.ax, readout, self.goto.ax]
+        # The fill, the knob and the valinit marker are the slider axes' poly and lines
+        self.artists = [self.slider.poly, *self.slider.ax.lines, self.readout]
+        for artist in self.artists:
+            artist.set_animated(True)
+        self._key_cid = fig.canvas.mpl_connect("key_press_event", self._on_key)
+        player.controls = self
+
+    def update(self):
+        """Move the slider to the player's position; return the artists to blit."""
+        player = self.player
+        slider = self.slider
+        if slider.valmax != max(player.total, 1):
+            # A streaming player's total grows as events arrive
+            slider.valmax = max(player.total, 1)
+            slider.ax.set_xlim(slider.valmin, slider.valmax)
+        slider.eventson = slider.drawon = False
+        slider.set_val(player.played)
+        slider.eventson = slider.drawon = True
+        state = " (paused)" if player.paused else ""
+        self.readout.set_text(f"{player.played:,} / {player.total:,}{state}")
+        return self.artists
+
+    def jump(self, position):
+        """Pause and seek to position."""
+        self.player.pause()
+        self.player.seek(position)
+
+    def toggle(self):
+        """Pause or resume; replay from the start once finished."""
+        player = self.player
+        if player.finished:
+            player.seek(0)
+            player.resume()
+        elif player.paused:
+            player.resume()
+        else:
+            player.pause()
+
+    def _on_slide(self, value):
+        self.jump(int(value))
+
+    def _on_submit(self, text):
+        try:
+            position = int(text.replace(",", "").replace("_", ""))
+        except ValueError:
+            return
+        self.jump(position)
+
+    def _on_key(self, event):
+        if self.goto.capturekeystrokes:
+            return  # typing into the Go to box
+        player = self.player
+        if event.key == " ":
+            self.toggle()
+        elif event.key in ("left", "right"):
+            self.jump(player.played + (1 if event.key == "right" else -1))
+        elif event.key in ("shift+left", "shift+right"):
+            interval = player.timeline.interval
+            self.jump(player.played + (interval if event.key == "shift+right" else -interval))
+        elif event.key == "home":
+            self.jump(0)
+        elif event.key == "end":
+            self.jump(player.total)
+
+    def disconnect(self):
+        """Stop listening for keys and remove the control axes."""
+        self.figure.canvas.mpl_disconnect(self._key_cid)
+        self.slider.disconnect_events()
+        self.goto.disconnect_events()
+        for ax in self.axes:
+            if ax in self.figure.axes:
+                ax.remove()
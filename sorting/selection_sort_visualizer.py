@@ -3,21 +3,34 @@
 Selection Sort Visualizer - Following the documentation specifications
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-import time
-from sorting_algorithms.selection_sort import selection_sort
+from render_engine import (DEFAULT_FPS, TimelineControls, TracePlayer, add_playback_arguments,
+                           make_chart)
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.trace import COMPARE, SORTED, SWAP, record
+
+# matplotlib loads when a visualizer is created, not at import
+plt = lazy_import("matplotlib.pyplot")
 
 
 class SelectionSortVisualizer:
-    def __init__(self, algorithm_name="selection"):
+    def __init__(self, algorithm_name="selection", fig=None):
         """Initialize the selection sort visualizer."""
         self.algorithm_name = algorithm_name
+        self.algorithm_func = ALGORITHMS.get(algorithm_name)
+        if not self.algorithm_func:
+            raise ValueError(f"Algorithm '{algorithm_name}' not found")
         
         # Setup the plot with professional styling
         plt.style.use('default')
-        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(14, 10), 
-                                                       gridspec_kw={'height_ratios': [3, 1]})
+        if fig is None:
+            self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(14, 10), 
+                                                           gridspec_kw={'height_ratios': [3, 1]})
+        else:
+            # Redraw on a figure that is already open (the demo runner's window)
+            fig.clear()
+            self.fig = fig
+            self.ax1, self.ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
         
         self.fig.suptitle(f'{algorithm_name.title()} Sort - Real-Time Visualization', 
                          fontsize=18, fontweight='bold', color='#2E86AB')
@@ -36,6 +49,8 @@ class SelectionSortVisualizer:
         # Animation settings
         self.animation_speed = 0.3
         self.pause_between_steps = 0.1
+        self.fps = DEFAULT_FPS
+        self.duration = None  # seconds for the whole sort, if fixed
         
         # Statistics
         self.comparisons = 0
@@ -44,6 +59,8 @@ class SelectionSortVisualizer:
         
     def setup_plot(self, arr):
         """Setup the enhanced plot with professional styling."""
+        if getattr(self, "chart", None) is not None:
+            self.chart.disconnect()
         # Main sorting visualization
         self.ax1.clear()
         self.ax1.set_facecolor(self.colors['background'])
@@ -63,27 +80,16 @@ class SelectionSortVisualizer:
         self.ax2.set_title('Sorting Progress', fontsize=14, fontweight='bold', pad=20)
         self.ax2.grid(True, alpha=0.3)
         
-        # Create bars with enhanced styling
-        x_positions = np.arange(len(arr))
-        self.bars = self.ax1.bar(x_positions, arr, 
-                                color=self.colors['default'],
-                                edgecolor='black', 
-                                linewidth=2, 
-                                alpha=0.8,
-                                width=0.8)
-        
-        # Add value labels with better styling
-        self.value_labels = []
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            height = bar.get_height()
-            label = self.ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                 f'{value}', ha='center', va='bottom', 
-                                 fontweight='bold', fontsize=11,
-                                 bbox=dict(boxstyle="round,pad=0.3", 
-                                          facecolor='white', 
-                                          edgecolor='black', 
-                                          alpha=0.8))
-            self.value_labels.append(label)
+        # Bars with value labels (a raster for large arrays); only changes are redrawn
+        self.chart = make_chart(self.ax1, arr, self.colors,
+                                alphas={'current': 1.0, 'minimum_tracked': 1.0,
+                                        'comparing': 1.0, 'swapping': 1.0, 'sorted': 0.9},
+                                bar_kwargs=dict(edgecolor='black', linewidth=2, alpha=0.8, width=0.8),
+                                label_kwargs=dict(fontweight='bold', fontsize=11,
+                                                  bbox=dict(boxstyle="round,pad=0.3",
+                                                            facecolor='white',
+                                                            edgecolor='black',
+                                                            alpha=0.8)))
         
         # Progress bar
         self.progress_bar = self.ax2.bar(0, 0.8, width=0, 
@@ -101,161 +107,90 @@ class SelectionSortVisualizer:
         
         plt.tight_layout()
         
-    def update_bars(self, arr, comparing_indices=None, swapping_indices=None, 
-                   sorted_indices=None, current_index=None, minimum_tracked=None, progress=0):
-        """Update the visualization with smooth transitions."""
-        # Update bar heights and colors
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            # Smooth height transition
-            current_height = bar.get_height()
-            target_height = value
-            bar.set_height(target_height)
-            
-            # Update colors based on state
-            if current_index and i == current_index:
-                bar.set_color(self.colors['current'])
-                bar.set_alpha(1.0)
-            elif minimum_tracked and i == minimum_tracked:
-                bar.set_color(self.colors['minimum_tracked'])
-                bar.set_alpha(1.0)
-            elif comparing_indices and i in comparing_indices:
-                bar.set_color(self.colors['comparing'])
-                bar.set_alpha(1.0)
-            elif swapping_indices and i in swapping_indices:
-                bar.set_color(self.colors['swapping'])
-                bar.set_alpha(1.0)
-            elif sorted_indices and i in sorted_indices:
-                bar.set_color(self.colors['sorted'])
-                bar.set_alpha(0.9)
-            else:
-                bar.set_color(self.colors['default'])
-                bar.set_alpha(0.8)
-            
-            # Update value labels
-            height = bar.get_height()
-            self.value_labels[i].set_position((bar.get_x() + bar.get_width()/2., height + 0.1))
-            self.value_labels[i].set_text(f'{value}')
-        
-        # Update progress bar
-        if hasattr(self, 'progress_bar') and self.progress_bar:
-            self.progress_bar[0].set_width(progress)
-        
-        # Update statistics
+    def update_stats(self, player):
+        """Per-frame hook: refresh progress and counters from the player."""
+        self.comparisons, self.swaps, _, self.passes = player.counts
+        progress = 100 if player.finished else 100 * player.played / max(player.total, 1)
+        self.progress_bar[0].set_width(progress)
         self.stats_text.set_text(f'Passes: {self.passes} | Comparisons: {self.comparisons} | Swaps: {self.swaps}')
-        
-        # Force redraw
-        self.fig.canvas.draw()
-        plt.pause(self.pause_between_steps)
-        
-    def visualize_selection_sort(self, arr):
-        """Selection sort visualization with real-time statistics showing each step clearly."""
-        arr_copy = arr.copy()
-        n = len(arr_copy)
-        
-        # Setup initial plot
-        self.setup_plot(arr_copy)
-        plt.show(block=False)
-        
-        # Reset statistics
-        self.comparisons = 0
-        self.swaps = 0
-        self.passes = 0
-        
-        print(f"Starting selection sort on array: {arr_copy}")
-        
-        # Selection sort algorithm visualization
-        for i in range(n):
-            self.passes = i
-            minIndex = i
-            
-            print(f"\n--- Pass {i}: Looking for minimum element to place at position {i} ---")
-            print(f"Current array: {arr_copy}")
-            
-            # Highlight current position where we'll place the minimum
-            progress = (i / n) * 100
-            self.update_bars(arr_copy, current_index=i, progress=progress)
-            plt.pause(0.5)  # Pause to show current position
-            
-            # Find the minimum element in the unsorted portion
-            for j in range(i + 1, n):
-                self.comparisons += 1
-                print(f"  Comparing {arr_copy[j]} with current minimum {arr_copy[minIndex]}")
-                
-                # Highlight comparing elements
-                comparing = [j]
-                self.update_bars(arr_copy, comparing_indices=comparing, current_index=i, 
-                               minimum_tracked=minIndex, progress=progress)
-                plt.pause(0.3)  # Pause to show comparison
-                
-                # Update minimum if we found a smaller element
-                if arr_copy[j] < arr_copy[minIndex]:
-                    print(f"  New minimum found: {arr_copy[j]} at position {j}")
-                    minIndex = j
-                    # Highlight new minimum
-                    self.update_bars(arr_copy, comparing_indices=comparing, current_index=i, 
-                                   minimum_tracked=minIndex, progress=progress)
-                    plt.pause(0.3)  # Pause to show new minimum
-            
-            # Swap if minimum is not already at position i
-            if minIndex != i:
-                print(f"  Swapping {arr_copy[i]} (position {i}) with {arr_copy[minIndex]} (position {minIndex})")
-                arr_copy[i], arr_copy[minIndex] = arr_copy[minIndex], arr_copy[i]
-                self.swaps += 1
-                
-                # Highlight swapping
-                swapping = [i, minIndex]
-                self.update_bars(arr_copy, swapping_indices=swapping, progress=progress)
-                plt.pause(0.5)  # Pause to show swap
-            else:
-                print(f"  No swap needed - {arr_copy[i]} is already at the correct position")
-            
-            # Mark current position as sorted
-            sorted_indices = list(range(i + 1))
-            self.update_bars(arr_copy, sorted_indices=sorted_indices, progress=progress)
-            print(f"  After pass {i}: {arr_copy}")
-            plt.pause(0.5)  # Pause to show result
-        
-        # Final state - all sorted
-        self.update_bars(arr_copy, sorted_indices=list(range(n)), progress=100)
-        
-        # Success message
+        return [self.progress_bar[0], self.stats_text]
+        
+    def event_roles(self, op, i, j):
+        """Highlight the position being filled and the minimum tracked so far."""
+        current = (self.player.counts[SORTED],)
+        if op == COMPARE:
+            return (("current", current), ("minimum_tracked", (j,)), ("comparing", (i,)))
+        if op == SWAP:
+            return (("swapping", (i, j)),)
+        return ()
+        
+    def finish(self, player):
+        """Show the success message and final statistics."""
         self.ax1.set_title('SORTING COMPLETE! Array is now sorted!', 
                           fontsize=16, color='green', fontweight='bold')
-        
-        # Final statistics
+        self.comparisons, self.swaps, _, self.passes = player.counts
         self.stats_text.set_text(f'FINAL: Passes: {self.passes} | Comparisons: {self.comparisons} | Swaps: {self.swaps}')
         
         print(f"\n=== SORTING COMPLETE ===")
-        print(f"Final sorted array: {arr_copy}")
+        print(f"Final sorted array: {self.chart.heights}")
         print(f"Total passes: {self.passes}")
         print(f"Total comparisons: {self.comparisons}")
         print(f"Total swaps: {self.swaps}")
-        
-        plt.show()
-        
-    def visualize_sort(self, arr):
-        """Main method to visualize sorting."""
-        if self.algorithm_name == "selection":
-            self.visualize_selection_sort(arr)
-        else:
-            # Placeholder for other algorithms
-            self.setup_plot(arr)
+        self.fig.canvas.draw_idle()
+        
+    def make_player(self, words):
+        """Build the player that replays words onto the current chart."""
+        return TracePlayer(self.chart, words, speed=self.pause_between_steps,
+                           duration=self.duration, fps=self.fps,
+                           roles=self.event_roles, on_frame=self.update_stats,
+                           on_finish=self.finish)
+        
+    def visualize_sort(self, arr, recorded=None, show=True):
+        """
+        Replay the algorithm's recorded trace with real-time statistics.
+
+        recorded is an (output, trace) pair from record() to play instead of
+        recording again; with show=False the animation starts without
+        blocking in plt.show().
+        """
+        output, trace = recorded or record(self.algorithm_func, arr)
+        self.comparisons = self.swaps = self.passes = 0
+        self.setup_plot(arr)
+        if output is None:
+            # Placeholder for algorithms that are not implemented yet
             self.ax1.set_title(f'{self.algorithm_name.title()} Sort (Coming Soon!)', 
                               fontsize=16, color='orange')
+            if show:
+                plt.show()
+            return
+        
+        print(f"Starting {self.algorithm_name} sort on array: {arr if len(arr) <= 50 else f'{len(arr)} elements'}")
+        self.player = self.make_player(trace.words)
+        self.player.start()
+        self.controls = TimelineControls(self.player)
+        if show:
             plt.show()
 
 
 def main():
     """Main function to run the selection sort visualizer."""
     import argparse
+    import random
+    from video_export import add_export_arguments, export_from_args
     
     parser = argparse.ArgumentParser(description="Selection Sort Visualizer")
-    parser.add_argument("--algo", choices=["selection"], default="selection",
+    parser.add_argument("--algo", choices=ALGORITHMS.names(element_type="int"), default="selection",
                        help="Algorithm to visualize")
     parser.add_argument("--array", type=str, default="7,3,5,2,8,1,9,4,6",
                        help="Comma-separated array to sort")
+    parser.add_argument("--size", type=int, default=None,
+                       help="Sort a shuffled range of this many elements instead of --array "
+                            "(large arrays are drawn as a raster)")
     parser.add_argument("--speed", type=float, default=0.3,
-                       help="Animation speed (lower = faster)")
+                       help="Seconds per operation (lower = faster)")
+    
+    add_playback_arguments(parser)
+    add_export_arguments(parser)
     
     args = parser.parse_args()
     
@@ -266,13 +201,24 @@ def main():
         print("Invalid array format. Using default: [7, 3, 5, 2, 8, 1, 9, 4, 6]")
         arr = [7, 3, 5, 2, 8, 1, 9, 4, 6]
     
-    print(f"Visualizing {args.algo} sort on array: {arr}")
+    shown = arr
+    if args.size:
+        arr = random.sample(range(1, args.size + 1), args.size)
+        shown = f"{args.size} shuffled elements"
+    
+    if args.export:
+        export_from_args(args, SelectionSortVisualizer, arr)
+        return
+    
+    print(f"Visualizing {args.algo} sort on array: {shown}")
     print(f"Animation speed: {args.speed}s per step")
     print("Close the plot window when done!")
     
     # Create and run visualizer
     try:
         visualizer = SelectionSortVisualizer(args.algo)
+        visualizer.fps = args.fps
+        visualizer.duration = args.duration
         visualizer.animation_speed = args.speed
         visualizer.pause_between_steps = args.speed
         visualizer.visualize_sort(arr)
@@ -1,11 +1,194 @@
-from .bubble_sort import bubble_sort
-from .merge_sort import merge_sort
-from .quick_sort import quick_sort
-from .selection_sort import selection_sort
-
-ALGORITHMS = {
-    "bubble": bubble_sort,
-    "merge": merge_sort,
-    "quick": quick_sort,
-    "selection": selection_sort,
-} 
\ No newline at end of file
+"""
+Registry of sorting algorithms.
+
+Each algorithm declares its capabilities in an AlgorithmSpec (stability,
+in-place, complexity classes, largest practical input and supported element
+types).  The harness and visualizers derive their choices and routing from
+the registry.  Algorithm modules are imported on first lookup, so running
+one algorithm (or just parsing CLI arguments) does not pay for importing the
+others.
+"""
+
+import sys
+import types
+from collections import namedtuple
+from collections.abc import Mapping
+
+AlgorithmSpec = namedtuple(
+    "AlgorithmSpec",
+    ["name", "module", "function", "stable", "in_place", "time_class", "space_class",
+     "max_n", "element_types"],
+    defaults=(None, ("int", "float", "str", "bytes")),
+)
+AlgorithmSpec.__doc__ = """
+Capabilities of one registered algorithm.
+
+    name: Registry key (e.g. "bubble")
+    module: Module inside this package implementing it
+    function: Function name in that module
+    stable: Equal elements keep their input order
+    in_place: Algorithm needs no input-sized buffer
+    time_class: Average time complexity, e.g. "O(n^2)"
+    space_class: Auxiliary space, one of memory.SPACE_CLASSES
+    max_n: Largest practical input length, or None if unbounded
+    element_types: Type names the algorithm can sort
+"""
+
+QUADRATIC_MAX_N = 5_000
+
+# NumPy dtype.kind -> element type name
+NUMPY_KINDS = {"b": "int", "i": "int", "u": "int", "f": "float", "S": "bytes", "U": "str"}
+
+# Element type names, most specific base first (bool is an int subclass)
+BASE_TYPES = (("int", int), ("float", float), ("str", str), ("bytes", (bytes, bytearray)))
+
+# bubble and selection sort a copy of their input, so they need O(n) space
+SPECS = (
+    AlgorithmSpec("bubble", "bubble_sort", "bubble_sort", stable=True, in_place=False,
+                  time_class="O(n^2)", space_class="O(n)", max_n=QUADRATIC_MAX_N),
+    AlgorithmSpec("merge", "merge_sort", "merge_sort", stable=True, in_place=False,
+                  time_class="O(n log n)", space_class="O(n)"),
+    AlgorithmSpec("quick", "quick_sort", "quick_sort", stable=False, in_place=True,
+                  time_class="O(n log n)", space_class="O(log n)"),
+    AlgorithmSpec("selection", "selection_sort", "selection_sort", stable=False, in_place=False,
+                  time_class="O(n^2)", space_class="O(n)", max_n=QUADRATIC_MAX_N),
+    AlgorithmSpec("block", "block_merge_sort", "block_merge_sort", stable=True, in_place=True,
+                  time_class="O(n log^2 n)", space_class="O(sqrt n)"),
+    # D: total length of the distinguishing prefixes of the keys
+    AlgorithmSpec("string", "string_sort", "string_sort", stable=False, in_place=False,
+                  time_class="O(n log n + D)", space_class="O(n)",
+                  element_types=("str", "bytes")),
+)
+
+
+def element_types(values):
+    """
+    Return the set of element type names in values (e.g. {"int"}).
+
+    Subclasses and NumPy scalars count as their base type: bool and
+    numpy.int64 are "int", numpy.float64 is "float".  Anything else is named
+    by its own type.
+    """
+    if type(values).__module__ == "numpy" and hasattr(values, "dtype"):
+        return {NUMPY_KINDS.get(values.dtype.kind, "object")}
+    names = {}  # type -> name, so each distinct type is classified once
+    for value in values:
+        kind = type(value)
+        if kind not in names:
+            names[kind] = _type_name(value)
+    return set(names.values())
+
+
+def _type_name(value):
+    """Element type name of one value."""
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and type(value).__module__ == "numpy":
+        return NUMPY_KINDS.get(dtype.kind, "object")
+    for name, base in BASE_TYPES:
+        if isinstance(value, base):
+            return name
+    return type(value).__name__
+
+
+class AlgorithmRegistry(Mapping):
+    """
+    Read-only name -> function mapping backed by AlgorithmSpecs.
+
+    Looking up a name imports its module on demand; spec() and the filters
+    read metadata only and never import algorithm code.
+    """
+
+    def __init__(self, specs):
+        self._specs = {spec.name: spec for spec in specs}
+        self._loaded = {}
+
+    def register(self, spec):
+        """Add or replace an algorithm."""
+        self._specs[spec.name] = spec
+        self._loaded.pop(spec.name, None)
+
+    def spec(self, name):
+        """Return the AlgorithmSpec for name."""
+        return self._specs[name]
+
+    def specs(self):
+        """Return all AlgorithmSpecs in registration order."""
+        return list(self._specs.values())
+
+    def names(self, stable=None, in_place=None, element_type=None):
+        """Return algorithm names, optionally filtered by capability."""
+        return [spec.name for spec in self._specs.values()
+                if (stable is None or spec.stable == stable)
+                and (in_place is None or spec.in_place == in_place)
+                and (element_type is None or element_type in spec.element_types)]
+
+    def unsupported_reason(self, name, values):
+        """
+        Explain why algorithm name should not run on values.
+
+        Args:
+            name: Algorithm name
+            values: Input sequence
+
+        Returns:
+            str or None: "n>LIMIT" for oversize inputs, "type=T" for
+                unsupported element types, None if the input is fine
+        """
+        spec = self._specs[name]
+        unsupported = element_types(values) - set(spec.element_types)
+        if unsupported:
+            return f"type={','.join(sorted(unsupported))}"
+        if spec.max_n is not None and len(values) > spec.max_n:
+            return f"n>{spec.max_n}"
+        return None
+
+    def module(self, name):
+        """Import (once) and return the module implementing algorithm name."""
+        spec = self._specs[name]
+        module_name = f"{__name__}.{spec.module}"
+        # __import__ takes the C import path, so -X importtime reports it
+        __import__(module_name)
+        return sys.modules[module_name]
+
+    def __getitem__(self, name):
+        func = self._loaded.get(name)
+        if func is None:
+            func = getattr(self.module(name), self._specs[name].function)
+            self._loaded[name] = func
+        return func
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self._specs)})"
+
+
+ALGORITHMS = AlgorithmRegistry(SPECS)
+
+# Function name -> algorithm name, for `from sorting_algorithms import bubble_sort`
+_FUNCTIONS = {spec.function: spec.name for spec in SPECS}
+
+
+def __getattr__(name):
+    """Resolve algorithm functions (e.g. bubble_sort) on first access."""
+    if name in _FUNCTIONS:
+        return ALGORITHMS[_FUNCTIONS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Package(types.ModuleType):
+    """Package type that keeps algorithm names bound to their functions."""
+
+    def __setattr__(self, name, value):
+        # `import sorting_algorithms.bubble_sort` binds the submodule here
+        # without going through the registry
+        if name in _FUNCTIONS and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
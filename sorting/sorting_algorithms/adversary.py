@@ -0,0 +1,243 @@
+"""
+Adversarial input generator for the registered sorting algorithms.
+
+Two strategies look for inputs that maximize comparison counts:
+
+- antiqsort: McIlroy's "killer adversary" ("A Killer Adversary for
+  Quicksort", 1999).  Elements start as undecided "gas" and are frozen to
+  concrete values lazily, as the algorithm compares them, always in the way
+  that keeps the current pivot candidate unresolved.
+- mutation search: hill climbing over swaps, segment reversals, block moves
+  and duplications, keeping any mutation that raises the comparison count.
+
+Found inputs are written as named datasets (see datasets.py) that main.py
+can load with --datasets-file and the pytest suite loads from datasets/.
+
+Usage:
+    python -m sorting_algorithms.adversary --algo quick --size 64
+"""
+
+import argparse
+import random
+import sys
+
+from . import ALGORITHMS
+from .datasets import DATASETS_DIR, save_datasets
+
+
+class _Counted:
+    """Element wrapper that counts every comparison made on it."""
+
+    __slots__ = ("value", "counter")
+
+    def __init__(self, value, counter):
+        self.value = value
+        self.counter = counter
+
+    def _cmp(self, other):
+        self.counter[0] += 1
+        return (self.value > other.value) - (self.value < other.value)
+
+    def __lt__(self, other):
+        return self._cmp(other) < 0
+
+    def __le__(self, other):
+        return self._cmp(other) <= 0
+
+    def __gt__(self, other):
+        return self._cmp(other) > 0
+
+    def __ge__(self, other):
+        return self._cmp(other) >= 0
+
+    def __eq__(self, other):
+        return self._cmp(other) == 0
+
+    def __ne__(self, other):
+        return self._cmp(other) != 0
+
+    __hash__ = None
+
+
+class _Lazy(_Counted):
+    """Element wrapper whose value is decided by the adversary on demand."""
+
+    __slots__ = ()
+
+    def _cmp(self, other):
+        return self.counter.compare(self.value, other.value)
+
+
+class _Adversary:
+    """McIlroy's gas/solid adversary over element indices."""
+
+    def __init__(self, n):
+        self.gas = n
+        self.values = [n] * n
+        self.solid = 0
+        self.candidate = 0
+        self.comparisons = 0
+
+    def freeze(self, i):
+        self.values[i] = self.solid
+        self.solid += 1
+
+    def compare(self, x, y):
+        self.comparisons += 1
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            self.freeze(x if x == self.candidate else y)
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return (values[x] > values[y]) - (values[x] < values[y])
+
+
+def count_comparisons(algorithm_func, arr):
+    """
+    Count the comparisons algorithm_func makes while sorting arr.
+
+    Args:
+        algorithm_func: Sorting function taking a list
+        arr: Input list (not modified)
+
+    Returns:
+        int: Number of element comparisons
+    """
+    counter = [0]
+    algorithm_func([_Counted(v, counter) for v in arr])
+    return counter[0]
+
+
+def antiqsort(algorithm_func, n):
+    """
+    Build an input of length n that drives algorithm_func to many comparisons.
+
+    Args:
+        algorithm_func: Sorting function taking a list
+        n: Input length
+
+    Returns:
+        tuple: (dataset, comparisons) where dataset is a permutation of 0..n-1
+    """
+    adversary = _Adversary(n)
+    algorithm_func([_Lazy(i, adversary) for i in range(n)])
+    # Elements never compared against a solid are still gas; freeze in order
+    for i in range(n):
+        if adversary.values[i] == adversary.gas:
+            adversary.freeze(i)
+    return adversary.values, adversary.comparisons
+
+
+def _mutate(arr, rng):
+    """Return a mutated copy of arr (swap, reverse, block move or duplicate)."""
+    out = arr.copy()
+    n = len(out)
+    i, j = sorted(rng.sample(range(n), 2))
+    kind = rng.randrange(4)
+    if kind == 0:
+        out[i], out[j] = out[j], out[i]
+    elif kind == 1:
+        out[i:j + 1] = out[i:j + 1][::-1]
+    elif kind == 2:
+        block = out[i:j]
+        del out[i:j]
+        k = rng.randrange(len(out) + 1)
+        out[k:k] = block
+    else:
+        out[i] = out[j]
+    return out
+
+
+def mutation_search(algorithm_func, seeds, iterations=200, rng=None):
+    """
+    Hill-climb from seed inputs towards inputs with more comparisons.
+
+    Args:
+        algorithm_func: Sorting function taking a list
+        seeds: Non-empty list of starting inputs (same length, at least 2)
+        iterations: Number of mutations to try
+        rng: random.Random instance (seeded for reproducibility)
+
+    Returns:
+        tuple: (worst input found, its comparison count)
+    """
+    rng = rng or random.Random(0)
+    best, best_score = None, -1
+    for seed in seeds:
+        score = count_comparisons(algorithm_func, seed)
+        if score > best_score:
+            best, best_score = list(seed), score
+    for _ in range(iterations):
+        candidate = _mutate(best, rng)
+        score = count_comparisons(algorithm_func, candidate)
+        if score >= best_score:
+            best, best_score = candidate, score
+    return best, best_score
+
+
+def find_worst_inputs(algorithm_name, sizes, iterations=200, seed=0):
+    """
+    Run both strategies for one registered algorithm.
+
+    Args:
+        algorithm_name: Key in ALGORITHMS
+        sizes: Input lengths to search
+        iterations: Mutation-search iterations per size
+        seed: RNG seed
+
+    Returns:
+        dict: Dataset name -> (input list, comparisons)
+    """
+    algorithm_func = ALGORITHMS[algorithm_name]
+    rng = random.Random(seed)
+    found = {}
+    for n in sizes:
+        killer, killer_score = antiqsort(algorithm_func, n)
+        found[f"antiqsort_{algorithm_name}_n{n}"] = (killer, killer_score)
+        if n < 2:
+            continue
+        seeds = [killer, list(range(n)), list(range(n, 0, -1)), rng.sample(range(n), n)]
+        worst, worst_score = mutation_search(algorithm_func, seeds, iterations, rng)
+        found[f"mutated_{algorithm_name}_n{n}"] = (worst, worst_score)
+    return found
+
+
+def main():
+    """Search for worst-case inputs and write them as named datasets."""
+    parser = argparse.ArgumentParser(description="Adversarial input generator (antiqsort + mutation search)")
+    parser.add_argument("--algo", choices=ALGORITHMS.names(element_type="int") + ["all"], required=True,
+                       help="Algorithm to attack")
+    parser.add_argument("--size", type=int, action="append",
+                       help="Input length (repeatable; default: 16 and 64)")
+    parser.add_argument("--iterations", type=int, default=200,
+                       help="Mutation-search iterations per size (default: 200)")
+    parser.add_argument("--seed", type=int, default=0,
+                       help="RNG seed (default: 0)")
+    parser.add_argument("--output", default=f"{DATASETS_DIR}/adversarial.json",
+                       help="Dataset file to merge results into")
+
+    args = parser.parse_args()
+    names = ALGORITHMS.names(element_type="int") if args.algo == "all" else [args.algo]
+    sizes = args.size or [16, 64]
+
+    datasets = {}
+    for name in names:
+        for dataset_name, (values, comparisons) in find_worst_inputs(
+                name, sizes, args.iterations, args.seed).items():
+            if comparisons == 0:
+                print(f"SKIP {dataset_name}: algorithm made no comparisons", file=sys.stderr)
+                continue
+            n = len(values)
+            print(f"DATASET={dataset_name} N={n} COMPARISONS={comparisons} "
+                  f"PER_N_LOG_N={comparisons / max(1, n * n.bit_length()):.2f}")
+            datasets[dataset_name] = values
+
+    if datasets:
+        save_datasets(args.output, datasets)
+        print(f"Wrote {len(datasets)} datasets to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
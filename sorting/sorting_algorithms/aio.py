@@ -0,0 +1,148 @@
+"""
+asyncio-friendly sorting that never blocks the event loop.
+
+sort_async() and merge_sorted() are for services that sort inside an
+event loop (aiohttp handlers, serve.SortServer-style servers):
+
+- With algorithm=None, numeric NumPy arrays and int lists of at least
+  OFFLOAD_THRESHOLD elements are sorted by np.sort on an executor thread;
+  np.sort releases the GIL, so the loop keeps running meanwhile.
+- A registry algorithm run with executor= on at least OFFLOAD_THRESHOLD
+  elements goes to that executor whole (a ProcessPoolExecutor runs it in
+  parallel with the loop).
+- Everything else runs on the loop in cooperative slices: the input is cut
+  into slices sorted one at a time (QUADRATIC_SLICE elements for O(n^2)
+  algorithms, SLICE elements otherwise), with a yield to the loop after
+  each, then the sorted slices are merged by merge_sorted(), which yields
+  every SLICE output elements.  A slice is also small enough to pass an
+  algorithm's max_n, so a 50k-element selection sort does not tie up the
+  loop (and finishes sooner than one 50k-element pass would).
+
+Cancelling the awaiting task stops cooperative work at the next slice
+boundary.  Work already handed to an executor cannot be interrupted; a
+cancelled caller stops waiting for it and its result is dropped.
+"""
+
+import asyncio
+import heapq
+from itertools import islice
+
+from . import ALGORITHMS, element_types
+from .serve import SortError, sort_one
+
+# Inputs at least this long may leave the event loop (NumPy or executor)
+OFFLOAD_THRESHOLD = 10_000
+
+# Elements sorted or merged between yields to the event loop
+SLICE = 4096
+
+# Slice length for O(n^2) algorithms (about 30k comparisons per slice)
+QUADRATIC_SLICE = 256
+
+
+async def sort_async(values, algorithm=None, executor=None, offload_threshold=OFFLOAD_THRESHOLD):
+    """
+    Sort values without blocking the running event loop.
+
+    Args:
+        values: List, array or 1-D NumPy array to sort
+        algorithm: Registry name (see ALGORITHMS), or None for the fastest
+            available sort (np.sort for numeric data, else sorted())
+        executor: Optional concurrent.futures executor for large inputs
+            (None: np.sort runs on the loop's default executor and registry
+            algorithms stay on the loop in slices)
+        offload_threshold: Smallest input that may leave the event loop
+
+    Returns:
+        Sorted list (a NumPy array for NumPy input sorted by np.sort)
+
+    Raises:
+        SortError: If the algorithm is unknown, rejects the input or
+            returns no result
+    """
+    loop = asyncio.get_running_loop()
+    if algorithm is None:
+        if _use_numpy(values, offload_threshold):
+            return await loop.run_in_executor(executor, _numpy_sort, values)
+    elif algorithm not in ALGORITHMS:
+        raise SortError(f"unknown algorithm '{algorithm}'")
+    if type(values).__module__ == "numpy" and hasattr(values, "dtype"):
+        values = values.tolist()
+
+    if algorithm is not None and executor is not None and len(values) >= offload_threshold:
+        return await loop.run_in_executor(executor, sort_one, algorithm, list(values))
+
+    if algorithm is None:
+        sort_slice, size = sorted, SLICE
+    else:
+        sort_slice = lambda part: sort_one(algorithm, part)
+        size = QUADRATIC_SLICE if ALGORITHMS.spec(algorithm).time_class == "O(n^2)" else SLICE
+    if len(values) <= size:
+        return sort_slice(list(values))
+    runs = []
+    for start in range(0, len(values), size):
+        runs.append(sort_slice(list(values[start:start + size])))
+        await asyncio.sleep(0)
+    return await merge_sorted(*runs)
+
+
+async def merge_sorted(*runs, executor=None):
+    """
+    Merge sorted runs into one sorted list without blocking the event loop.
+
+    Equal elements keep the order of the runs they came from, so merging
+    the slices of a stable sort stays stable.  Numeric NumPy runs are
+    concatenated and merged by a stable np.sort on an executor thread.
+
+    Args:
+        *runs: Sorted lists, arrays or NumPy arrays
+        executor: Executor for the NumPy path (None: the loop's default)
+
+    Returns:
+        Merged list (a NumPy array if every run is a numeric NumPy array)
+    """
+    if runs and all(_is_numeric_array(run) for run in runs):
+        import numpy as np
+
+        loop = asyncio.get_running_loop()
+        merged = np.concatenate(runs)
+        # kind="stable" finds the presorted runs, so this is a k-way merge
+        return await loop.run_in_executor(executor, lambda: np.sort(merged, kind="stable"))
+
+    output = []
+    merged = heapq.merge(*runs)
+    while True:
+        batch = list(islice(merged, SLICE))
+        output.extend(batch)
+        if len(batch) < SLICE:
+            return output
+        await asyncio.sleep(0)
+
+
+def _numpy_sort(values):
+    """Executor entry point: np.sort, returning a list for list input."""
+    import numpy as np
+
+    if _is_numeric_array(values):
+        return np.sort(values)
+    return np.sort(np.asarray(values, dtype=np.int64)).tolist()
+
+
+def _is_numeric_array(values):
+    """True for NumPy arrays of bool, int or float."""
+    return (type(values).__module__ == "numpy" and hasattr(values, "dtype")
+            and values.dtype.kind in "biuf")
+
+
+def _use_numpy(values, threshold):
+    """True if np.sort should sort values."""
+    if _is_numeric_array(values):
+        return True
+    if len(values) < threshold or element_types(values) != {"int"}:
+        return False
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    # Beyond int64 NumPy would fall back to (slow) object arrays
+    return -(1 << 63) <= min(values) and max(values) < 1 << 63
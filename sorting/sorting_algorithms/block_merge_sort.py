@@ -0,0 +1,199 @@
+"""
+Stable block merge sort with an O(sqrt n) merge buffer.
+
+A plain merge sort needs n extra slots to stay stable.  This one sorts in
+place with a single buffer of isqrt(n) slots:
+
+- Blocks of INSERTION_BLOCK elements are insertion-sorted, then merged
+  bottom-up in passes of doubling width.
+- A merge whose shorter run fits in the buffer copies that run out and
+  merges it back in one linear sweep (forwards for the left run,
+  backwards for the right one).
+- When both runs are longer than the buffer, the merge is split
+  SymMerge-style (Kim and Kutzner): a binary search finds where the two
+  runs cross the middle of the range, one rotation (three reversals, no
+  extra memory) swaps the middle pieces, and each half is merged on its
+  own until a side fits the buffer.
+
+Runs that are already in order are detected with one comparison and left
+alone, so presorted input costs a single pass.  Every tie is resolved in
+favour of the left run, which keeps the sort stable.
+"""
+
+import math
+
+from .trace import COMPARE, SORTED, SWAP, WRITE
+
+# Blocks insertion-sorted before the first merge pass
+INSERTION_BLOCK = 16
+
+
+def block_merge_sort(arr, trace=None):
+    """
+    Stably sorts a list using block merge sort with an O(sqrt n) buffer.
+
+    The list is sorted in place and returned, so the only auxiliary memory
+    is the merge buffer.  A traced run sorts a copy instead, leaving the
+    input for replay; its write events carry values, so tracing needs int
+    elements.
+
+    Args:
+        arr: List to be sorted
+        trace: Optional trace.Trace that records compare/swap/write events
+
+    Returns:
+        List: The sorted list (arr itself when untraced)
+    """
+    data = arr if trace is None else list(arr)
+    emit = trace.emit if trace is not None else None
+    n = len(data)
+    for lo in range(0, n, INSERTION_BLOCK):
+        _insertion_sort(data, lo, min(lo + INSERTION_BLOCK, n), emit)
+    if emit is not None:
+        trace.flush()
+
+    if n > INSERTION_BLOCK:
+        buffer = [None] * math.isqrt(n)
+        width = INSERTION_BLOCK
+        while width < n:
+            for lo in range(0, n - width, 2 * width):
+                _merge(data, lo, lo + width, min(lo + 2 * width, n), buffer, emit)
+            if emit is not None:
+                trace.flush()
+            width *= 2
+
+    if emit is not None:
+        for i in range(n):
+            emit((i << 2 | SORTED, i))
+        trace.flush()
+    return data
+
+
+def _insertion_sort(arr, lo, hi, emit):
+    """Stable insertion sort of arr[lo:hi]; each shift is recorded as a swap."""
+    for i in range(lo + 1, hi):
+        value = arr[i]
+        j = i
+        while j > lo:
+            if emit is not None:
+                emit((j - 1 << 2 | COMPARE, j))
+            if not value < arr[j - 1]:
+                break
+            arr[j] = arr[j - 1]
+            if emit is not None:
+                emit((j - 1 << 2 | SWAP, j))
+            j -= 1
+        arr[j] = value
+
+
+def _reverse(arr, lo, hi, emit):
+    """Reverse arr[lo:hi] in place."""
+    hi -= 1
+    while lo < hi:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+        if emit is not None:
+            emit((lo << 2 | SWAP, hi))
+        lo += 1
+        hi -= 1
+
+
+def _rotate(arr, lo, mid, hi, emit):
+    """Swap the adjacent pieces arr[lo:mid] and arr[mid:hi] with three reversals."""
+    _reverse(arr, lo, mid, emit)
+    _reverse(arr, mid, hi, emit)
+    _reverse(arr, lo, hi, emit)
+
+
+def _merge_forward(arr, lo, mid, hi, buffer, emit):
+    """Merge runs arr[lo:mid] and arr[mid:hi] with the left run in the buffer."""
+    left = mid - lo
+    for k in range(left):
+        buffer[k] = arr[lo + k]
+    i, j, out = 0, mid, lo
+    while i < left and j < hi:
+        if emit is not None:
+            emit((j << 2 | COMPARE, out))
+        if arr[j] < buffer[i]:
+            value = arr[j]
+            j += 1
+        else:
+            value = buffer[i]
+            i += 1
+        arr[out] = value
+        if emit is not None:
+            emit((out << 2 | WRITE, value))
+        out += 1
+    while i < left:
+        value = arr[out] = buffer[i]
+        if emit is not None:
+            emit((out << 2 | WRITE, value))
+        i += 1
+        out += 1
+
+
+def _merge_backward(arr, lo, mid, hi, buffer, emit):
+    """Merge runs arr[lo:mid] and arr[mid:hi] with the right run in the buffer."""
+    right = hi - mid
+    for k in range(right):
+        buffer[k] = arr[mid + k]
+    i, j, out = mid - 1, right - 1, hi - 1
+    while i >= lo and j >= 0:
+        if emit is not None:
+            emit((i << 2 | COMPARE, out))
+        if buffer[j] < arr[i]:
+            value = arr[i]
+            i -= 1
+        else:
+            value = buffer[j]
+            j -= 1
+        arr[out] = value
+        if emit is not None:
+            emit((out << 2 | WRITE, value))
+        out -= 1
+    while j >= 0:
+        value = arr[out] = buffer[j]
+        if emit is not None:
+            emit((out << 2 | WRITE, value))
+        j -= 1
+        out -= 1
+
+
+def _merge(arr, lo, mid, hi, buffer, emit):
+    """Stably merge the sorted runs arr[lo:mid] and arr[mid:hi]."""
+    if lo == mid or mid == hi:
+        return
+    if emit is not None:
+        emit((mid - 1 << 2 | COMPARE, mid))
+    if not arr[mid] < arr[mid - 1]:
+        return  # already in order
+    if mid - lo <= len(buffer):
+        _merge_forward(arr, lo, mid, hi, buffer, emit)
+        return
+    if hi - mid <= len(buffer):
+        _merge_backward(arr, lo, mid, hi, buffer, emit)
+        return
+
+    # SymMerge: find start so that arr[start:mid] and arr[mid:end] are the
+    # pieces that cross the middle m, swap them, then merge each half
+    m = (lo + hi) // 2
+    total = m + mid
+    if mid > m:
+        start, r = total - hi, m
+    else:
+        start, r = lo, mid
+    p = total - 1
+    while start < r:
+        c = (start + r) // 2
+        if emit is not None:
+            emit((p - c << 2 | COMPARE, c))
+        if not arr[p - c] < arr[c]:
+            start = c + 1
+        else:
+            r = c
+    end = total - start
+    if start < mid < end:
+        _rotate(arr, start, mid, end, emit)
+    if lo < start < m:
+        _merge(arr, lo, start, m, buffer, emit)
+    if m < end < hi:
+        _merge(arr, m, end, hi, buffer, emit)
@@ -1,24 +1,47 @@
+from .trace import COMPARE, SORTED, SWAP
+
+
 def visualize_sorting(arr, step_name, current_arr):
     """Visualize the current state of the array during sorting."""
     print(f"{step_name}: {current_arr}")
 
 
-def bubble_sort(arr, visualize=False):
+def bubble_sort(arr, visualize=False, trace=None):
     """
     Sorts an array using bubble sort algorithm.
     
     Args:
         arr: List to be sorted
         visualize: If True, show the sorting process step by step
+        trace: Optional trace.Trace that records compare/swap events
         
     Returns:
         List: Sorted array
     """
     myArr = arr.copy()
+    if trace is not None:
+        return _bubble_sort_traced(myArr, trace)
  
     for i in range(len(myArr)):
         for j in range(len(myArr)-i-1):
             if myArr[j] > myArr[j+1]:
                 myArr[j], myArr[j+1] = myArr[j+1], myArr[j]
     
-    return myArr
\ No newline at end of file
+    return myArr
+
+
+def _bubble_sort_traced(myArr, trace):
+    """Bubble sort loop that records its events into trace."""
+    emit = trace.emit
+    n = len(myArr)
+    for i in range(n):
+        for j in range(n - i - 1):
+            emit((j << 2 | COMPARE, j + 1))
+            if myArr[j] > myArr[j+1]:
+                myArr[j], myArr[j+1] = myArr[j+1], myArr[j]
+                emit((j << 2 | SWAP, j + 1))
+        last = n - i - 1
+        emit((last << 2 | SORTED, last))
+        trace.flush()
+    
+    return myArr
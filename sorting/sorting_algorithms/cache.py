@@ -0,0 +1,216 @@
+"""
+Content-addressed datasets and an on-disk result cache for the harness.
+
+Datasets are keyed by a hash of their contents, so an input that appears
+under several names runs once per algorithm.  Verified results are cached
+by (algorithm version, input hash); the algorithm version hashes the source
+of the module that defines the algorithm, of every package module it
+imports (transitively, including imports inside functions) and of the
+verifier, so editing an algorithm, a helper it calls or verify.py
+invalidates its entries.  The cache is a bounded LRU persisted as one JSON
+file.
+"""
+
+import ast
+import hashlib
+import json
+import marshal
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+
+CACHE_FILE = "results.json"
+
+# Most (algorithm version, input hash) entries kept on disk
+MAX_ENTRIES = 4096
+
+# Elements hashed per repr() call, bounding the temporary string size
+HASH_CHUNK = 1 << 16
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sources that decide a cached verdict besides the algorithm's own
+VERIFIER_FILES = (os.path.join(PACKAGE_DIR, "verify.py"),)
+
+
+def content_hash(values):
+    """
+    Hash a dataset's contents; element types count ([1] and [1.0] differ).
+
+    Args:
+        values: List of values, or a NumPy array
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if hasattr(values, "dtype"):
+        digest.update(f"{values.dtype.str}{values.shape}".encode())
+        digest.update(values.tobytes())
+        return digest.hexdigest()
+    for start in range(0, len(values), HASH_CHUNK):
+        digest.update(repr(values[start:start + HASH_CHUNK]).encode())
+    return digest.hexdigest()
+
+
+def algorithm_version(func, verifier_files=VERIFIER_FILES):
+    """
+    Hash func's name with the sources its verdicts depend on.
+
+    Those are func's module, the verifier and every package module either
+    imports, transitively.  Falls back to the compiled code object when
+    func's source is unavailable.
+    """
+    digest = hashlib.blake2b(func.__qualname__.encode(), digest_size=16)
+    path = getattr(sys.modules.get(func.__module__), "__file__", None)
+    roots = list(verifier_files)
+    if path and os.path.isfile(path):
+        roots.append(path)
+    else:
+        digest.update(marshal.dumps(func.__code__))
+    for source in local_sources(roots):
+        digest.update(os.path.basename(source).encode())
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def local_sources(paths):
+    """
+    Return paths plus the package source files they import, transitively.
+
+    Relative imports and absolute sorting_algorithms imports are followed,
+    wherever they appear in the module (imports inside functions count).
+
+    Returns:
+        list: Sorted absolute paths
+    """
+    found = set()
+    pending = [os.path.abspath(path) for path in paths]
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.level:
+                directory = os.path.dirname(path)
+                for _ in range(node.level - 1):
+                    directory = os.path.dirname(directory)
+                parts = node.module.split(".") if node.module else []
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and _in_package(node.module):
+                directory = os.path.dirname(PACKAGE_DIR)
+                parts, names = node.module.split("."), [alias.name for alias in node.names]
+            elif isinstance(node, ast.Import):
+                directory = os.path.dirname(PACKAGE_DIR)
+                for alias in node.names:
+                    if _in_package(alias.name):
+                        pending.extend(_module_files(directory, alias.name.split("."), []))
+                continue
+            else:
+                continue
+            pending.extend(_module_files(directory, parts, names))
+    return sorted(found)
+
+
+def _in_package(module):
+    """True if module names this package or one of its submodules."""
+    package = os.path.basename(PACKAGE_DIR)
+    return module is not None and (module == package or module.startswith(package + "."))
+
+
+def _module_files(directory, parts, names):
+    """Source files for `from <parts> import <names>` resolved under directory."""
+    target = os.path.join(directory, *parts)
+    if os.path.isfile(target + ".py"):
+        return [target + ".py"]
+    files = []
+    if os.path.isfile(os.path.join(target, "__init__.py")):
+        files.append(os.path.join(target, "__init__.py"))
+        # `from . import name` may name a submodule
+        files += [os.path.join(target, name + ".py") for name in names
+                  if os.path.isfile(os.path.join(target, name + ".py"))]
+    return files
+
+
+class DatasetStore(Mapping):
+    """Named datasets with memoized content hashes."""
+
+    def __init__(self, datasets):
+        self.datasets = datasets
+        self._hashes = {}
+
+    def __getitem__(self, name):
+        return self.datasets[name]
+
+    def __iter__(self):
+        return iter(self.datasets)
+
+    def __len__(self):
+        return len(self.datasets)
+
+    def hash(self, name):
+        """Return the content hash of dataset name, computing it once."""
+        if name not in self._hashes:
+            self._hashes[name] = content_hash(self.datasets[name])
+        return self._hashes[name]
+
+    def aliases(self):
+        """Return {content hash: [names]} for contents stored under several names."""
+        groups = {}
+        for name in self.datasets:
+            groups.setdefault(self.hash(name), []).append(name)
+        return {key: names for key, names in groups.items() if len(names) > 1}
+
+
+class ResultCache:
+    """Bounded LRU of verified results, persisted as JSON in directory."""
+
+    def __init__(self, directory, max_entries=MAX_ENTRIES):
+        self.directory = directory
+        self.path = os.path.join(directory, CACHE_FILE)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except ValueError:
+            # A truncated or hand-edited cache is just rebuilt
+            data = {}
+        if isinstance(data, dict):
+            self.entries.update(data)
+
+    def get(self, version, input_hash):
+        """Return the cached result dict, or None on a miss."""
+        key = f"{version}:{input_hash}"
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, version, input_hash, result):
+        """Store result, evicting the least recently used entries."""
+        key = f"{version}:{input_hash}"
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache atomically (temp file + rename)."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
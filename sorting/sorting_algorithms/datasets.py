@@ -0,0 +1,58 @@
+"""
+Named dataset files shared by the harness and the pytest suite.
+
+A dataset file is a JSON object mapping dataset names to integer lists.
+"""
+
+import glob
+import json
+import os
+
+# Directory of generated dataset files picked up by the pytest suite
+DATASETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datasets")
+
+
+def load_datasets(path):
+    """
+    Load named datasets from a JSON file.
+
+    Args:
+        path: Path to a JSON object of name -> list
+
+    Returns:
+        dict: Dataset name -> list, in file order
+    """
+    with open(path) as f:
+        datasets = json.load(f)
+    if not isinstance(datasets, dict) or not all(isinstance(v, list) for v in datasets.values()):
+        raise ValueError(f"{path}: expected a JSON object mapping names to lists")
+    return datasets
+
+
+def load_dataset_dir(directory=DATASETS_DIR):
+    """Load and merge every *.json dataset file in directory (sorted by name)."""
+    datasets = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        datasets.update(load_datasets(path))
+    return datasets
+
+
+def save_datasets(path, datasets, merge=True):
+    """
+    Write named datasets to a JSON file, one dataset per line.
+
+    Args:
+        path: Output path
+        datasets: Dict of name -> list
+        merge: If True, keep datasets already in the file unless replaced
+    """
+    if merge and os.path.exists(path):
+        existing = load_datasets(path)
+        existing.update(datasets)
+        datasets = existing
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lines = [f"  {json.dumps(name)}: {json.dumps(values)}" for name, values in datasets.items()]
+    with open(path, "w") as f:
+        f.write("{\n" + ",\n".join(lines) + "\n}\n")
@@ -0,0 +1,296 @@
+"""
+Distributed sample sort over worker processes connected by sockets.
+
+The coordinator draws a random sample of the input, sorts it and takes
+workers - 1 evenly spaced splitters, so every worker receives a contiguous
+value range of about n / workers elements.  Each range partition is sent
+to its worker as one length-prefixed binary frame (see wire.py) over TCP;
+the worker sorts it with an in-package algorithm and sends it back the same
+way.  Partitions are sent concurrently, one connection per worker, and
+come back already in global order: the result is their concatenation, and
+iter_sample_sort() yields each partition as soon as it and every earlier
+one have arrived.
+
+Workers are plain TCP servers, so they can run on other machines.
+LocalCluster starts them as subprocesses on localhost, which stands in for
+a cluster on one box.
+
+Usage:
+    python -m sorting_algorithms.distributed worker --host 0.0.0.0 --port 7900
+    python -m sorting_algorithms.distributed sort --connect a:7900,b:7900 --input-file big.txt
+    python -m sorting_algorithms.distributed sort --local 4 --algo bubble --input-file big.txt
+"""
+
+import argparse
+import os
+import random
+import socket
+import socketserver
+import subprocess
+import sys
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from . import element_types
+from .wire import FrameError, pack_error, pack_frame, read_frame
+
+# Sample elements drawn per worker when choosing splitters
+OVERSAMPLE = 64
+
+DEFAULT_ALGORITHM = "block"
+
+# Seconds to wait for a worker's reply
+TIMEOUT = 300.0
+
+INT32_MIN, INT32_MAX = -(1 << 31), (1 << 31) - 1
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def choose_splitters(values, parts, oversample=OVERSAMPLE, rng=None):
+    """
+    Pick parts - 1 splitters from a sorted random sample of values.
+
+    Args:
+        values: Input sequence
+        parts: Number of partitions
+        oversample: Sample elements per partition
+        rng: random.Random to sample with (default: a fresh one)
+
+    Returns:
+        list: Non-decreasing splitters; partition k holds values v with
+            splitters[k - 1] <= v < splitters[k]
+    """
+    if parts < 2 or not values:
+        return []
+    rng = rng or random.Random()
+    sample = sorted(rng.sample(values, min(len(values), parts * oversample)))
+    return [sample[k * len(sample) // parts] for k in range(1, parts)]
+
+
+def partition(values, splitters):
+    """Split values into len(splitters) + 1 range partitions."""
+    parts = [[] for _ in range(len(splitters) + 1)]
+    appends = [part.append for part in parts]
+    for value in values:
+        appends[bisect_right(splitters, value)](value)
+    return parts
+
+
+def frame_itemsize(values):
+    """Return 4 or 8: the smallest frame item size that holds every value."""
+    if not values:
+        return 4
+    low, high = min(values), max(values)
+    if INT32_MIN <= low and high <= INT32_MAX:
+        return 4
+    if INT64_MIN <= low and high <= INT64_MAX:
+        return 8
+    raise ValueError("values do not fit in int64 frames")
+
+
+def sort_on_worker(address, algorithm, values, itemsize=8, timeout=TIMEOUT):
+    """
+    Have the worker at address sort values; return the sorted list.
+
+    Raises:
+        FrameError: If the worker answers with an error frame
+    """
+    with socket.create_connection(address, timeout=timeout) as sock:
+        sock.sendall(pack_frame(algorithm, values, itemsize))
+        with sock.makefile("rb") as stream:
+            try:
+                _, output, _ = read_frame(stream)
+            except FrameError as e:
+                raise FrameError(f"worker {address[0]}:{address[1]}: {e}") from None
+    return output
+
+
+def iter_sample_sort(values, addresses, algorithm=DEFAULT_ALGORITHM, oversample=OVERSAMPLE,
+                     rng=None, timeout=TIMEOUT):
+    """
+    Sample-sort ints on remote workers, yielding sorted partitions in order.
+
+    Args:
+        values: List of ints (int64 range)
+        addresses: (host, port) of each worker
+        algorithm: Registry name of the algorithm the workers run
+        oversample: Sample elements per worker when choosing splitters
+        rng: random.Random for sampling (default: a fresh one)
+        timeout: Seconds to wait for each worker
+
+    Yields:
+        list: Sorted partitions; concatenated they are the sorted input
+    """
+    unsupported = element_types(values) - {"int"}
+    if unsupported:
+        raise TypeError(f"sample sort ships int frames, not {', '.join(sorted(unsupported))}")
+    if not addresses:
+        raise ValueError("sample sort needs at least one worker")
+    if not values:
+        return
+    itemsize = frame_itemsize(values)
+    parts = partition(values, choose_splitters(values, len(addresses), oversample, rng))
+    with ThreadPoolExecutor(len(addresses)) as pool:
+        futures = [pool.submit(sort_on_worker, address, algorithm, part, itemsize, timeout)
+                   if part else None
+                   for address, part in zip(addresses, parts)]
+        for future in futures:
+            if future is not None:
+                yield future.result()
+
+
+def sample_sort(values, addresses, algorithm=DEFAULT_ALGORITHM, oversample=OVERSAMPLE, rng=None,
+                timeout=TIMEOUT):
+    """Sample-sort ints on remote workers and return the sorted list."""
+    output = []
+    for part in iter_sample_sort(values, addresses, algorithm, oversample, rng, timeout):
+        output.extend(part)
+    return output
+
+
+class PartitionHandler(socketserver.StreamRequestHandler):
+    """Sort every frame received on a connection and send the result back."""
+
+    def handle(self):
+        # Imported here so the coordinator side does not load the service stack
+        from .serve import sort_one
+
+        while True:
+            try:
+                name, values, itemsize = read_frame(self.rfile)
+            except EOFError:
+                return
+            except FrameError as e:
+                self.wfile.write(pack_error(str(e)))
+                return
+            try:
+                reply = pack_frame(name, sort_one(name, values), itemsize)
+            except Exception as e:
+                reply = pack_error(str(e))
+            self.wfile.write(reply)
+            self.wfile.flush()
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    """TCP server for PartitionHandler."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def run_worker(host="127.0.0.1", port=0):
+    """Serve partitions forever, after printing PORT=<port> on stdout."""
+    with WorkerServer((host, port), PartitionHandler) as server:
+        print(f"PORT={server.server_address[1]}", flush=True)
+        server.serve_forever()
+
+
+class LocalCluster:
+    """
+    Workers started as subprocesses on localhost (a stand-in cluster).
+
+    Use as a context manager; addresses lists each worker's (host, port).
+    """
+
+    def __init__(self, workers, host="127.0.0.1"):
+        self.workers = workers
+        self.host = host
+        self.processes = []
+        self.addresses = []
+
+    def start(self):
+        """Start the workers and wait for each to report its port."""
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        command = [sys.executable, "-m", "sorting_algorithms.distributed", "worker",
+                   "--host", self.host, "--port", "0"]
+        for _ in range(self.workers):
+            self.processes.append(subprocess.Popen(command, cwd=package_root,
+                                                   stdout=subprocess.PIPE, text=True))
+        for process in self.processes:
+            line = process.stdout.readline()
+            if not line.startswith("PORT="):
+                self.stop()
+                raise RuntimeError(f"worker failed to start (exit status {process.poll()})")
+            self.addresses.append((self.host, int(line[5:])))
+        return self
+
+    def stop(self):
+        """Terminate every worker."""
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.wait()
+            process.stdout.close()
+        self.processes = []
+        self.addresses = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_address(text):
+    """Parse host:port into (host, port)."""
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main():
+    """Run a worker, or sort a file on workers."""
+    from .fileio import FORMATS, read_values, write_values
+
+    parser = argparse.ArgumentParser(description="Distributed sample sort")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Sort partitions sent by a coordinator")
+    worker.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    worker.add_argument("--port", type=int, default=0, help="Port (default: any free port)")
+
+    sort = commands.add_parser("sort", help="Sample-sort a file on workers")
+    target = sort.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connect", metavar="HOST:PORT,...",
+                        help="Comma-separated worker addresses")
+    target.add_argument("--local", type=int, metavar="N",
+                        help="Start N workers on localhost for this run")
+    sort.add_argument("--algo", default=DEFAULT_ALGORITHM,
+                      help=f"Algorithm the workers run (default: {DEFAULT_ALGORITHM})")
+    sort.add_argument("--input-file", required=True, metavar="PATH",
+                      help="Values to sort ('-' for stdin)")
+    sort.add_argument("--input-format", choices=FORMATS, default="text",
+                      help="Input format (default: text)")
+    sort.add_argument("--output-file", default="-", metavar="PATH",
+                      help="Where to write the sorted values (default: stdout)")
+    sort.add_argument("--output-format", choices=FORMATS,
+                      help="Output format (default: same as --input-format)")
+    sort.add_argument("--seed", type=int, default=None, help="Sampling RNG seed")
+
+    args = parser.parse_args()
+    if args.command == "worker":
+        try:
+            run_worker(args.host, args.port)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        values = read_values(args.input_file, args.input_format)
+    except (OSError, ValueError, IndexError) as e:
+        sort.error(f"cannot read --input-file {args.input_file}: {e}")
+    rng = random.Random(args.seed)
+    try:
+        if args.local:
+            with LocalCluster(args.local) as cluster:
+                output = sample_sort(values, cluster.addresses, args.algo, rng=rng)
+        else:
+            addresses = [parse_address(item) for item in args.connect.split(",")]
+            output = sample_sort(values, addresses, args.algo, rng=rng)
+    except (FrameError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    write_values(output, args.output_file, args.output_format or args.input_format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Bulk file and stdin/stdout I/O for integer datasets.
+
+Formats:
+    text: whitespace/newline-delimited numbers
+    csv: one column of a CSV file (index, or header name)
+    int32, int64: raw little-endian binary
+
+Text is parsed in large chunks with map(int, ...) rather than line by line;
+binary files are read with numpy.fromfile (or mmap + array without NumPy)
+and written with array.tofile.  The path "-" means stdin/stdout.
+"""
+
+import contextlib
+import csv
+import io
+import mmap
+import sys
+from array import array
+
+FORMATS = ("text", "csv", "int32", "int64")
+
+# array typecodes for raw little-endian binary formats
+BINARY_TYPECODES = {"int32": "i", "int64": "q"}
+
+# Bytes read or written per chunk
+CHUNK_BYTES = 1 << 22
+
+# Values formatted per buffered write for text output
+WRITE_CHUNK = 1 << 16
+
+
+def _parse_numbers(tokens):
+    """Parse a list of byte/str tokens as ints, falling back to floats."""
+    try:
+        return list(map(int, tokens))
+    except ValueError:
+        return list(map(float, tokens))
+
+
+def _open_binary(path, mode):
+    """Open path in binary mode; "-" maps to stdin/stdout, streams pass through."""
+    if hasattr(path, "read") or hasattr(path, "write"):
+        return contextlib.nullcontext(path)
+    if path == "-":
+        # nullcontext leaves the process-wide stream open after the with-block
+        return contextlib.nullcontext(sys.stdin.buffer if "r" in mode else sys.stdout.buffer)
+    return open(path, mode, buffering=CHUNK_BYTES)
+
+
+def _binary_array(data, fmt):
+    """Wrap little-endian bytes in an array of the format's typecode."""
+    values = array(BINARY_TYPECODES[fmt])
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def iter_chunks(path, fmt="text", chunk_bytes=CHUNK_BYTES):
+    """
+    Yield parsed chunks of values from a text or raw binary file.
+
+    Args:
+        path: File path, or "-" for stdin
+        fmt: "text", "int32" or "int64"
+        chunk_bytes: Approximate bytes read per chunk
+
+    Yields:
+        list or array: Values in file order
+    """
+    if fmt == "text":
+        with _open_binary(path, "rb") as f:
+            tail = b""
+            while True:
+                block = f.read(chunk_bytes)
+                if not block:
+                    break
+                block = tail + block
+                cut = max(block.rfind(b"\n"), block.rfind(b" "), block.rfind(b"\t")) + 1
+                tail = block[cut:]
+                yield _parse_numbers(block[:cut].split())
+            if tail.strip():
+                yield _parse_numbers(tail.split())
+        return
+
+    itemsize = array(BINARY_TYPECODES[fmt]).itemsize
+    chunk_bytes -= chunk_bytes % itemsize
+    with _open_binary(path, "rb") as f:
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            yield _binary_array(block, fmt)
+
+
+def _read_binary(path, fmt):
+    """Read a whole raw binary file, preferring numpy.fromfile."""
+    dtype = "<i4" if fmt == "int32" else "<i8"
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if path == "-":
+        data = sys.stdin.buffer.read()
+        return np.frombuffer(data, dtype=dtype) if np is not None else _binary_array(data, fmt)
+    if np is not None:
+        return np.fromfile(path, dtype=dtype)
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _binary_array(mapped, fmt)
+        except ValueError:  # empty files cannot be mapped
+            return array(BINARY_TYPECODES[fmt])
+
+
+def _read_csv(path, column):
+    """Read one CSV column by index or header name."""
+    with _open_binary(path, "rb") as raw:
+        text = io.TextIOWrapper(raw, newline="")
+        try:
+            reader = csv.reader(text)
+            if isinstance(column, str) and not column.isdigit():
+                header = next(reader, [])
+                if column not in header:
+                    raise ValueError(f"CSV column '{column}' not found in header {header}")
+                index = header.index(column)
+            else:
+                index = int(column)
+            return _parse_numbers([row[index] for row in reader if row])
+        finally:
+            # Detach so closing the wrapper does not close stdin
+            text.detach()
+
+
+def read_values(path, fmt="text", column=0):
+    """
+    Read a dataset from a file or stdin.
+
+    Args:
+        path: File path, or "-" for stdin
+        fmt: One of FORMATS
+        column: CSV column index or header name (csv only)
+
+    Returns:
+        list: Values to sort
+    """
+    if fmt in BINARY_TYPECODES:
+        return _read_binary(path, fmt).tolist()
+    if fmt == "csv":
+        return _read_csv(path, column)
+    values = []
+    for chunk in iter_chunks(path, "text"):
+        values.extend(chunk)
+    return values
+
+
+def write_values(values, path, fmt="text"):
+    """
+    Write a dataset to a file or stdout with bulk writes.
+
+    Args:
+        values: Sorted values
+        path: File path, "-" for stdout, or a binary stream
+        fmt: One of FORMATS (csv writes a single column, like text)
+    """
+    if path == "-":
+        sys.stdout.flush()
+    with _open_binary(path, "wb") as f:
+        if fmt in BINARY_TYPECODES:
+            typecode = BINARY_TYPECODES[fmt]
+            step = CHUNK_BYTES // array(typecode).itemsize
+            for start in range(0, len(values), step):
+                chunk = array(typecode, values[start:start + step])
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                chunk.tofile(f)
+        else:
+            f.writelines(("\n".join(map(str, values[start:start + WRITE_CHUNK])) + "\n").encode()
+                         for start in range(0, len(values), WRITE_CHUNK))
+        f.flush()
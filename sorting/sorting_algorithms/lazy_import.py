@@ -0,0 +1,36 @@
+"""
+Deferred module imports for heavy optional dependencies.
+
+`plt = lazy_import("matplotlib.pyplot")` binds a placeholder that imports
+the real module on first attribute access, so scripts that only parse
+arguments never pay for importing matplotlib or NumPy.
+"""
+
+import sys
+
+
+class LazyModule:
+    """Module proxy that imports its target on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            # __import__ takes the C import path, so -X importtime reports it
+            __import__(self._name)
+            self._module = sys.modules[self._name]
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """Return a LazyModule for name (e.g. "numpy")."""
+    return LazyModule(name)
@@ -0,0 +1,116 @@
+"""
+Peak and auxiliary memory measurement for sorting algorithms.
+
+Uses tracemalloc to record what an algorithm allocates while it runs, so the
+harness can compare it against the auxiliary-space class the algorithm
+declares.
+"""
+
+import math
+import struct
+import tracemalloc
+from collections import Counter
+
+# Auxiliary-space classes an algorithm can register as AlgorithmSpec.space_class
+SPACE_CLASSES = ("O(1)", "O(log n)", "O(sqrt n)", "O(n)")
+
+# Bytes per list slot (one object pointer)
+POINTER_SIZE = struct.calcsize("P")
+
+# Allowance for interpreter bookkeeping (iterators, small frames) per call
+SLACK_BYTES = 256
+
+# Extra slots per unit of the declared class (list over-allocation, int objects)
+SLOT_FACTOR = 8
+
+
+def space_budget(space_class, n):
+    """
+    Return the number of bytes an algorithm of the given class may allocate.
+
+    Args:
+        space_class: One of SPACE_CLASSES
+        n: Input length
+
+    Returns:
+        int: Allowed peak bytes above the input
+    """
+    if space_class == "O(1)":
+        units = 0
+    elif space_class == "O(log n)":
+        units = math.ceil(math.log2(n + 1))
+    elif space_class == "O(sqrt n)":
+        units = math.isqrt(n) + 1
+    elif space_class == "O(n)":
+        units = n
+    else:
+        raise ValueError(f"Unknown space class '{space_class}'")
+    return SLACK_BYTES + SLOT_FACTOR * POINTER_SIZE * units
+
+
+def measure_memory(func, arr):
+    """
+    Run func(arr) under tracemalloc and report its allocations.
+
+    The input is allocated before tracing starts, so every traced byte is
+    above the input size.  Block statistics cover the blocks allocated by
+    the call and still alive when it returns (including its output); if
+    tracemalloc was already tracing, blocks that existed before the call are
+    left out.
+
+    Args:
+        func: Sorting function to call
+        arr: List passed to the function (already copied by the caller)
+
+    Returns:
+        tuple: (output, stats) where stats has peak_bytes, blocks and
+            largest_block
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = None if started else _snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        output = func(arr)
+        _, peak = tracemalloc.get_traced_memory()
+        after = _snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    new_blocks = Counter(after.traces)
+    if before is not None:
+        new_blocks -= Counter(before.traces)
+    sizes = [trace.size for trace in new_blocks.elements()]
+    stats = {
+        "peak_bytes": max(0, peak - baseline),
+        "blocks": len(sizes),
+        "largest_block": max(sizes, default=0),
+    }
+    return output, stats
+
+
+def _snapshot():
+    """Snapshot of the live traced blocks, minus tracemalloc's own."""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+def check_memory(stats, space_class, n):
+    """
+    Flag whether measured stats exceed the declared auxiliary-space class.
+
+    Args:
+        stats: Dict returned by measure_memory
+        space_class: Declared class, or None if the algorithm declares none
+        n: Input length
+
+    Returns:
+        bool: True if the peak exceeds the class budget
+    """
+    if space_class is None:
+        return False
+    return stats["peak_bytes"] > space_budget(space_class, n)
@@ -1,9 +1,11 @@
-def merge_sort(arr):
+def merge_sort(arr, trace=None):
     """
     Sorts an array using merge sort algorithm.
     
     Args:
         arr: List to be sorted
+        trace: Optional trace.Trace; record events with
+            trace.emit((i << 2 | op, j)) and call trace.flush() per pass
         
     Returns:
         List: Sorted array
@@ -0,0 +1,298 @@
+"""
+Presortedness (disorder) measures of an input sequence.
+
+The dataset names in main.DATASETS ("near_sorted", "sawtooth", ...) only
+describe their inputs informally.  analyze() measures them, so a fast or
+slow run can be explained by how much order the input already has:
+
+- inversions: pairs i < j with x[i] > x[j], counted by merge sort
+  (0 when sorted, n(n-1)/2 when strictly decreasing)
+- runs / descending_runs: maximal non-decreasing / non-increasing stretches,
+  with the longest and mean ascending run length
+- rem: fewest elements to remove to leave a sorted sequence
+  (n - longest non-decreasing subsequence)
+- osc: Levcopoulos-Petersson oscillation; for each adjacent pair, the
+  number of elements strictly between the two values, summed
+- max_displacement: largest distance between an element's position and
+  its position in the stable sorted order
+- distinct / distinct_ratio, and min, max and key_range (numeric keys)
+
+Every measure costs O(n log n) or less.  Integer inputs of at least
+NUMPY_MIN elements use vectorized NumPy code when NumPy is installed.
+Above SAMPLE_MAX elements, the order-based measures are estimated from
+an ordered random subsequence of SAMPLE_MAX elements and scaled to n
+("sampled" holds the sample size); runs, the distinct count and the key
+range are always exact.
+"""
+
+import random
+from bisect import bisect_left, bisect_right
+
+# Integer inputs at least this long are analyzed with NumPy
+NUMPY_MIN = 4096
+
+# Larger inputs are analyzed on an ordered random subsequence of this size
+SAMPLE_MAX = 1 << 20
+
+# Keys of analyze()'s result, in report order
+MEASURES = ("n", "inversions", "inversion_ratio", "runs", "descending_runs", "longest_run",
+            "mean_run", "rem", "rem_ratio", "osc", "max_displacement", "distinct",
+            "distinct_ratio", "min", "max", "key_range", "sampled")
+
+
+def analyze(values, sample_max=SAMPLE_MAX, rng=None):
+    """
+    Compute disorder measures of a sequence.
+
+    Args:
+        values: List, array or 1-D NumPy array of mutually comparable keys
+        sample_max: Inputs longer than this are sampled (see module docstring)
+        rng: random.Random used to draw the sample (default: a fresh one)
+
+    Returns:
+        dict: The measures described in the module docstring, plus "n" and
+        "sampled" (the sample size, or None when every element was used)
+    """
+    n = len(values)
+    np = _numpy_for(values)
+    if np is not None:
+        values = np.asarray(values)
+        if values.dtype.kind == "b":
+            values = values.astype(np.int8)
+        measures = _runs_numpy(np, values)
+    else:
+        values = list(values)
+        measures = _runs_python(values)
+    measures["n"] = n
+    if n:
+        low, high = (values.min(), values.max()) if np is not None else (min(values), max(values))
+        measures["min"], measures["max"] = _plain(low), _plain(high)
+        measures["key_range"] = _key_range(measures["min"], measures["max"])
+    else:
+        measures["min"] = measures["max"] = measures["key_range"] = None
+
+    sample = values
+    if n > sample_max:
+        indices = sorted((rng or random.Random()).sample(range(n), sample_max))
+        sample = values[np.asarray(indices)] if np is not None else [values[i] for i in indices]
+    measures.update(_order_measures_numpy(np, sample) if np is not None
+                    else _order_measures_python(sample))
+    measures["sampled"] = None
+    if len(sample) < n:
+        _scale(measures, len(sample), n)
+        measures["distinct"] = _count_distinct(np, values)
+        measures["sampled"] = len(sample)
+    pairs = n * (n - 1) // 2
+    measures["inversion_ratio"] = measures["inversions"] / pairs if pairs else 0.0
+    measures["rem_ratio"] = measures["rem"] / n if n else 0.0
+    measures["distinct_ratio"] = measures["distinct"] / n if n else 0.0
+    return {key: measures[key] for key in MEASURES}
+
+
+def _numpy_for(values):
+    """Return the numpy module if values should take the NumPy path, else None."""
+    if type(values).__module__ == "numpy" and hasattr(values, "dtype"):
+        if values.dtype.kind in "iufb":
+            import numpy as np
+            return np
+        return None
+    if len(values) < NUMPY_MIN or not all(type(value) is int for value in values):
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    try:
+        np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        return None
+    return np
+
+
+def _plain(value):
+    """Convert a NumPy scalar to the matching Python number (JSON-friendly)."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _key_range(low, high):
+    """max - min for numeric keys, else None."""
+    if isinstance(low, (int, float)) and isinstance(high, (int, float)):
+        return high - low
+    return None
+
+
+def _scale(measures, k, n):
+    """Scale measures of a k-element ordered sample up to n elements."""
+    pair_scale = n * (n - 1) / (k * (k - 1)) if k > 1 else 0.0
+    measures["inversions"] = round(measures["inversions"] * pair_scale)
+    measures["osc"] = round(measures["osc"] * pair_scale)
+    measures["rem"] = round(measures["rem"] * n / k)
+    measures["max_displacement"] = round(measures["max_displacement"] * n / k)
+
+
+def _count_distinct(np, values):
+    """Exact number of distinct keys (distinct counts do not scale with n)."""
+    if np is not None:
+        return len(np.unique(values))
+    ordered = sorted(values)
+    return sum(1 for previous, value in zip(ordered, ordered[1:]) if previous < value) + bool(ordered)
+
+
+def _run_summary(ascending, descending, longest, n):
+    """Assemble the run measures."""
+    return {
+        "runs": ascending,
+        "descending_runs": descending,
+        "longest_run": longest,
+        "mean_run": n / ascending if ascending else 0.0,
+    }
+
+
+def _runs_python(values):
+    """Ascending and descending run counts in one pass."""
+    n = len(values)
+    if not n:
+        return _run_summary(0, 0, 0, 0)
+    ascending = descending = 1
+    longest = current = 1
+    for previous, value in zip(values, values[1:]):
+        if value < previous:
+            ascending += 1
+            current = 1
+        else:
+            current += 1
+            if current > longest:
+                longest = current
+        if previous < value:
+            descending += 1
+    return _run_summary(ascending, descending, longest, n)
+
+
+def _runs_numpy(np, values):
+    """Vectorized run counts."""
+    n = len(values)
+    if not n:
+        return _run_summary(0, 0, 0, 0)
+    breaks = np.flatnonzero(values[1:] < values[:-1]) + 1
+    descending = int(np.count_nonzero(values[1:] > values[:-1])) + 1
+    bounds = np.concatenate(([0], breaks, [n]))
+    return _run_summary(len(breaks) + 1, descending, int(np.diff(bounds).max()), n)
+
+
+def _order_measures_python(values):
+    """Inversions, Rem, Osc, Max and distinct count of a list."""
+    n = len(values)
+    order = sorted(range(n), key=values.__getitem__)
+    ordered = [values[i] for i in order]
+    distinct = sum(1 for previous, value in zip(ordered, ordered[1:]) if previous < value) + (n > 0)
+
+    osc = 0
+    for previous, value in zip(values, values[1:]):
+        low, high = (previous, value) if previous < value else (value, previous)
+        if low < high:
+            osc += max(0, bisect_left(ordered, high) - bisect_right(ordered, low))
+
+    return {
+        "inversions": _count_inversions(list(values)),
+        "rem": n - _longest_non_decreasing(values),
+        "osc": osc,
+        "max_displacement": max((abs(position - index) for position, index in enumerate(order)),
+                                default=0),
+        "distinct": distinct,
+    }
+
+
+def _count_inversions(arr):
+    """Count inversions by bottom-up merge sort (sorts arr as a side effect)."""
+    n = len(arr)
+    buffer = [None] * n
+    total = 0
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            mid = lo + width
+            hi = min(mid + width, n)
+            i, j, out = lo, mid, lo
+            while i < mid and j < hi:
+                if arr[j] < arr[i]:
+                    buffer[out] = arr[j]
+                    j += 1
+                    total += mid - i  # arr[j] jumps every remaining left element
+                else:
+                    buffer[out] = arr[i]
+                    i += 1
+                out += 1
+            tail = arr[i:mid] if i < mid else arr[j:hi]
+            buffer[out:hi] = tail
+            arr[lo:hi] = buffer[lo:hi]
+        width *= 2
+    return total
+
+
+def _longest_non_decreasing(values):
+    """Length of the longest non-decreasing subsequence (patience sorting)."""
+    tails = []
+    for value in values:
+        k = bisect_right(tails, value)
+        if k == len(tails):
+            tails.append(value)
+        else:
+            tails[k] = value
+    return len(tails)
+
+
+def _order_measures_numpy(np, values):
+    """Vectorized inversions, Osc, Max and distinct count; Rem by patience sorting."""
+    n = len(values)
+    if n < 2:
+        return {"inversions": 0, "rem": 0, "osc": 0, "max_displacement": 0, "distinct": n}
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    new_value = np.empty(n, dtype=bool)
+    new_value[0] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=new_value[1:])
+    # Dense ranks 0..distinct-1 in input order
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = np.cumsum(new_value) - 1
+    distinct = int(ranks.max()) + 1
+
+    low = np.minimum(values[:-1], values[1:])
+    high = np.maximum(values[:-1], values[1:])
+    inside = np.searchsorted(ordered, high, "left") - np.searchsorted(ordered, low, "right")
+    return {
+        "inversions": _count_inversions_numpy(np, ranks, distinct),
+        "rem": n - _longest_non_decreasing(ranks.tolist()),
+        "osc": int(np.clip(inside, 0, None).sum()),
+        "max_displacement": int(np.abs(order - np.arange(n)).max()),
+        "distinct": distinct,
+    }
+
+
+def _count_inversions_numpy(np, ranks, distinct):
+    """
+    Count inversions by bottom-up merging, one vectorized step per level.
+
+    At each level the array is sorted within blocks of width.  Offsetting
+    each pair of blocks by pair * distinct keeps all left blocks in one
+    globally sorted array, so a single searchsorted counts, for every right
+    element, the left elements of its pair that are greater.
+    """
+    n = len(ranks)
+    keys = ranks.copy()
+    positions = np.arange(n)
+    total = 0
+    width = 1
+    while width < n:
+        pair = positions // (2 * width)
+        offset = pair * distinct
+        keyed = keys + offset
+        right = (positions // width) % 2 == 1
+        left_keys = keyed[~right]
+        # Every left block that has a right partner is full, so it ends at
+        # pair * width + width in left_keys
+        left_end = pair[right] * width + width
+        total += int((left_end - np.searchsorted(left_keys, keyed[right], "right")).sum())
+        # Stable sort (timsort on ints) merges each pair's two sorted runs
+        keys = np.sort(keyed, kind="stable") - offset
+        width *= 2
+    return total
@@ -0,0 +1,227 @@
+"""
+Profiling hooks for harness runs.
+
+Modes:
+    cprofile: deterministic cProfile run, written as a .pstats dump plus a
+        .collapsed stack file derived from the call graph
+    sampling: a background thread samples the running stack every
+        interval seconds and writes a .collapsed file of sample counts
+
+Collapsed files use the "frame;frame;frame count" format read by
+flamegraph.pl, speedscope and inferno.  The optional line counter records
+how often each line of the algorithm function runs, using sys.monitoring
+on Python 3.12+ and sys.settrace on older interpreters.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+
+MODES = ("cprofile", "sampling")
+
+# Default sampling interval in seconds
+SAMPLE_INTERVAL = 0.001
+
+# Deepest caller chain followed when deriving stacks from a cProfile graph
+MAX_STACK_DEPTH = 64
+
+
+def _label(filename, lineno, funcname):
+    """Format one frame as func (file:line)."""
+    return f"{funcname} ({os.path.basename(filename)}:{lineno})"
+
+
+def _safe_name(name):
+    """Make an algorithm or dataset name safe to use in a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def collapsed_from_stats(stats):
+    """
+    Derive collapsed stacks from a cProfile call graph.
+
+    cProfile records caller -> callee edges, not full stacks, so each
+    function's self time is split across its callers in proportion to the
+    time spent under each edge, recursively up to the roots.
+
+    Args:
+        stats: pstats.Stats instance
+
+    Returns:
+        Counter: "root;...;func" -> self time in microseconds
+    """
+    entries = stats.stats
+    stacks = Counter()
+
+    def walk(func, suffix, weight, depth):
+        callers = entries[func][4]
+        edge_total = sum(edge[3] for edge in callers.values())
+        path = [_label(*func)] + suffix
+        if not callers or edge_total <= 0 or depth >= MAX_STACK_DEPTH:
+            stacks[";".join(path)] += weight
+            return
+        for caller, edge in callers.items():
+            if _label(*caller) in path:  # recursion: stop at the first repeat
+                stacks[";".join(path)] += weight * edge[3] / edge_total
+                continue
+            walk(caller, path, weight * edge[3] / edge_total, depth + 1)
+
+    for func, (_, _, self_time, _, _) in entries.items():
+        if self_time > 0:
+            walk(func, [], self_time * 1e6, 0)
+    return Counter({stack: round(us) for stack, us in stacks.items() if round(us) > 0})
+
+
+def write_collapsed(path, stacks):
+    """Write a Counter of stack -> count as a collapsed stack file."""
+    with open(path, "w") as f:
+        f.writelines(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def profile_cprofile(func, arr, prefix):
+    """
+    Run func(arr) under cProfile and write prefix.pstats and prefix.collapsed.
+
+    Returns:
+        Output of func(arr)
+    """
+    profiler = cProfile.Profile()
+    output = profiler.runcall(func, arr)
+    profiler.dump_stats(f"{prefix}.pstats")
+    write_collapsed(f"{prefix}.collapsed", collapsed_from_stats(pstats.Stats(profiler)))
+    return output
+
+
+def profile_sampling(func, arr, prefix, interval=SAMPLE_INTERVAL):
+    """
+    Run func(arr) while sampling its stack, and write prefix.collapsed.
+
+    Stacks are recorded from func down; the harness frames above it are
+    left out.  Each line's count is the number of samples.
+
+    Returns:
+        Output of func(arr)
+    """
+    target = threading.get_ident()
+    stop = threading.Event()
+    samples = Counter()
+    runner_code = profile_sampling.__code__
+    root_code = getattr(func, "__code__", None)
+
+    def sample():
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(target)
+            stack = []
+            code = None
+            while frame is not None and frame.f_code is not runner_code:
+                code = frame.f_code
+                stack.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            # Skip samples taken while the runner itself (not func) was active
+            if code is root_code:
+                samples[";".join(reversed(stack))] += 1
+
+    # Let the sampler thread get the GIL about as often as it wants to sample
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        output = func(arr)
+    finally:
+        stop.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+    write_collapsed(f"{prefix}.collapsed", samples)
+    return output
+
+
+def count_lines(func, arr):
+    """
+    Count executions of each line of func while it sorts arr.
+
+    Only lines in func's own code object are counted, which for bubble_sort
+    and selection_sort covers the inner comparison and swap loops.
+
+    Returns:
+        tuple: (output, Counter of line number -> hits)
+    """
+    code = func.__code__
+    hits = Counter()
+
+    if sys.version_info >= (3, 12):
+        monitoring = sys.monitoring
+        tool = monitoring.PROFILER_ID
+        monitoring.use_tool_id(tool, "sorting_algorithms.profiling")
+        try:
+            monitoring.register_callback(tool, monitoring.events.LINE,
+                                         lambda _, line: hits.__setitem__(line, hits[line] + 1))
+            monitoring.set_local_events(tool, code, monitoring.events.LINE)
+            output = func(arr)
+        finally:
+            monitoring.set_local_events(tool, code, 0)
+            monitoring.register_callback(tool, monitoring.events.LINE, None)
+            monitoring.free_tool_id(tool)
+        return output, hits
+
+    def local_trace(frame, event, _):
+        if event == "line":
+            hits[frame.f_lineno] += 1
+        return local_trace
+
+    def global_trace(frame, event, _):
+        return local_trace if frame.f_code is code else None
+
+    previous = sys.gettrace()
+    sys.settrace(global_trace)
+    try:
+        output = func(arr)
+    finally:
+        sys.settrace(previous)
+    return output, hits
+
+
+def write_line_counts(path, func, hits):
+    """Write line hit counts next to the source lines of func."""
+    import linecache
+
+    filename = func.__code__.co_filename
+    with open(path, "w") as f:
+        for line in sorted(hits):
+            source = linecache.getline(filename, line).rstrip()
+            f.write(f"{line:6d} {hits[line]:12d}  {source}\n")
+
+
+class Profiler:
+    """Harness hook that profiles each (algorithm, dataset) run into out_dir."""
+
+    def __init__(self, mode, out_dir="profiles", lines=False, interval=SAMPLE_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.lines = lines
+        self.interval = interval
+        os.makedirs(out_dir, exist_ok=True)
+
+    def run(self, algorithm_name, dataset_name, func, arr):
+        """
+        Profile func(arr) and write files named <algorithm>-<dataset>.*.
+
+        With lines enabled, a second (unprofiled) run writes the .lines
+        hit counts, so tracing overhead does not skew the profile.
+
+        Returns:
+            Output of the profiled run
+        """
+        prefix = os.path.join(self.out_dir, f"{_safe_name(algorithm_name)}-{_safe_name(dataset_name)}")
+        if self.lines:
+            _, hits = count_lines(func, list(arr))
+            write_line_counts(f"{prefix}.lines", func, hits)
+        if self.mode == "cprofile":
+            return profile_cprofile(func, arr, prefix)
+        return profile_sampling(func, arr, prefix, self.interval)
@@ -1,9 +1,11 @@
-def quick_sort(arr):
+def quick_sort(arr, trace=None):
     """
     Sorts an array using quick sort algorithm.
     
     Args:
         arr: List to be sorted
+        trace: Optional trace.Trace; record events with
+            trace.emit((i << 2 | op, j)) and call trace.flush() per pass
         
     Returns:
         List: Sorted array
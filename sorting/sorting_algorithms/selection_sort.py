@@ -1,22 +1,27 @@
+from .trace import COMPARE, SORTED, SWAP
+
 
 def visualize_sorting(arr, step_name, current_arr):
     """Visualize the current state of the array during sorting."""
     print(f"{step_name}: {current_arr}")
 
 
-def selection_sort(arr, visualize=False):
+def selection_sort(arr, visualize=False, trace=None):
     """
     Sorts an array using selection sort algorithm.
     
     Args:
         arr: List to be sorted
         visualize: If True, show the sorting process step by step
+        trace: Optional trace.Trace that records compare/swap events
         
     Returns:
         List: Sorted array
     """
     myArr = arr.copy()
     n = len(myArr)
+    if trace is not None:
+        return _selection_sort_traced(myArr, trace)
     
     for i in range(n):
         minIndex = i 
@@ -31,4 +36,24 @@ def selection_sort(arr, visualize=False):
         if visualize:
             visualize_sorting(myArr, f"Pass {i}: Element {myArr[i]} placed at position {i}", myArr)
 
-    return myArr
\ No newline at end of file
+    return myArr
+
+
+def _selection_sort_traced(myArr, trace):
+    """Selection sort loop that records its events into trace."""
+    emit = trace.emit
+    n = len(myArr)
+    for i in range(n):
+        minIndex = i
+        for j in range(i + 1, n):
+            emit((j << 2 | COMPARE, minIndex))
+            if myArr[j] < myArr[minIndex]:
+                minIndex = j
+        
+        if minIndex != i:
+            myArr[i], myArr[minIndex] = myArr[minIndex], myArr[i]
+            emit((i << 2 | SWAP, minIndex))
+        emit((i << 2 | SORTED, i))
+        trace.flush()
+    
+    return myArr
@@ -0,0 +1,348 @@
+"""
+Local sort service with request batching and a warm worker pool.
+
+Clients connect over TCP or a Unix socket and send either:
+
+- JSON lines: {"id": 1, "algo": "bubble", "data": [3, 1, 2]}
+  answered with {"id": 1, "result": [1, 2, 3]} or {"id": 1, "error": "..."}
+- binary frames (see wire.py), with the algorithm name in the frame
+  answered with a frame holding the sorted values, or an error frame
+
+The first byte of a connection selects the protocol.  Small requests are
+coalesced into batches and run together in one worker call; large ones go
+to the process pool individually.  Workers import every algorithm (and
+NumPy, if installed) once at start-up.  At most max_pending requests are in
+flight; beyond that the server stops reading, so slow consumers push back
+on their clients through the socket.
+
+Usage:
+    python -m sorting_algorithms.serve --tcp 127.0.0.1:7878 --workers 4
+    python -m sorting_algorithms.serve --unix /tmp/sort.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import ALGORITHMS
+from .wire import FrameError, pack_error, pack_frame, read_frame_async
+
+# Requests shorter than this are batched; longer ones get their own task
+LARGE_THRESHOLD = 10_000
+
+BATCH_SIZE = 64
+BATCH_WINDOW = 0.002
+MAX_PENDING = 1024
+
+# Longest JSON request line accepted (asyncio's default limit is 64 KiB)
+LINE_LIMIT = 1 << 26
+
+
+class SortError(Exception):
+    """A request that cannot be served (unknown algorithm, bad input)."""
+
+
+def warm_worker():
+    """Process-pool initializer: import every algorithm and NumPy once."""
+    for name in ALGORITHMS:
+        ALGORITHMS[name]
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+
+
+def sort_one(name, values):
+    """Sort values with algorithm name; raise SortError on bad requests."""
+    if name not in ALGORITHMS:
+        raise SortError(f"unknown algorithm '{name}'")
+    reason = ALGORITHMS.unsupported_reason(name, values)
+    if reason:
+        raise SortError(f"algorithm '{name}' does not accept this input ({reason})")
+    output = ALGORITHMS[name](values)
+    if output is None:
+        raise SortError(f"algorithm '{name}' returned no result")
+    return output
+
+
+def sort_batch(requests):
+    """Run several (name, values) requests; return ("ok"|"error", payload) each."""
+    outcomes = []
+    for name, values in requests:
+        try:
+            outcomes.append(("ok", sort_one(name, values)))
+        except Exception as e:
+            outcomes.append(("error", str(e)))
+    return outcomes
+
+
+class SortServer:
+    """asyncio sort server that batches small requests onto a process pool."""
+
+    def __init__(self, workers=None, batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW,
+                 large_threshold=LARGE_THRESHOLD, max_pending=MAX_PENDING, line_limit=LINE_LIMIT):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.large_threshold = large_threshold
+        self.max_pending = max_pending
+        self.line_limit = line_limit
+        self.pool = None
+        self.server = None
+        self._batch = []
+        self._batch_ready = None
+        self._batcher = None
+        self._dispatches = set()  # running _dispatch tasks (the loop keeps only weak refs)
+        self._slots = None
+
+    async def start(self, host=None, port=None, path=None):
+        """Start the pool and listen on host:port or a Unix socket path."""
+        self.pool = ProcessPoolExecutor(self.workers, initializer=warm_worker)
+        # Submit one no-op per worker so processes are warm before traffic
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, warm_worker)
+                               for _ in range(self.workers)))
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._batch_ready = asyncio.Event()
+        self._batcher = asyncio.create_task(self._run_batches())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path=path,
+                                                          limit=self.line_limit)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port,
+                                                     limit=self.line_limit)
+        return self.server
+
+    async def close(self):
+        """Stop listening, finish the batcher and shut the pool down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self.pool is not None:
+            # shutdown() joins the worker processes; keep that off the loop
+            await asyncio.to_thread(self.pool.shutdown, cancel_futures=True)
+
+    async def sort(self, name, values):
+        """Sort values with algorithm name, batching small requests."""
+        loop = asyncio.get_running_loop()
+        if len(values) >= self.large_threshold:
+            status, payload = (await loop.run_in_executor(self.pool, sort_batch, [(name, values)]))[0]
+        else:
+            future = loop.create_future()
+            self._batch.append((name, values, future))
+            self._batch_ready.set()
+            status, payload = await future
+        if status == "error":
+            raise SortError(payload)
+        return payload
+
+    async def _run_batches(self):
+        """Collect queued small requests for batch_window, then dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._batch_ready.wait()
+            if len(self._batch) < self.batch_size:
+                await asyncio.sleep(self.batch_window)
+            batch, self._batch = self._batch[:self.batch_size], self._batch[self.batch_size:]
+            if not self._batch:
+                self._batch_ready.clear()
+            task = asyncio.ensure_future(self._dispatch(loop, batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, loop, batch):
+        """Run one batch on the pool and resolve its futures."""
+        try:
+            outcomes = await loop.run_in_executor(
+                self.pool, sort_batch, [(name, values) for name, values, _ in batch])
+        except Exception as e:
+            outcomes = [("error", f"worker failed: {e}")] * len(batch)
+        for (_, _, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+    async def _handle(self, reader, writer):
+        """Serve one connection; the first byte selects JSON lines or binary."""
+        responses = asyncio.Queue()
+        sender = asyncio.create_task(self._send(responses, writer))
+        try:
+            first = await reader.read(1)
+            if first:
+                if first in b"{ \t\r\n":
+                    await self._read_json(first, reader, responses)
+                else:
+                    await self._read_binary(first, reader, responses)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            await responses.put(None)
+            try:
+                await sender
+            except ConnectionError:
+                pass  # the client went away; its remaining responses were dropped
+            finally:
+                writer.close()
+
+    async def _submit(self, responses, make_response):
+        """Reserve a slot (backpressure) and queue the response coroutine."""
+        await self._slots.acquire()
+        # _send releases the slot once the response is written, so finished
+        # responses a client does not read still count as pending
+        await responses.put((asyncio.ensure_future(make_response()), True))
+
+    async def _read_json(self, first, reader, responses):
+        """Read JSON-line requests until EOF."""
+        line = await _read_line(reader)
+        if line is not None:
+            line = first + line
+        while line != b"":
+            if line is None:
+                error = {"id": None, "error": f"request line longer than {self.line_limit} bytes"}
+                response = (json.dumps(error) + "\n").encode()
+                await responses.put((asyncio.ensure_future(_constant(response)), False))
+            elif line.strip():
+                await self._submit(responses, lambda line=line: self._json_response(line))
+            line = await _read_line(reader)
+
+    async def _json_response(self, line):
+        """Parse one JSON request and build its response line."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            if "algo" not in request:
+                raise SortError("request has no 'algo'")
+            result = await self.sort(request["algo"], request["data"])
+            response = {"id": request_id, "result": result}
+        except (SortError, ValueError, KeyError, TypeError, AttributeError) as e:
+            response = {"id": request_id, "error": str(e)}
+        return (json.dumps(response) + "\n").encode()
+
+    async def _read_binary(self, first, reader, responses):
+        """Read binary frames until EOF."""
+        header = first
+        while True:
+            try:
+                name, values, itemsize = await read_frame_async(reader, header)
+            except FrameError as e:
+                await responses.put((asyncio.ensure_future(_constant(pack_error(str(e)))), False))
+                return
+            await self._submit(responses, lambda n=name, v=values, s=itemsize:
+                               self._binary_response(n, v, s))
+            header = await reader.read(1)
+            if not header:
+                return
+
+    async def _binary_response(self, name, values, itemsize):
+        """Sort one binary request and encode the reply frame."""
+        try:
+            return pack_frame("", await self.sort(name, values), itemsize)
+        except (SortError, OverflowError) as e:
+            return pack_error(str(e))
+
+    async def _send(self, responses, writer):
+        """
+        Write responses in request order as they complete, freeing their slots.
+
+        After a connection error the remaining responses are dropped (their
+        slots freed, so the reader cannot stall) and the error is raised once
+        the queue ends.
+        """
+        error = None
+        while True:
+            item = await responses.get()
+            if item is None:
+                if error is not None:
+                    raise error
+                return
+            task, holds_slot = item
+            try:
+                if error is None:
+                    writer.write(await task)
+                    await writer.drain()
+                else:
+                    task.cancel()
+            except ConnectionError as e:
+                error = e
+            finally:
+                if holds_slot:
+                    self._slots.release()
+
+
+async def _constant(value):
+    return value
+
+
+async def _read_line(reader):
+    """
+    Read one line (b"" at EOF).
+
+    Returns None for a line longer than the reader's limit, which is
+    skipped up to its newline so the next request can still be read.
+    """
+    skipped = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            line = e.partial
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+            skipped = True
+            continue
+        return None if skipped else line
+
+
+async def serve(args):
+    """Run the server until interrupted."""
+    server = SortServer(args.workers, args.batch_size, args.batch_window_ms / 1000,
+                        args.large_threshold, args.max_pending)
+    if args.unix:
+        await server.start(path=args.unix)
+        print(f"Serving on unix:{args.unix}", flush=True)
+    else:
+        host, _, port = args.tcp.rpartition(":")
+        await server.start(host or "127.0.0.1", int(port))
+        print(f"Serving on tcp:{args.tcp}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """Parse arguments and run the sort service."""
+    parser = argparse.ArgumentParser(description="Local sort service (JSON lines or binary frames)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--tcp", default="127.0.0.1:7878",
+                       help="host:port to listen on (default: 127.0.0.1:7878)")
+    target.add_argument("--unix", metavar="PATH",
+                       help="Unix socket path to listen on")
+    parser.add_argument("--workers", type=int,
+                       help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                       help=f"Small requests per batch (default: {BATCH_SIZE})")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW * 1000,
+                       help=f"Time to wait for a batch to fill (default: {BATCH_WINDOW * 1000:g})")
+    parser.add_argument("--large-threshold", type=int, default=LARGE_THRESHOLD,
+                       help=f"Requests this long bypass batching (default: {LARGE_THRESHOLD})")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                       help=f"In-flight request limit before reads pause (default: {MAX_PENDING})")
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
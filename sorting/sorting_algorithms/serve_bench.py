@@ -0,0 +1,115 @@
+"""
+Localhost benchmark client for the sort service.
+
+Opens `concurrency` connections, each sending its share of `requests`
+sort requests back to back, and reports throughput and latency
+percentiles.
+
+Usage:
+    python -m sorting_algorithms.serve_bench --tcp 127.0.0.1:7878 --requests 5000 --size 32
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from . import ALGORITHMS
+from .serve import LINE_LIMIT
+from .wire import pack_frame, read_frame_async
+
+
+class SortClient:
+    """Minimal asyncio client for one connection to the sort service."""
+
+    def __init__(self, reader, writer, protocol="json"):
+        self.reader = reader
+        self.writer = writer
+        self.protocol = protocol
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, tcp=None, unix=None, protocol="json"):
+        """Connect to host:port (tcp) or a Unix socket path (unix)."""
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix, limit=LINE_LIMIT)
+        else:
+            host, _, port = tcp.rpartition(":")
+            reader, writer = await asyncio.open_connection(host or "127.0.0.1", int(port),
+                                                           limit=LINE_LIMIT)
+        return cls(reader, writer, protocol)
+
+    async def sort(self, values, algo="block"):
+        """Send one request and wait for its sorted result."""
+        if self.protocol == "binary":
+            self.writer.write(pack_frame(algo, values))
+            await self.writer.drain()
+            _, result, _ = await read_frame_async(self.reader)
+            return result
+        self._next_id += 1
+        self.writer.write((json.dumps({"id": self._next_id, "algo": algo, "data": values}) + "\n").encode())
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    async def close(self):
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def run_bench(args):
+    """Run the benchmark and return (elapsed seconds, sorted latencies)."""
+    rng = random.Random(args.seed)
+    payloads = [[rng.randint(-10**6, 10**6) for _ in range(args.size)] for _ in range(64)]
+    latencies = []
+
+    async def worker(count):
+        client = await SortClient.connect(args.tcp, args.unix, args.protocol)
+        try:
+            for i in range(count):
+                start = time.perf_counter()
+                await client.sort(payloads[i % len(payloads)], args.algo)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            await client.close()
+
+    per_worker, extra = divmod(args.requests, args.concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker + (i < extra)) for i in range(args.concurrency)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at fraction (0..1) of a sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main():
+    """Parse arguments, run the benchmark and print a summary line."""
+    parser = argparse.ArgumentParser(description="Sort service benchmark client")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--tcp", default="127.0.0.1:7878", help="host:port of the server")
+    target.add_argument("--unix", metavar="PATH", help="Unix socket path of the server")
+    parser.add_argument("--protocol", choices=["json", "binary"], default="json",
+                       help="Wire protocol (default: json)")
+    parser.add_argument("--algo", choices=ALGORITHMS.names(element_type="int"), default="bubble",
+                       help="Algorithm to request (default: bubble)")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests (default: 2000)")
+    parser.add_argument("--size", type=int, default=32, help="Elements per request (default: 32)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections (default: 16)")
+    parser.add_argument("--seed", type=int, default=0, help="Payload RNG seed (default: 0)")
+
+    args = parser.parse_args()
+    elapsed, latencies = asyncio.run(run_bench(args))
+    print(f"REQUESTS={len(latencies)} ELAPSED={elapsed:.3f}s RPS={len(latencies) / elapsed:.0f} "
+          f"P50={percentile(latencies, 0.5) * 1000:.2f}ms P99={percentile(latencies, 0.99) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
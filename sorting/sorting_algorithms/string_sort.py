@@ -0,0 +1,197 @@
+"""
+String-key sorting: multikey quicksort for lists, MSD radix for NumPy.
+
+Comparison sorts re-scan the shared prefix of two keys on every comparison,
+which dominates on log keys, URLs and IDs with long common prefixes.  Here
+each key is examined one character position at a time:
+
+- Lists of str or bytes are sorted by multikey (3-way radix) quicksort over
+  their bytes; str is encoded as UTF-8, whose byte order is code point
+  order.  A bucket is partitioned on the byte at its depth d into <, = and
+  > thirds, and only the = third moves on to depth d + 1, so a byte of
+  shared prefix is read about once per partitioning level instead of once
+  per comparison.  Buckets of at most INSERTION_MAX keys are finished by
+  insertion sort on the suffixes past d, copied once per bucket.
+- NumPy fixed-width arrays (dtype S, and U as UCS-4 code points) are sorted
+  by vectorized MSD radix over their character columns.  A column on which
+  the whole bucket agrees is skipped in one comparison; small buckets are
+  finished with np.lexsort on the remaining columns.
+
+The list path sorts by swapping positions, so a trace records compare,
+swap and sorted events that replay on the original strings.
+"""
+
+from .trace import COMPARE, SORTED, SWAP
+
+# Buckets at most this large are finished by insertion sort
+INSERTION_MAX = 16
+
+# NumPy buckets at most this large are finished with np.lexsort
+LEXSORT_MAX = 64
+
+
+def string_sort(arr, trace=None):
+    """
+    Sort a list of str or bytes, or a NumPy S/U array.
+
+    Args:
+        arr: List of str (or of bytes), or a 1-D NumPy array of dtype S or U
+        trace: Optional trace.Trace that records compare/swap events
+            (lists only)
+
+    Returns:
+        Sorted list, or a sorted NumPy array for NumPy input
+
+    Raises:
+        TypeError: If the elements are not all str or all bytes
+    """
+    if type(arr).__module__ == "numpy" and hasattr(arr, "dtype"):
+        return _sort_numpy(arr)
+
+    keys = list(arr)
+    if not keys:
+        return keys
+    if all(isinstance(key, str) for key in keys):
+        keys = [key.encode("utf-8", "surrogatepass") for key in keys]
+        _multikey_quicksort(keys, trace)
+        return [key.decode("utf-8", "surrogatepass") for key in keys]
+    if all(isinstance(key, (bytes, bytearray)) for key in keys):
+        keys = [bytes(key) for key in keys]
+        _multikey_quicksort(keys, trace)
+        return keys
+    raise TypeError("string_sort needs all str or all bytes elements")
+
+
+def _char(key, d):
+    """Byte of key at depth d, or -1 past its end (shorter keys sort first)."""
+    return key[d] if d < len(key) else -1
+
+
+def _multikey_quicksort(keys, trace=None):
+    """Sort a list of bytes in place by 3-way radix quicksort."""
+    emit = trace.emit if trace is not None else None
+    # Explicit stack: a long shared prefix would otherwise recurse once per byte
+    stack = [(0, len(keys), 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo <= INSERTION_MAX:
+            if emit is None:
+                _insertion_sort(keys, lo, hi, d)
+            else:
+                _insertion_sort_traced(keys, lo, hi, d, trace)
+            continue
+
+        a, b, c = _char(keys[lo], d), _char(keys[(lo + hi) // 2], d), _char(keys[hi - 1], d)
+        pivot = max(min(a, b), min(max(a, b), c))
+        lt, i, gt = lo, lo, hi
+        while i < gt:
+            key = keys[i]
+            ch = key[d] if d < len(key) else -1
+            if emit is not None:
+                emit((i << 2 | COMPARE, lt))
+            if ch < pivot:
+                if lt != i:
+                    keys[lt], keys[i] = key, keys[lt]
+                    if emit is not None:
+                        emit((lt << 2 | SWAP, i))
+                lt += 1
+                i += 1
+            elif ch > pivot:
+                gt -= 1
+                keys[gt], keys[i] = key, keys[gt]
+                if emit is not None and gt != i:
+                    emit((gt << 2 | SWAP, i))
+            else:
+                i += 1
+
+        stack.append((lo, lt, d))
+        stack.append((gt, hi, d))
+        if pivot >= 0:
+            stack.append((lt, gt, d + 1))
+        elif emit is not None:
+            # Every key in the middle third ended at d: they are equal and final
+            for k in range(lt, gt):
+                emit((k << 2 | SORTED, k))
+        if emit is not None:
+            trace.flush()
+
+
+def _insertion_sort(keys, lo, hi, d):
+    """Insertion-sort keys[lo:hi], which share their first d bytes."""
+    # Compare only the suffixes past the known common prefix
+    suffixes = [key[d:] for key in keys[lo:hi]]
+    for i in range(1, hi - lo):
+        suffix, key = suffixes[i], keys[lo + i]
+        j = i
+        while j and suffixes[j - 1] > suffix:
+            suffixes[j] = suffixes[j - 1]
+            keys[lo + j] = keys[lo + j - 1]
+            j -= 1
+        suffixes[j] = suffix
+        keys[lo + j] = key
+
+
+def _insertion_sort_traced(keys, lo, hi, d, trace):
+    """Insertion sort that records each shift as an adjacent swap."""
+    emit = trace.emit
+    suffixes = [key[d:] for key in keys[lo:hi]]
+    for i in range(1, hi - lo):
+        j = i
+        while j:
+            emit((lo + j - 1 << 2 | COMPARE, lo + j))
+            if suffixes[j - 1] <= suffixes[j]:
+                break
+            suffixes[j - 1], suffixes[j] = suffixes[j], suffixes[j - 1]
+            keys[lo + j - 1], keys[lo + j] = keys[lo + j], keys[lo + j - 1]
+            emit((lo + j - 1 << 2 | SWAP, lo + j))
+            j -= 1
+    for k in range(lo, hi):
+        emit((k << 2 | SORTED, k))
+    trace.flush()
+
+
+def _sort_numpy(arr):
+    """MSD radix sort of a 1-D NumPy S or U array over its character columns."""
+    import numpy as np
+
+    if arr.dtype.kind not in "SU":
+        raise TypeError(f"string_sort needs a NumPy S or U array, not dtype {arr.dtype}")
+    n = len(arr)
+    unit = np.uint8 if arr.dtype.kind == "S" else np.uint32
+    width = arr.dtype.itemsize // np.dtype(unit).itemsize
+    if n < 2 or width == 0:
+        return arr.copy()
+    # One row of character codes per element; padding (NUL) sorts first,
+    # which is NumPy's own order for fixed-width strings
+    native = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("="))
+    units = native.view(unit).reshape(n, width)
+
+    order = np.arange(n)
+    stack = [(0, n, 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo < 2 or d == width:
+            continue
+        idx = order[lo:hi]
+        if hi - lo <= LEXSORT_MAX:
+            # lexsort keys run last-to-first: column d is the primary key
+            order[lo:hi] = idx[np.lexsort(units[idx, d:].T[::-1])]
+            continue
+        column = units[idx, d]
+        # Skip columns on which the whole bucket agrees (shared prefix)
+        while (column == column[0]).all():
+            d += 1
+            if d == width:
+                break
+            column = units[idx, d]
+        if d == width:
+            continue
+        perm = np.argsort(column, kind="stable")
+        order[lo:hi] = idx[perm]
+        column = column[perm]
+        edges = [lo, *(lo + np.flatnonzero(column[1:] != column[:-1]) + 1).tolist(), hi]
+        if d + 1 < width:
+            for start, end in zip(edges, edges[1:]):
+                if end - start > 1:
+                    stack.append((start, end, d + 1))
+    return arr[order]
@@ -0,0 +1,245 @@
+"""
+Incremental ANSI terminal view of a sorting run (main.py --visualize).
+
+The array is drawn once as vertical bars: one terminal column per element,
+or per group of neighbouring elements when the array is wider than the
+terminal (a group's bar shows its tallest element).  Bar heights come from
+each value's rank among the distinct input values, so any comparable
+elements can be shown, and use the eighth-block characters for sub-cell
+resolution.
+
+Events arrive through a Trace sink while the algorithm runs.  They update
+plain lists and mark columns dirty; at most fps times a second the view
+rebuilds only the dirty columns, diffs them against the cells already on
+screen and writes just the changed cells, positioned with relative cursor
+moves, as one write to the stream.  A run therefore costs a bounded number
+of frames however many events it has, and a frame costs the cells that
+changed rather than the whole array.
+
+When the stream is not a terminal nothing is animated: the initial and
+final frames are printed as plain lines.
+"""
+
+import shutil
+import sys
+import time
+from bisect import bisect_left
+
+from .trace import COMPARE, SORTED, SWAP, WRITE, decode, record
+
+DEFAULT_FPS = 30
+
+# Most rows of bars, before fitting to the terminal height
+HEIGHT = 12
+
+# Eighth-block characters, indexed by filled eighths of a cell
+BLOCKS = " ▁▂▃▄▅▆▇█"
+
+CSI = "\x1b["
+RESET = CSI + "0m"
+COLORS = {
+    "default": CSI + "34m",
+    "comparing": CSI + "35m",
+    "swapping": CSI + "33m",
+    "sorted": CSI + "32m",
+}
+ROLE_OF_OP = {COMPARE: "comparing", SWAP: "swapping", WRITE: "swapping"}
+
+
+class TerminalView:
+    """Bar view of an array that redraws only changed cells."""
+
+    def __init__(self, values, stream=None, fps=DEFAULT_FPS, width=None, height=None,
+                 ansi=None, clock=time.perf_counter):
+        self.stream = sys.stdout if stream is None else stream
+        if ansi is None:
+            isatty = getattr(self.stream, "isatty", None)
+            ansi = bool(isatty and isatty())
+        self.ansi = ansi
+        size = shutil.get_terminal_size()
+        self.n = len(values)
+        # Leave the last terminal column free so rows never auto-wrap
+        self.columns = max(1, min(self.n, width or size.columns - 1))
+        self.rows = height or max(3, min(HEIGHT, size.lines - 4))
+        self.levels = sorted(set(values))
+        self.heights = [self._height(value) for value in values]
+        self.sorted = bytearray(self.n)
+        self.roles = {}
+        self.highlight = None
+        self.counts = [0, 0, 0, 0]
+        self.dirty = set(range(self.columns))
+        # Bounds of the elements each column covers
+        self.bounds = [c * self.n // self.columns for c in range(self.columns + 1)]
+        self.screen = [[None] * self.columns for _ in range(self.rows)]
+        self.interval = 1 / fps
+        self.clock = clock
+        self._last = None
+        self.frames = 0
+        self.cells_written = 0
+
+    def _height(self, value):
+        """Bar height of value in eighths of a cell (at least one)."""
+        rank = bisect_left(self.levels, value) + 1
+        return -(-rank * self.rows * 8 // len(self.levels))
+
+    def column(self, i):
+        """Column showing element i."""
+        return ((i + 1) * self.columns - 1) // self.n
+
+    def feed(self, words):
+        """Apply a batch of trace words (a Trace sink), refreshing if a frame is due."""
+        heights = self.heights
+        dirty = self.dirty
+        column = self.column
+        counts = self.counts
+        highlight = None
+        for op, i, j in decode(words):
+            counts[op] += 1
+            if op == SWAP:
+                heights[i], heights[j] = heights[j], heights[i]
+                dirty.add(column(i))
+                dirty.add(column(j))
+            elif op == WRITE:
+                heights[i] = self._height(j)
+                dirty.add(column(i))
+            elif op == SORTED:
+                self.sorted[i] = 1
+                dirty.add(column(i))
+                continue
+            highlight = (op, i, j)
+        if highlight is not None:
+            self.highlight = highlight
+        now = self.clock()
+        if self._last is None or now - self._last >= self.interval:
+            self._last = now
+            self.refresh()
+
+    def _cells(self, c):
+        """Return the (color, char) cells of column c, top row first."""
+        lo, hi = self.bounds[c], self.bounds[c + 1]
+        height = max(self.heights[lo:hi])
+        role = next((self.roles[i] for i in range(lo, hi) if i in self.roles), None)
+        if role is None:
+            role = "sorted" if all(self.sorted[lo:hi]) else "default"
+        color = COLORS[role]
+        cells = []
+        for r in range(self.rows):
+            fill = height - (self.rows - 1 - r) * 8
+            cells.append((color, BLOCKS[min(max(fill, 0), 8)]))
+        return cells
+
+    def _status(self):
+        compares, swaps, writes, _ = self.counts
+        return (f"{compares:,} comparisons  {swaps:,} swaps  {writes:,} writes  "
+                f"{self.sorted.count(1):,}/{self.n:,} sorted")
+
+    def _set_roles(self, roles):
+        """Replace the highlighted elements, marking old and new columns dirty."""
+        for i in self.roles.keys() | roles.keys():
+            self.dirty.add(self.column(i))
+        self.roles = roles
+
+    def _update_screen(self):
+        """Rebuild dirty columns; return the cells that changed as (row, col, cell)."""
+        changes = []
+        for c in self.dirty:
+            for r, cell in enumerate(self._cells(c)):
+                if self.screen[r][c] != cell:
+                    self.screen[r][c] = cell
+                    changes.append((r, c, cell))
+        self.dirty.clear()
+        changes.sort()
+        return changes
+
+    def _plain_frame(self):
+        lines = ["".join(cell[1] for cell in row).rstrip() for row in self.screen]
+        return "\n".join(lines + [self._status()]) + "\n"
+
+    def start(self):
+        """Draw the whole view once; the cursor is left on the line below it."""
+        self._update_screen()
+        if not self.ansi:
+            self.stream.write(self._plain_frame())
+            self.stream.flush()
+            return
+        out = [CSI + "?25l"]
+        for row in self.screen:
+            color = None
+            for cell_color, char in row:
+                if cell_color != color:
+                    out.append(cell_color)
+                    color = cell_color
+                out.append(char)
+            out.append(RESET + "\n")
+        out.append(self._status() + "\n")
+        self.cells_written += self.rows * self.columns
+        self.frames += 1
+        self.stream.write("".join(out))
+        self.stream.flush()
+
+    def refresh(self):
+        """Write the cells that changed since the last frame and the status line."""
+        roles = {}
+        if self.highlight is not None:
+            op, i, j = self.highlight
+            roles = dict.fromkeys((i, j) if op != WRITE else (i,), ROLE_OF_OP[op])
+        self._set_roles(roles)
+        if not self.ansi:
+            return
+        changes = self._update_screen()
+        # The cursor rests at column 0 of the line below the status line
+        row, col, color = self.rows + 1, 0, None
+        out = []
+        for r, c, (cell_color, char) in changes:
+            if r != row:
+                out.append(f"{CSI}{row - r}A" if r < row else f"{CSI}{r - row}B")
+                row = r
+            if c != col:
+                out.append(f"{CSI}{c + 1}G")
+            if cell_color != color:
+                out.append(cell_color)
+                color = cell_color
+            out.append(char)
+            col = c + 1
+        if row != self.rows:
+            out.append(f"{CSI}{row - self.rows}A" if row > self.rows else f"{CSI}{self.rows - row}B")
+        out.append(f"{RESET}\r{self._status()}{CSI}K{CSI}1B\r")
+        self.cells_written += len(changes)
+        self.frames += 1
+        self.stream.write("".join(out))
+        self.stream.flush()
+
+    def finish(self):
+        """Draw the final state without highlights and restore the cursor."""
+        self.highlight = None
+        self.refresh()
+        if self.ansi:
+            self.stream.write(CSI + "?25h")
+        else:
+            self._update_screen()
+            self.stream.write(self._plain_frame())
+        self.stream.flush()
+
+
+def visualize(func, arr, stream=None, fps=DEFAULT_FPS):
+    """
+    Run func on arr, showing its progress live in the terminal.
+
+    Args:
+        func: Registry algorithm accepting trace=
+        arr: Input array
+        stream: Text stream to draw on (default: sys.stdout)
+        fps: Most frames drawn per second
+
+    Returns:
+        The algorithm's output
+    """
+    if not len(arr):
+        return func(arr)
+    view = TerminalView(arr, stream, fps)
+    view.start()
+    try:
+        output, _ = record(func, arr, sink=view.feed)
+    finally:
+        view.finish()
+    return output
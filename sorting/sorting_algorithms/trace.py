@@ -0,0 +1,340 @@
+"""
+Compact event traces recorded by the sorting algorithms themselves.
+
+Algorithms accept trace=None; passed a Trace, they record each compare,
+swap, write and "position is final" event as two int32 words:
+
+    word 0: i << 2 | op
+    word 1: j (COMPARE/SWAP), the written value (WRITE), or i (SORTED)
+
+so an event costs 8 bytes in an array('i') instead of a Python tuple.
+With trace=None the algorithms run their original, untraced loop.
+
+A Trace keeps every event in memory by default.  With capacity it is a
+ring that keeps roughly the last capacity events; with path it streams
+events to a raw little-endian int32 file; with sink it hands each pass's
+events to sink(words) (a live consumer such as the terminal renderer) and
+drops them.  Algorithms append through the bound method trace.emit and
+call trace.flush() once per pass, so a buffer can overrun capacity by at
+most one pass before it is trimmed, written or consumed.
+
+TraceProducer runs a traced algorithm on a background thread and passes
+its events to a consumer (a GUI timer) through a bounded queue.  When the
+consumer falls behind, the queue fills and the algorithm blocks in
+trace.flush(), so memory stays bounded however long the sort runs.
+
+Timeline makes a trace seekable: it keeps snapshots of the array (and of
+which positions are final) every interval events, so the state at any
+position is one snapshot copy plus fewer than interval events replayed.
+"""
+
+import queue
+import sys
+import threading
+from array import array
+
+COMPARE, SWAP, WRITE, SORTED = range(4)
+OP_NAMES = ("compare", "swap", "write", "sorted")
+
+# Events buffered before a file-backed trace writes them out
+FLUSH_EVENTS = 1 << 16
+
+# TraceProducer: events per queued chunk, and chunks the queue holds
+CHUNK_EVENTS = 4096
+MAX_CHUNKS = 64
+
+# Smallest Timeline snapshot interval (it is at least the array length)
+KEYFRAME_EVENTS = 1024
+
+
+class Trace:
+    """Event recorder backed by an array('i'), optionally a ring or a file."""
+
+    def __init__(self, capacity=None, path=None, flush_events=FLUSH_EVENTS, sink=None):
+        if sum(option is not None for option in (capacity, path, sink)) > 1:
+            raise ValueError("a trace is a ring (capacity), file-backed (path) or streamed (sink), "
+                             "not several")
+        self.words = array("i")
+        self.capacity = capacity
+        self.path = path
+        self.sink = sink
+        self.flush_events = flush_events
+        self.dropped = 0
+        self.written = 0
+        self._file = open(path, "wb") if path is not None else None
+        # Hot loops call emit((i << 2 | op, j)) directly
+        self.emit = self.words.extend
+
+    def flush(self, force=False):
+        """Trim a ring to capacity, write a file-backed buffer out, or feed the sink."""
+        events = len(self.words) // 2
+        if self.sink is not None:
+            if events:
+                self.sink(self.words)
+                self.written += events
+                del self.words[:]
+        elif self._file is not None:
+            if force or events >= self.flush_events:
+                chunk = self.words
+                if sys.byteorder == "big":
+                    chunk = array("i", chunk)
+                    chunk.byteswap()
+                chunk.tofile(self._file)
+                self.written += events
+                del self.words[:]
+        elif self.capacity is not None and events > self.capacity:
+            excess = events - self.capacity
+            del self.words[:2 * excess]
+            self.dropped += excess
+
+    def close(self):
+        """Write (or feed) any buffered events and close the file, if any."""
+        if self.sink is not None:
+            self.flush(force=True)
+        if self._file is not None:
+            self.flush(force=True)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        """Number of events held in memory."""
+        return len(self.words) // 2
+
+    def events(self):
+        """Yield buffered events as (op, i, j)."""
+        return decode(self.words)
+
+    def counts(self):
+        """Return {op name: count} for buffered events."""
+        totals = [0] * len(OP_NAMES)
+        for word in self.words[::2]:
+            totals[word & 3] += 1
+        return dict(zip(OP_NAMES, totals))
+
+
+def decode(words):
+    """Yield (op, i, j) from a flat sequence of trace words."""
+    it = iter(words)
+    for word, j in zip(it, it):
+        yield word & 3, word >> 2, j
+
+
+def read_trace(path):
+    """Read a file-backed trace into an array('i') of words."""
+    words = array("i")
+    with open(path, "rb") as f:
+        words.frombytes(f.read())
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+
+def replay(initial, words):
+    """
+    Apply a complete trace to a copy of initial, one event at a time.
+
+    Args:
+        initial: The array the algorithm was given
+        words: Trace words (Trace.words or read_trace())
+
+    Yields:
+        tuple: (op, i, j, state) where state is the list after the event
+        (the same list object each time, mutated in place)
+    """
+    state = list(initial)
+    for op, i, j in decode(words):
+        if op == SWAP:
+            state[i], state[j] = state[j], state[i]
+        elif op == WRITE:
+            state[i] = j
+        yield op, i, j, state
+
+
+class Timeline:
+    """
+    Seekable trace: array snapshots every interval events plus the event log.
+
+    Snapshots are taken lazily as far as a seek needs.  Values are stored as
+    array('q') (a tuple if they are not all int64) and the final-position
+    flags as bytes.  The interval defaults to max(KEYFRAME_EVENTS, n), which
+    keeps the snapshots about as large as the trace itself.  words may keep
+    growing after the Timeline is built (a live trace).
+    """
+
+    def __init__(self, initial, words, interval=None):
+        """
+        Args:
+            initial: The array the algorithm was given
+            words: Trace words (appended to as a live trace grows)
+            interval: Events between snapshots
+        """
+        self.words = words
+        self.interval = interval or max(KEYFRAME_EVENTS, len(initial))
+        self._state = list(initial)
+        self._sorted = bytearray(len(self._state))
+        self._counts = [0] * len(OP_NAMES)
+        self._indexed = 0  # events folded into _state
+        self.keyframes = [self._snapshot()]
+
+    def __len__(self):
+        """Number of events in the trace so far."""
+        return len(self.words) // 2
+
+    def _snapshot(self):
+        try:
+            values = array("q", self._state)
+        except (OverflowError, TypeError):
+            values = tuple(self._state)
+        return values, bytes(self._sorted), tuple(self._counts)
+
+    def _index_to(self, position):
+        """Fold events up to position into the running state, snapshotting as we go."""
+        interval = self.interval
+        start = self._indexed
+        stop = min(position, len(self))
+        if stop <= start:
+            return
+        for op, i, j in decode(self.words[2 * start:2 * stop]):
+            _apply(self._state, self._sorted, op, i, j)
+            self._counts[op] += 1
+            self._indexed += 1
+            if self._indexed % interval == 0:
+                self.keyframes.append(self._snapshot())
+
+    def state_at(self, position):
+        """
+        Reconstruct the state after the first position events.
+
+        Returns:
+            tuple: (values list, final-position bytearray, per-op counts
+            list, last event as (op, i, j) or None)
+        """
+        position = max(0, min(position, len(self)))
+        self._index_to(position)
+        k = min(position // self.interval, len(self.keyframes) - 1)
+        values, done, counts = self.keyframes[k]
+        values, done, counts = list(values), bytearray(done), list(counts)
+        last = None
+        for last in decode(self.words[2 * k * self.interval:2 * position]):
+            _apply(values, done, *last)
+            counts[last[0]] += 1
+        if last is None and position:
+            # position is on a snapshot; its last event is still worth showing
+            last = next(decode(self.words[2 * position - 2:2 * position]))
+        return values, done, counts, last
+
+
+def _apply(state, done, op, i, j):
+    """Apply one event to a state list and its final-position flags."""
+    if op == SWAP:
+        state[i], state[j] = state[j], state[i]
+    elif op == WRITE:
+        state[i] = j
+    elif op == SORTED:
+        done[i] = 1
+
+
+def record(func, arr, capacity=None, path=None, sink=None):
+    """
+    Run func(arr, trace=...) and return (output, trace).
+
+    The trace is closed (and a file-backed or streamed trace fully written)
+    on return.
+    """
+    with Trace(capacity, path, sink=sink) as trace:
+        output = func(arr, trace=trace)
+    return output, trace
+
+
+class _Stopped(Exception):
+    """Raised inside a producer's algorithm to abandon it."""
+
+
+class TraceProducer:
+    """
+    Run a traced algorithm on a background thread, queueing its events.
+
+    Each pass's events are cut into chunks of at most chunk_events and put
+    on a queue of at most max_chunks chunks; the algorithm waits while the
+    queue is full.  The consumer calls poll() from its own thread.
+    """
+
+    def __init__(self, func, arr, chunk_events=CHUNK_EVENTS, max_chunks=MAX_CHUNKS):
+        self.queue = queue.Queue(max_chunks)
+        self.chunk_words = 2 * chunk_events
+        self.output = None
+        self.error = None
+        self.exhausted = False  # every event (and the end marker) was polled
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(func, arr), daemon=True,
+                                       name="trace-producer")
+
+    def start(self):
+        """Start the algorithm thread."""
+        self.thread.start()
+        return self
+
+    def _run(self, func, arr):
+        try:
+            with Trace(sink=self._put_words) as trace:
+                self.output = func(arr, trace=trace)
+        except _Stopped:
+            return
+        except Exception as e:
+            self.error = e
+        try:
+            self._put(None)  # end marker
+        except _Stopped:
+            pass
+
+    def _put_words(self, words):
+        """Trace sink: queue copies of words in chunks."""
+        for start in range(0, len(words), self.chunk_words):
+            self._put(words[start:start + self.chunk_words])
+
+    def _put(self, item):
+        """Blocking put that gives up once stop() is called."""
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+        raise _Stopped
+
+    def poll(self, events):
+        """
+        Take queued chunks without waiting until about events are collected.
+
+        Returns:
+            list: Word chunks (possibly empty); exhausted is set once the
+            end marker has been taken
+        """
+        chunks = []
+        words = 0
+        while not self.exhausted and words < 2 * events:
+            try:
+                chunk = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                self.exhausted = True
+            else:
+                chunks.append(chunk)
+                words += len(chunk)
+        return chunks
+
+    def stop(self):
+        """Abandon the algorithm (it stops at its next flush) and free the queue."""
+        self._stop.set()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
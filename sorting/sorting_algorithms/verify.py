@@ -0,0 +1,213 @@
+"""
+Linear-time verification of sorting output.
+
+Instead of building a sorted() reference and comparing lists, output is
+checked for non-decreasing order in one pass and compared to the input as a
+multiset.  Lists use a Counter; NumPy arrays and streamed files use an
+order-independent 128-bit hash fingerprint, so no reference copy is needed.
+"""
+
+import operator
+from collections import Counter
+from itertools import islice
+
+from .fileio import CHUNK_BYTES, iter_chunks
+
+MASK64 = (1 << 64) - 1
+
+
+def _is_ndarray(values):
+    """Return True for NumPy arrays without importing NumPy."""
+    return type(values).__module__ == "numpy" and hasattr(values, "dtype")
+
+
+def _splitmix64(z):
+    """Mix a 64-bit integer (SplitMix64 finalizer)."""
+    z = (z + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def _element_key(value):
+    """Map an element to 64 bits; ints by value so NumPy and lists agree."""
+    if isinstance(value, int):
+        return value & MASK64
+    return hash(value) & MASK64
+
+
+def is_non_decreasing(values):
+    """
+    Check that values are in non-decreasing order in a single pass.
+
+    Args:
+        values: List, array or NumPy array
+
+    Returns:
+        bool: True if every element is <= its successor
+    """
+    if _is_ndarray(values):
+        return len(values) < 2 or bool((values[:-1] <= values[1:]).all())
+    return all(map(operator.le, values, islice(values, 1, None)))
+
+
+class Fingerprint:
+    """Order-independent multiset hash accumulated over one or more chunks."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum1 = 0
+        self.sum2 = 0
+
+    def update(self, values):
+        """Add a chunk of values to the fingerprint."""
+        if _is_ndarray(values) and values.dtype.kind in "iub":
+            self._update_numpy(values)
+            return self
+        sum1 = self.sum1
+        sum2 = self.sum2
+        for value in values:
+            z = _splitmix64(_element_key(value))
+            sum1 += z
+            sum2 += _splitmix64(z)
+        self.count += len(values)
+        self.sum1 = sum1 & MASK64
+        self.sum2 = sum2 & MASK64
+        return self
+
+    def _update_numpy(self, values):
+        """Vectorized SplitMix64 over an integer NumPy array."""
+        import numpy as np
+
+        def mix(z):
+            z = z + np.uint64(0x9E3779B97F4A7C15)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            return z ^ (z >> np.uint64(31))
+
+        with np.errstate(over="ignore"):
+            z = mix(values.astype(np.int64, copy=False).view(np.uint64))
+            sum1 = int(z.sum(dtype=np.uint64))
+            sum2 = int(mix(z).sum(dtype=np.uint64))
+        self.count += len(values)
+        self.sum1 = (self.sum1 + sum1) & MASK64
+        self.sum2 = (self.sum2 + sum2) & MASK64
+
+    def __eq__(self, other):
+        if not isinstance(other, Fingerprint):
+            return NotImplemented
+        return (self.count, self.sum1, self.sum2) == (other.count, other.sum1, other.sum2)
+
+    def __repr__(self):
+        return f"Fingerprint(count={self.count}, sum1={self.sum1:#x}, sum2={self.sum2:#x})"
+
+
+def fingerprint(values):
+    """Return the Fingerprint of a single sequence."""
+    return Fingerprint().update(values)
+
+
+def same_multiset(original, output):
+    """
+    Check that output holds exactly the elements of original.
+
+    Lists are compared with a Counter (exact); NumPy arrays with a hash
+    fingerprint.
+
+    Args:
+        original: Input sequence
+        output: Sorted sequence
+
+    Returns:
+        bool: True if both contain the same elements with the same counts
+    """
+    if len(original) != len(output):
+        return False
+    if _is_ndarray(original) or _is_ndarray(output):
+        return fingerprint(original) == fingerprint(output)
+    # dict equality runs in C; Counter.__eq__ walks both key sets in Python
+    return dict.__eq__(Counter(original), Counter(output))
+
+
+def verify_sorted(original, output):
+    """
+    Verify that output is a sorted permutation of original in linear time.
+
+    Args:
+        original: Input passed to the algorithm
+        output: Value the algorithm returned
+
+    Returns:
+        bool: True if output is non-decreasing and has the same elements
+    """
+    if output is None:
+        return False
+    return is_non_decreasing(output) and same_multiset(original, output)
+
+
+def is_stable(original, output, key):
+    """
+    Check that equal-key elements keep their original relative order.
+
+    Args:
+        original: Input sequence of records
+        output: Sorted sequence of records
+        key: Function extracting the sort key from a record
+
+    Returns:
+        bool: True if, for every key, records appear in the same order as
+            in the input
+    """
+    groups = {}
+    for record in original:
+        groups.setdefault(key(record), []).append(record)
+    positions = dict.fromkeys(groups, 0)
+    for record in output:
+        k = key(record)
+        group = groups.get(k)
+        if group is None or positions[k] >= len(group) or group[positions[k]] != record:
+            return False
+        positions[k] += 1
+    return all(positions[k] == len(group) for k, group in groups.items())
+
+
+def verify_stream(chunks, expected=None):
+    """
+    Verify sorted output delivered in chunks without holding it in memory.
+
+    Args:
+        chunks: Iterable of sequences in output order
+        expected: Optional Fingerprint of the input to compare against
+
+    Returns:
+        bool: True if the concatenation is non-decreasing (and matches
+            expected, when given)
+    """
+    seen = Fingerprint()
+    last = None
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        if last is not None and chunk[0] < last:
+            return False
+        if not is_non_decreasing(chunk):
+            return False
+        seen.update(chunk)
+        last = chunk[-1]
+    return expected is None or seen == expected
+
+
+def verify_file(path, fmt="text", expected=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Stream-verify an external-sort output file.
+
+    Args:
+        path: Output file path
+        fmt: "text", "int32" or "int64"
+        expected: Optional Fingerprint of the input
+        chunk_bytes: Approximate bytes read per chunk
+
+    Returns:
+        bool: True if the file is sorted (and matches expected, when given)
+    """
+    return verify_stream(iter_chunks(path, fmt, chunk_bytes), expected)
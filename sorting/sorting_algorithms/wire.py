@@ -0,0 +1,118 @@
+"""
+Length-prefixed binary frames for integer arrays.
+
+Used by the sort service (serve.py) and the distributed sample sort.  A
+frame is a fixed header, a short name and a little-endian int payload:
+
+    magic  b"SB"   2 bytes
+    itemsize       1 byte   4 or 8 (int32/int64); 0 marks an error frame
+    name length    1 byte
+    count          4 bytes  number of items (little-endian uint32)
+    name           algorithm name (request), or error message (error frame)
+    payload        count * itemsize bytes
+"""
+
+import struct
+import sys
+from array import array
+
+MAGIC = b"SB"
+HEADER = struct.Struct("<2sBBI")
+TYPECODES = {4: "i", 8: "q"}
+MAX_NAME = 255
+
+
+class FrameError(ValueError):
+    """Raised for malformed frames and for error frames from the peer."""
+
+
+def pack_frame(name, values, itemsize=8):
+    """
+    Encode name and integer values as one frame.
+
+    Args:
+        name: Algorithm name (or other short tag)
+        values: Sequence of ints
+        itemsize: 4 or 8
+
+    Returns:
+        bytes: Encoded frame
+    """
+    payload = array(TYPECODES[itemsize], values)
+    if sys.byteorder == "big":
+        payload.byteswap()
+    encoded = name.encode()
+    if len(encoded) > MAX_NAME:
+        raise FrameError(f"name longer than {MAX_NAME} bytes")
+    return HEADER.pack(MAGIC, itemsize, len(encoded), len(payload)) + encoded + payload.tobytes()
+
+
+def pack_error(message):
+    """Encode an error frame carrying message (truncated to MAX_NAME bytes)."""
+    encoded = message.encode()[:MAX_NAME]
+    return HEADER.pack(MAGIC, 0, len(encoded), 0) + encoded
+
+
+def parse_header(header):
+    """Return (itemsize, name_length, count) from a packed header."""
+    magic, itemsize, name_length, count = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise FrameError(f"bad frame magic {magic!r}")
+    if itemsize and itemsize not in TYPECODES:
+        raise FrameError(f"unsupported item size {itemsize}")
+    return itemsize, name_length, count
+
+
+def unpack_payload(data, itemsize):
+    """Decode a little-endian payload into a list of ints."""
+    values = array(TYPECODES[itemsize])
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
+def _finish(itemsize, name, payload):
+    """Turn decoded parts into (name, values), raising on error frames."""
+    if itemsize == 0:
+        raise FrameError(name)
+    return name, unpack_payload(payload, itemsize)
+
+
+async def read_frame_async(reader, header=b""):
+    """
+    Read one frame from an asyncio StreamReader.
+
+    Args:
+        reader: asyncio.StreamReader
+        header: Header bytes already consumed by the caller, if any
+
+    Returns:
+        tuple: (name, values, itemsize)
+    """
+    header += await reader.readexactly(HEADER.size - len(header))
+    itemsize, name_length, count = parse_header(header)
+    name = (await reader.readexactly(name_length)).decode()
+    payload = await reader.readexactly(count * itemsize)
+    return _finish(itemsize, name, payload) + (itemsize,)
+
+
+def _read_exactly(stream, size):
+    """Read exactly size bytes from a blocking binary stream."""
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError(f"expected {size} bytes, got {len(data)}")
+    return data
+
+
+def read_frame(stream):
+    """
+    Read one frame from a blocking binary stream (e.g. socket.makefile("rb")).
+
+    Returns:
+        tuple: (name, values, itemsize)
+    """
+    itemsize, name_length, count = parse_header(_read_exactly(stream, HEADER.size))
+    name = _read_exactly(stream, name_length).decode()
+    payload = _read_exactly(stream, count * itemsize)
+    return _finish(itemsize, name, payload) + (itemsize,)
@@ -4,15 +4,18 @@ Beautiful Graphical Sorting Visualizer
 Uses matplotlib to create animated bar charts showing the sorting process
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-import numpy as np
-import time
+from render_engine import (DEFAULT_FPS, TimelineControls, TracePlayer, add_playback_arguments,
+                           make_chart)
 from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.trace import record
+
+# matplotlib loads when a visualizer is created, not at import
+plt = lazy_import("matplotlib.pyplot")
 
 
 class SortingVisualizer:
-    def __init__(self, algorithm_name="bubble"):
+    def __init__(self, algorithm_name="bubble", fig=None):
         """Initialize the visualizer with the specified algorithm."""
         self.algorithm_name = algorithm_name
         self.algorithm_func = ALGORITHMS.get(algorithm_name)
@@ -20,7 +23,12 @@ class SortingVisualizer:
             raise ValueError(f"Algorithm '{algorithm_name}' not found")
         
         # Setup the plot
-        self.fig, self.ax = plt.subplots(figsize=(12, 8))
+        if fig is None:
+            self.fig, self.ax = plt.subplots(figsize=(12, 8))
+        else:
+            # Redraw on a figure that is already open (the demo runner's window)
+            fig.clear()
+            self.fig, self.ax = fig, fig.subplots()
         self.fig.suptitle(f'{algorithm_name.title()} Sort Visualization', fontsize=16, fontweight='bold')
         
         # Colors for different states
@@ -33,125 +41,84 @@ class SortingVisualizer:
         }
         
         # Animation settings
-        self.animation_speed = 0.5  # seconds between frames
+        self.animation_speed = 0.5  # seconds per operation
+        self.fps = DEFAULT_FPS
+        self.duration = None  # seconds for the whole sort, if fixed
         
     def setup_plot(self, arr):
         """Setup the initial plot with the array."""
+        if getattr(self, "chart", None) is not None:
+            self.chart.disconnect()
         self.ax.clear()
-        self.ax.set_xlim(0, len(arr))
+        self.ax.set_xlim(-0.5, len(arr) - 0.5)
         self.ax.set_ylim(min(arr) - 1, max(arr) + 1)
         self.ax.set_xlabel('Array Index', fontsize=12)
         self.ax.set_ylabel('Value', fontsize=12)
         self.ax.grid(True, alpha=0.3)
         
-        # Create bars
-        x_positions = np.arange(len(arr))
-        self.bars = self.ax.bar(x_positions, arr, color=self.colors['default'], 
-                               edgecolor='black', linewidth=1, alpha=0.8)
-        
-        # Add value labels on top of bars
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            height = bar.get_height()
-            self.ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                        f'{value}', ha='center', va='bottom', fontweight='bold')
+        # Bars and value labels (a raster for large arrays), redrawn only where they change
+        self.chart = make_chart(self.ax, arr, self.colors,
+                                bar_kwargs=dict(edgecolor='black', linewidth=1, alpha=0.8),
+                                label_kwargs=dict(fontweight='bold'))
         
         plt.tight_layout()
         
-    def update_bars(self, arr, comparing_indices=None, swapping_indices=None, sorted_indices=None):
-        """Update the bar colors and heights based on current state."""
-        for i, (bar, value) in enumerate(zip(self.bars, arr)):
-            # Update bar height
-            bar.set_height(value)
-            
-            # Update bar color based on state
-            if comparing_indices and i in comparing_indices:
-                bar.set_color(self.colors['comparing'])
-            elif swapping_indices and i in swapping_indices:
-                bar.set_color(self.colors['swapping'])
-            elif sorted_indices and i in sorted_indices:
-                bar.set_color(self.colors['sorted'])
-            else:
-                bar.set_color(self.colors['default'])
-            
-            # Update value label
-            height = bar.get_height()
-            self.ax.texts[i].set_position((bar.get_x() + bar.get_width()/2., height + 0.1))
-            self.ax.texts[i].set_text(f'{value}')
-        
-        plt.pause(self.animation_speed)
+    def make_player(self, words):
+        """Build the player that replays words onto the current chart."""
+        return TracePlayer(self.chart, words, speed=self.animation_speed,
+                           duration=self.duration, fps=self.fps,
+                           on_finish=self.finish)
         
-    def visualize_bubble_sort(self, arr):
-        """Visualize bubble sort with beautiful animations."""
-        arr_copy = arr.copy()
-        n = len(arr_copy)
-        
-        # Setup initial plot
-        self.setup_plot(arr_copy)
-        plt.show(block=False)
-        
-        # Track sorted elements
-        sorted_count = 0
+    def visualize_sort(self, arr, recorded=None, show=True):
+        """
+        Replay the algorithm's recorded trace as a blitted animation.
+
+        recorded is an (output, trace) pair from record() to play instead of
+        recording again; with show=False the animation starts without
+        blocking in plt.show().
+        """
+        output, trace = recorded or record(self.algorithm_func, arr)
+        self.setup_plot(arr)
+        if output is None:
+            # Stub algorithms return nothing and record no events
+            self.ax.set_title(f'{self.algorithm_name.title()} Sort (Not yet implemented)', fontsize=14)
+            if show:
+                plt.show()
+            return
         
-        for pass_num in range(n - 1):
-            swapped = False
-            
-            for i in range(n - 1 - pass_num):
-                # Highlight comparing elements
-                comparing = [i, i + 1]
-                self.update_bars(arr_copy, comparing_indices=comparing)
-                
-                if arr_copy[i] > arr_copy[i + 1]:
-                    # Highlight swapping elements
-                    self.update_bars(arr_copy, swapping_indices=comparing)
-                    
-                    # Perform swap
-                    arr_copy[i], arr_copy[i + 1] = arr_copy[i + 1], arr_copy[i]
-                    swapped = True
-                    
-                    # Update plot after swap
-                    self.update_bars(arr_copy, swapping_indices=comparing)
-                
-                # Mark elements as sorted if they're in final position
-                if i >= n - 1 - pass_num - sorted_count:
-                    sorted_indices = list(range(n - sorted_count, n))
-                    self.update_bars(arr_copy, sorted_indices=sorted_indices)
-            
-            # Mark the largest element as sorted
-            sorted_count += 1
-            sorted_indices = list(range(n - sorted_count, n))
-            self.update_bars(arr_copy, sorted_indices=sorted_indices)
-            
-            if not swapped:
-                # Array is sorted, mark all as sorted
-                sorted_indices = list(range(n))
-                self.update_bars(arr_copy, sorted_indices=sorted_indices)
-                break
+        self.player = self.make_player(trace.words)
+        self.player.start()
+        self.controls = TimelineControls(self.player)
+        if show:
+            plt.show()
         
-        # Final state - all sorted
-        self.update_bars(arr_copy, sorted_indices=list(range(n)))
-        plt.title(f'{self.algorithm_name.title()} Sort Complete!', fontsize=14, color='green')
-        plt.show()
+    def visualize_bubble_sort(self, arr):
+        """Visualize bubble sort (kept for callers of the original API)."""
+        self.visualize_sort(arr, recorded=record(ALGORITHMS["bubble"], arr))
         
-    def visualize_sort(self, arr):
-        """Main method to visualize sorting based on algorithm type."""
-        if self.algorithm_name == "bubble":
-            self.visualize_bubble_sort(arr)
-        else:
-            # For now, just show the array
-            self.setup_plot(arr)
-            plt.title(f'{self.algorithm_name.title()} Sort (Not yet implemented)', fontsize=14)
-            plt.show()
+    def finish(self, player):
+        """Show the completion title once the last event has played."""
+        self.ax.set_title(f'{self.algorithm_name.title()} Sort Complete!', fontsize=14, color='green')
+        self.fig.canvas.draw_idle()
 
 
 def main():
     """Main function to run the visualizer."""
     import argparse
+    import random
+    from video_export import add_export_arguments, export_from_args
     
     parser = argparse.ArgumentParser(description="Beautiful Sorting Visualizer")
-    parser.add_argument("--algo", choices=["bubble", "merge", "quick"], default="bubble",
+    parser.add_argument("--algo", choices=ALGORITHMS.names(element_type="int"), default="bubble",
                        help="Algorithm to visualize")
     parser.add_argument("--array", type=str, default="7,1,4,9,2",
                        help="Comma-separated array to sort")
+    parser.add_argument("--size", type=int, default=None,
+                       help="Sort a shuffled range of this many elements instead of --array "
+                            "(large arrays are drawn as a raster)")
+    
+    add_playback_arguments(parser)
+    add_export_arguments(parser)
     
     args = parser.parse_args()
     
@@ -162,11 +129,22 @@ def main():
         print("Invalid array format. Using default: [7, 1, 4, 9, 2]")
         arr = [7, 1, 4, 9, 2]
     
-    print(f"Visualizing {args.algo} sort on array: {arr}")
+    shown = arr
+    if args.size:
+        arr = random.sample(range(1, args.size + 1), args.size)
+        shown = f"{args.size} shuffled elements"
+    
+    if args.export:
+        export_from_args(args, SortingVisualizer, arr)
+        return
+    
+    print(f"Visualizing {args.algo} sort on array: {shown}")
     
     # Create and run visualizer
     try:
         visualizer = SortingVisualizer(args.algo)
+        visualizer.fps = args.fps
+        visualizer.duration = args.duration
         visualizer.visualize_sort(arr)
     except Exception as e:
         print(f"Error: {e}")
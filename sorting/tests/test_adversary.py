@@ -0,0 +1,69 @@
+"""
+Unit tests for the adversarial input generator.
+"""
+
+import random
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.adversary import antiqsort, count_comparisons, mutation_search
+
+
+def middle_pivot_quick_sort(arr):
+    """Hoare-partition quicksort with a middle pivot (quadratic under attack)."""
+    arr = list(arr)
+
+    def partition_sort(lo, hi):
+        if hi - lo < 2:
+            return
+        pivot = arr[lo + (hi - lo) // 2]
+        i, j = lo, hi - 1
+        while i <= j:
+            while arr[i] < pivot:
+                i += 1
+            while pivot < arr[j]:
+                j -= 1
+            if i <= j:
+                arr[i], arr[j] = arr[j], arr[i]
+                i += 1
+                j -= 1
+        partition_sort(lo, j + 1)
+        partition_sort(i, hi)
+
+    partition_sort(0, len(arr))
+    return arr
+
+
+class TestAdversary:
+    """Test class for antiqsort and mutation search."""
+
+    def test_antiqsort_is_reproducible(self):
+        """Replaying the generated input costs exactly what the adversary saw."""
+        killer, comparisons = antiqsort(middle_pivot_quick_sort, 128)
+        assert sorted(killer) == list(range(128))
+        assert count_comparisons(middle_pivot_quick_sort, killer) == comparisons
+
+    def test_antiqsort_drives_quicksort_quadratic(self):
+        """The killer input costs far more than a random permutation."""
+        n = 256
+        killer, comparisons = antiqsort(middle_pivot_quick_sort, n)
+        shuffled = random.Random(0).sample(range(n), n)
+        assert comparisons > 4 * count_comparisons(middle_pivot_quick_sort, shuffled)
+        assert comparisons > n * n // 8
+
+    def test_mutation_search_never_gets_worse(self):
+        """Hill climbing returns at least the best seed's comparison count."""
+        seed = list(range(32))
+        start = count_comparisons(middle_pivot_quick_sort, seed)
+        worst, score = mutation_search(middle_pivot_quick_sort, [seed], iterations=50,
+                                       rng=random.Random(1))
+        assert len(worst) == 32
+        assert score >= start
+
+    def test_registered_algorithms_accept_wrapped_elements(self):
+        """Every registered algorithm for ints can be driven by the adversary."""
+        for name in ALGORITHMS.names(element_type="int"):
+            killer, _ = antiqsort(ALGORITHMS[name], 8)
+            assert sorted(killer) == list(range(8))
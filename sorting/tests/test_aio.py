@@ -0,0 +1,126 @@
+"""
+Unit tests for the asyncio sort API.
+"""
+
+import asyncio
+import random
+import time
+import pytest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import aio
+from sorting_algorithms.aio import QUADRATIC_SLICE, merge_sorted, sort_async
+from sorting_algorithms.serve import SortError
+
+
+def random_ints(n, seed=0):
+    """n reproducible random ints."""
+    rng = random.Random(seed)
+    return [rng.randrange(10**6) for _ in range(n)]
+
+
+async def longest_stall(coroutine):
+    """Await coroutine while a ticker measures the longest gap between loop turns."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await coroutine
+    finally:
+        done.set()
+        await task
+    return result, max(gaps)
+
+
+class Keyed:
+    """Record compared by key only."""
+
+    def __init__(self, key, tag):
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class TestSortAsync:
+    """Test class for cooperative slices, offloading, merging and cancellation."""
+
+    def test_selection_sort_beyond_max_n_keeps_loop_responsive(self):
+        """A 20k selection sort runs in slices; the loop is never held for long."""
+        data = random_ints(20000)
+        output, stall = asyncio.run(longest_stall(sort_async(data, "selection")))
+        assert output == sorted(data)
+        assert stall < 0.25
+
+    def test_numpy_paths(self):
+        """Without an algorithm, large int lists and NumPy arrays go to np.sort."""
+        np = pytest.importorskip("numpy")
+        data = random_ints(aio.OFFLOAD_THRESHOLD)
+        output = asyncio.run(sort_async(data))
+        assert isinstance(output, list) and output == sorted(data)
+        array = asyncio.run(sort_async(np.array(data[:100])))
+        assert (array == np.sort(array)).all()
+        merged = asyncio.run(merge_sorted(np.array([1, 4]), np.array([2, 3])))
+        assert merged.tolist() == [1, 2, 3, 4]
+
+    def test_executor_offload(self):
+        """With an executor, large inputs are sorted there by one algorithm call."""
+        data = random_ints(300)
+        with ThreadPoolExecutor(1) as executor:
+            output = asyncio.run(sort_async(data, "block", executor=executor, offload_threshold=100))
+        assert output == sorted(data)
+
+    def test_merge_sorted_is_stable(self):
+        """Equal keys come out in run order, so merged slices of a stable sort stay stable."""
+        rng = random.Random(1)
+        records = [Keyed(rng.randrange(10), tag) for tag in range(3 * aio.SLICE + 7)]
+        runs = [sorted(records[start:start + aio.SLICE], key=lambda r: r.key)
+                for start in range(0, len(records), aio.SLICE)]
+        output = asyncio.run(merge_sorted(*runs))
+        assert [(r.key, r.tag) for r in output] == sorted((r.key, r.tag) for r in records)
+
+    def test_merge_sorted_lists(self):
+        """Runs of different lengths (and empty ones) merge into one list."""
+        runs = [sorted(random_ints(n, seed=n)) for n in (0, 1, 5000, 9000)]
+        assert asyncio.run(merge_sorted(*runs)) == sorted(sum(runs, []))
+        assert asyncio.run(merge_sorted()) == []
+
+    def test_cancellation_stops_work(self, monkeypatch):
+        """Cancelling the caller stops slicing before the remaining slices run."""
+        calls = []
+        real_sort_one = aio.sort_one
+        monkeypatch.setattr(aio, "sort_one", lambda name, part: calls.append(1) or real_sort_one(name, part))
+
+        async def scenario():
+            task = asyncio.create_task(sort_async(random_ints(40 * QUADRATIC_SLICE), "bubble"))
+            for _ in range(3):
+                await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert 0 < len(calls) < 40
+
+    def test_errors(self):
+        """Unknown algorithms and algorithms without a result raise SortError."""
+        with pytest.raises(SortError, match="unknown algorithm"):
+            asyncio.run(sort_async([2, 1], "nope"))
+        with pytest.raises(SortError, match="does not accept"):
+            asyncio.run(sort_async([2, 1], "string"))
@@ -0,0 +1,77 @@
+"""
+Unit tests for the low-memory stable block merge sort.
+"""
+
+import random
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.block_merge_sort import INSERTION_BLOCK, block_merge_sort
+from sorting_algorithms.memory import check_memory, measure_memory
+from sorting_algorithms.trace import record, replay
+
+
+class Keyed:
+    """Record compared by key only, tagged with its input position."""
+
+    def __init__(self, key, tag):
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class TestBlockMergeSort:
+    """Test class for ordering, stability, memory and traces of block merge sort."""
+
+    @pytest.mark.parametrize("n", [0, 1, INSERTION_BLOCK, INSERTION_BLOCK + 1, 257, 3000])
+    def test_sorts_in_place(self, n):
+        """Random input of every merge shape is sorted in the list passed in."""
+        rng = random.Random(n)
+        arr = [rng.randrange(-50, 50) for _ in range(n)]
+        expected = sorted(arr)
+        assert block_merge_sort(arr) is arr
+        assert arr == expected
+
+    @pytest.mark.parametrize("distinct", [2, 10, 1000])
+    def test_stable(self, distinct):
+        """Equal keys keep their input order, including across SymMerge splits."""
+        rng = random.Random(distinct)
+        records = [Keyed(rng.randrange(distinct), tag) for tag in range(5000)]
+        output = block_merge_sort(list(records))
+        assert [(r.key, r.tag) for r in output] == sorted((r.key, r.tag) for r in records)
+
+    def test_registered_with_sqrt_budget(self):
+        """The registry exposes it as a stable O(sqrt n) algorithm."""
+        spec = ALGORITHMS.spec("block")
+        assert spec.stable and spec.in_place
+        assert spec.space_class == "O(sqrt n)"
+        assert ALGORITHMS["block"] is block_merge_sort
+
+    @pytest.mark.parametrize("order", ["random", "reversed"])
+    def test_memory_within_sqrt_budget(self, order):
+        """Only the isqrt(n) buffer is allocated: within O(sqrt n), above O(1)."""
+        n = 20000
+        arr = list(range(n, 0, -1))
+        if order == "random":
+            random.Random(0).shuffle(arr)
+        output, stats = measure_memory(block_merge_sort, arr)
+        assert output == list(range(1, n + 1))
+        assert not check_memory(stats, "O(sqrt n)", n)
+        assert check_memory(stats, "O(1)", n)
+
+    def test_trace_replays_to_sorted(self):
+        """A traced run leaves the input alone and replays to the sorted list."""
+        rng = random.Random(1)
+        arr = [rng.randrange(100) for _ in range(600)]
+        original = list(arr)
+        output, recorded = record(block_merge_sort, arr)
+        assert arr == original
+        state = None
+        for *_, state in replay(arr, recorded.words):
+            pass
+        assert state == output == sorted(original)
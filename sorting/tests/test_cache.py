@@ -0,0 +1,105 @@
+"""
+Unit tests for the content-addressed dataset store and result cache.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms.cache import DatasetStore, ResultCache, algorithm_version, content_hash
+import main
+
+
+def counting_sort(arr):
+    """Sort in place and count calls."""
+    counting_sort.calls += 1
+    arr.sort()
+    return arr
+
+
+counting_sort.calls = 0
+
+
+class TestCache:
+    """Test class for dataset hashing, deduplication and the result cache."""
+
+    def test_content_hash_distinguishes_types(self):
+        """Equal contents hash alike; element types and order matter."""
+        assert content_hash([3, 1, 2]) == content_hash([3, 1, 2])
+        assert content_hash([1, 2]) != content_hash([1.0, 2.0])
+        assert content_hash([1, 2]) != content_hash([2, 1])
+
+    def test_main_datasets_aliases(self):
+        """The known duplicate contents in DATASETS are grouped."""
+        groups = sorted(sorted(names) for names in DatasetStore(main.DATASETS).aliases().values())
+        assert ["alternating", "alternating_high_low"] in groups
+        assert ["gapped", "gapped_values"] in groups
+        assert ["random", "random5_fixed"] in groups
+
+    def test_duplicates_run_once(self):
+        """Identical datasets call the algorithm once and share the result."""
+        counting_sort.calls = 0
+        datasets = {"a": [3, 1, 2], "b": [3, 1, 2], "c": [2, 1]}
+        results = main.run_algorithm_on_datasets("bubble", counting_sort, "json", datasets=datasets)
+        assert counting_sort.calls == 2
+        assert results[1] == {"dataset": "b", "passed": True, "duplicate_of": "a"}
+
+    def test_cache_persists_between_runs(self, tmp_path):
+        """A second run with the same cache directory does not call the algorithm."""
+        datasets = {"a": [3, 1, 2]}
+        cache = ResultCache(str(tmp_path))
+        main.run_algorithm_on_datasets("bubble", counting_sort, "json", datasets=datasets, cache=cache)
+        cache.save()
+
+        counting_sort.calls = 0
+        cache = ResultCache(str(tmp_path))
+        results = main.run_algorithm_on_datasets("bubble", counting_sort, "json", datasets=datasets,
+                                                 cache=cache)
+        assert counting_sort.calls == 0
+        assert results == [{"dataset": "a", "passed": True, "cached": True}]
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_lru_eviction(self, tmp_path):
+        """The least recently used entry is evicted first."""
+        cache = ResultCache(str(tmp_path), max_entries=2)
+        cache.put("v", "x", {"passed": True})
+        cache.put("v", "y", {"passed": True})
+        cache.get("v", "x")
+        cache.put("v", "z", {"passed": False})
+        assert cache.get("v", "y") is None
+        assert cache.get("v", "x") == {"passed": True}
+
+    def test_corrupt_cache_file_is_ignored(self, tmp_path):
+        """An unreadable cache file starts an empty cache."""
+        (tmp_path / "results.json").write_text("{not json")
+        assert len(ResultCache(str(tmp_path)).entries) == 0
+
+    def test_non_object_cache_file_is_ignored(self, tmp_path):
+        """Valid JSON that is not an object also starts an empty cache."""
+        (tmp_path / "results.json").write_text("[1, 2]")
+        assert len(ResultCache(str(tmp_path)).entries) == 0
+
+    def test_algorithm_version_tracks_module(self):
+        """Different algorithms (or modules) get different versions."""
+        assert algorithm_version(counting_sort) == algorithm_version(counting_sort)
+        assert algorithm_version(counting_sort) != algorithm_version(main.summarize)
+
+    def test_algorithm_version_tracks_helpers_and_verifier(self, tmp_path, monkeypatch):
+        """Editing an imported helper or the verifier changes the version."""
+        package = tmp_path / "cachedpkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "helper.py").write_text("def key(x):\n    return x\n")
+        (package / "algo.py").write_text(
+            "def algo(arr):\n    from .helper import key\n    return sorted(arr, key=key)\n")
+        verifier = tmp_path / "verify.py"
+        verifier.write_text("def verify():\n    pass\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        from cachedpkg.algo import algo
+
+        before = algorithm_version(algo, [str(verifier)])
+        (package / "helper.py").write_text("def key(x):\n    return -x\n")
+        after_helper = algorithm_version(algo, [str(verifier)])
+        verifier.write_text("def verify():\n    return True\n")
+        after_verifier = algorithm_version(algo, [str(verifier)])
+        assert len({before, after_helper, after_verifier}) == 3
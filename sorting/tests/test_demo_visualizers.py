@@ -0,0 +1,57 @@
+"""
+Unit tests for the in-process demo runner.
+"""
+
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import demo_visualizers
+from demo_visualizers import SCENES, DemoRunner
+from sorting_algorithms import trace
+
+
+class TestDemoRunner:
+    """Test class for scene switching on one figure with preloaded traces."""
+
+    def test_scenes_share_one_figure_and_preloaded_traces(self, monkeypatch, capsys):
+        """Every graphical scene draws on the same figure from a trace recorded ahead."""
+        recorded = []
+        real_record = trace.record
+
+        def counting_record(func, arr, *args, **kwargs):
+            recorded.append(func.__name__)
+            return real_record(func, arr, *args, **kwargs)
+
+        monkeypatch.setattr(demo_visualizers, "record", counting_record)
+        for module in ("sorting_visualizer", "advanced_visualizer", "bubble_sort_visualizer",
+                       "selection_sort_visualizer"):
+            monkeypatch.setattr(sys.modules[module], "record", counting_record)
+
+        runner = DemoRunner(hold=0)
+        figures = []
+
+        def fast_forward(interval):
+            # Stand-in for the GUI event loop: play the current scene to the end
+            player = runner.visualizer.player
+            for batch in player.frames():
+                player.step(batch)
+            figures.append(runner.visualizer.fig)
+
+        monkeypatch.setattr(plt, "pause", fast_forward)
+        plt.close("all")
+        assert runner.run()
+
+        graphical = [scene for scene in SCENES if scene.visualizer is not None]
+        assert len(figures) == len(graphical)
+        assert all(fig is runner.fig for fig in figures)
+        assert plt.get_fignums() == [runner.fig.number]
+        # Each trace was recorded once, by the preloader, not again by the visualizer
+        assert len(recorded) == len(graphical)
+        assert "Basic Text Visualizer" in capsys.readouterr().out
+        plt.close("all")
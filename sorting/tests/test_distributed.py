@@ -0,0 +1,75 @@
+"""
+Unit tests for the distributed sample sort and its local cluster.
+"""
+
+import random
+import pytest
+import subprocess
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms.distributed import (LocalCluster, choose_splitters, frame_itemsize,
+                                            iter_sample_sort, partition, sample_sort)
+from sorting_algorithms.wire import FrameError
+
+
+@pytest.fixture(scope="module")
+def cluster():
+    """Three workers on localhost, shared by the tests in this module."""
+    with LocalCluster(3) as local:
+        yield local
+
+
+class TestSampleSort:
+    """Test class for splitting, shipping and reassembling partitions."""
+
+    def test_partitions_are_ordered_ranges(self):
+        """Every value of a partition is below every value of the next one."""
+        rng = random.Random(1)
+        values = [rng.randrange(-10**6, 10**6) for _ in range(5000)]
+        splitters = choose_splitters(values, 4, rng=rng)
+        parts = partition(values, splitters)
+        assert len(parts) == 4
+        assert sum(map(len, parts)) == len(values)
+        for left, right in zip(parts, parts[1:]):
+            assert max(left) < min(right)
+        # Oversampling keeps partitions near n / workers
+        assert max(map(len, parts)) < 2 * len(values) / 4
+
+    def test_frame_itemsize(self):
+        """int32 frames when the values fit, int64 otherwise."""
+        assert frame_itemsize([-(1 << 31), (1 << 31) - 1]) == 4
+        assert frame_itemsize([1 << 40]) == 8
+        with pytest.raises(ValueError):
+            frame_itemsize([1 << 70])
+
+    def test_local_cluster_sorts(self, cluster):
+        """Workers in subprocesses sort their ranges; the concatenation is sorted."""
+        rng = random.Random(2)
+        values = [rng.randrange(-5000, 5000) for _ in range(3000)] + [1 << 40]
+        parts = list(iter_sample_sort(values, cluster.addresses, "bubble", rng=rng))
+        assert len(parts) == 3
+        assert [v for part in parts for v in part] == sorted(values)
+        assert sample_sort([], cluster.addresses, "bubble") == []
+
+    def test_default_algorithm(self, cluster):
+        """Without an algorithm the workers run a working default."""
+        rng = random.Random(3)
+        values = [rng.randrange(-10**9, 10**9) for _ in range(2000)]
+        assert sample_sort(values, cluster.addresses, rng=rng) == sorted(values)
+
+    def test_worker_errors_are_raised(self, cluster):
+        """A worker's error frame surfaces as FrameError; non-int input is refused."""
+        with pytest.raises(FrameError, match="returned no result"):
+            sample_sort([3, 1, 2], cluster.addresses[:1], "merge")
+        with pytest.raises(TypeError):
+            sample_sort(["b", "a"], cluster.addresses, "bubble")
+
+    def test_unreadable_input_is_a_usage_error(self, tmp_path):
+        """The sort command reports a missing input file without a traceback."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run([sys.executable, "-m", "sorting_algorithms.distributed", "sort",
+                               "--local", "1", "--input-file", str(tmp_path / "missing.txt")],
+                              cwd=root, capture_output=True, text=True, timeout=60)
+        assert proc.returncode == 2 and "cannot read --input-file" in proc.stderr
@@ -0,0 +1,103 @@
+"""
+Unit tests for bulk file input and output.
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms.fileio import iter_chunks, read_values, write_values
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VALUES = [5, -3, 2_147_483_647, -2_147_483_648, 0, 12]
+
+
+class TestFileIO:
+    """Test class for text, CSV and binary formats."""
+
+    @pytest.mark.parametrize("fmt", ["text", "int32", "int64"])
+    def test_round_trip(self, tmp_path, fmt):
+        """Values written in a format read back unchanged."""
+        path = str(tmp_path / f"values.{fmt}")
+        write_values(VALUES, path, fmt)
+        assert read_values(path, fmt) == VALUES
+
+    def test_binary_is_little_endian(self, tmp_path):
+        """Raw int32 output is little-endian, four bytes per value."""
+        path = tmp_path / "values.bin"
+        write_values([1, -1], str(path), "int32")
+        assert path.read_bytes() == b"\x01\x00\x00\x00\xff\xff\xff\xff"
+
+    def test_text_chunks_split_on_whitespace(self, tmp_path):
+        """Chunk boundaries never split a number."""
+        path = tmp_path / "values.txt"
+        path.write_text("\n".join(str(v) for v in range(1000, 1100)) + "\n")
+        chunks = list(iter_chunks(str(path), "text", chunk_bytes=7))
+        assert [v for chunk in chunks for v in chunk] == list(range(1000, 1100))
+
+    def test_csv_column_by_index(self, tmp_path):
+        """Headerless CSV columns are selected by index."""
+        path = tmp_path / "values.csv"
+        path.write_text("1,30\n2,10\n3,20\n")
+        assert read_values(str(path), "csv", "1") == [30, 10, 20]
+
+    def test_csv_column_by_name(self, tmp_path):
+        """A header name selects its column and skips the header row."""
+        path = tmp_path / "values.csv"
+        path.write_text("id,val\n1,30\n2,10\n3,20\n")
+        assert read_values(str(path), "csv", "val") == [30, 10, 20]
+
+
+class TestOutputFile:
+    """Test class for sorting a file to --output-file through the harness."""
+
+    def run_main(self, *args):
+        return subprocess.run([sys.executable, "main.py", *args], cwd=ROOT,
+                              capture_output=True, text=True, timeout=60)
+
+    def test_sorted_output_is_written(self, tmp_path):
+        """A supported input is sorted into the output file."""
+        source, target = tmp_path / "in.txt", tmp_path / "out.txt"
+        write_values(VALUES, str(source), "text")
+        proc = self.run_main("--algo", "block", "--input-file", str(source),
+                             "--output-file", str(target))
+        assert proc.returncode == 0
+        assert read_values(str(target), "text") == sorted(VALUES)
+
+    def test_unproducible_output_fails(self, tmp_path):
+        """An input the algorithm would skip, or a failed sort, is an error, not an empty success."""
+        source, target = tmp_path / "in.txt", tmp_path / "out.txt"
+        write_values(list(range(6000, 0, -1)), str(source), "text")
+        proc = self.run_main("--algo", "bubble", "--input-file", str(source),
+                             "--output-file", str(target))
+        assert proc.returncode == 2 and "n>5000" in proc.stderr
+        assert not target.exists()
+
+        write_values(VALUES, str(source), "text")
+        proc = self.run_main("--algo", "merge", "--input-file", str(source),
+                             "--output-file", str(target))
+        assert proc.returncode == 1 and "no sorted output" in proc.stderr
+
+    def test_output_file_rejects_extra_datasets(self, tmp_path):
+        """--datasets-file would send other datasets to the output, so the pair is refused."""
+        source, target = tmp_path / "in.txt", tmp_path / "out.txt"
+        write_values(VALUES, str(source), "text")
+        proc = self.run_main("--algo", "block", "--input-file", str(source), "--output-file",
+                             str(target), "--datasets-file", "datasets/adversarial.json")
+        assert proc.returncode == 2 and "--datasets-file" in proc.stderr
+        assert not target.exists()
+
+    @pytest.mark.parametrize("content,fmt", [(None, "text"), ("1\n2\nx\n", "text"),
+                                             ("a,b\n1,2\n3\n", "csv")])
+    def test_unreadable_input_is_a_usage_error(self, tmp_path, content, fmt):
+        """Missing files, bad tokens and short CSV rows are reported without a traceback."""
+        source = tmp_path / "in.txt"
+        if content is not None:
+            source.write_text(content)
+        proc = self.run_main("--algo", "block", "--input-file", str(source),
+                             "--input-format", fmt, "--column", "1")
+        assert proc.returncode == 2 and "cannot read --input-file" in proc.stderr
+        assert "Traceback" not in proc.stderr
@@ -0,0 +1,66 @@
+"""
+Unit tests for tracemalloc-based memory reporting.
+"""
+
+import pytest
+import sys
+import os
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.memory import SPACE_CLASSES, check_memory, measure_memory, space_budget
+
+
+def copying_sort(arr):
+    """Sort out of place, allocating a full copy."""
+    return sorted(arr)
+
+
+def in_place_sort(arr):
+    """Sort in place without extra list allocations."""
+    arr.sort()
+    return arr
+
+
+class TestMemoryReporting:
+    """Test class for memory measurement and space-class checks."""
+
+    def test_every_algorithm_declares_space_class(self):
+        """Every registered algorithm declares a known auxiliary-space class."""
+        for spec in ALGORITHMS.specs():
+            assert spec.space_class in SPACE_CLASSES
+
+    def test_copy_is_reported(self):
+        """A full copy shows up as a large block and an O(1) deviation."""
+        arr = list(range(1000, 0, -1))
+        output, stats = measure_memory(copying_sort, arr)
+        assert output == sorted(arr)
+        assert stats["largest_block"] >= 1000 * 8
+        assert check_memory(stats, "O(1)", len(arr))
+        assert not check_memory(stats, "O(n)", len(arr))
+
+    def test_in_place_is_within_constant_budget(self):
+        """An in-place sort stays within the O(1) budget."""
+        arr = list(range(1000, 0, -1))
+        _, stats = measure_memory(in_place_sort, arr)
+        assert not check_memory(stats, "O(1)", len(arr))
+
+    def test_blocks_exclude_earlier_traces(self):
+        """Under an outer tracemalloc session, blocks from before the call are not counted."""
+        arr = list(range(1000, 0, -1))
+        _, alone = measure_memory(in_place_sort, arr)
+        tracemalloc.start()
+        try:
+            ballast = [bytearray(64) for _ in range(500)]  # noqa: F841 (kept alive while measuring)
+            _, nested = measure_memory(in_place_sort, arr)
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+        assert nested["blocks"] < 100 and nested["blocks"] <= alone["blocks"] + 20
+        assert nested["largest_block"] < 64 * 500
+
+    def test_unknown_space_class(self):
+        """Unknown space classes are rejected."""
+        with pytest.raises(ValueError):
+            space_budget("O(n^2)", 10)
@@ -0,0 +1,94 @@
+"""
+Unit tests for the presortedness analyzer.
+"""
+
+import random
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from sorting_algorithms.presortedness import MEASURES, NUMPY_MIN, analyze
+
+
+def brute_force(values):
+    """Inversions, Osc and Rem straight from their definitions, in quadratic time."""
+    n = len(values)
+    inversions = sum(1 for i in range(n) for j in range(i + 1, n) if values[i] > values[j])
+    osc = sum(sum(1 for x in values if min(a, b) < x < max(a, b))
+              for a, b in zip(values, values[1:]))
+    # Longest non-decreasing subsequence by O(n^2) dynamic programming
+    longest = [1] * n
+    for j in range(n):
+        for i in range(j):
+            if values[i] <= values[j]:
+                longest[j] = max(longest[j], longest[i] + 1)
+    return inversions, osc, n - max(longest, default=0)
+
+
+class TestPresortedness:
+    """Test class for disorder measures, the NumPy path, sampling and the report."""
+
+    def test_known_datasets(self):
+        """Sorted, reversed and near-sorted inputs have the textbook measures."""
+        assert analyze(main.DATASETS["sorted"])["inversions"] == 0
+        reverse = analyze(main.DATASETS["reverse"])
+        assert reverse["inversions"] == 10 and reverse["inversion_ratio"] == 1.0
+        assert reverse["runs"] == 5 and reverse["descending_runs"] == 1
+        near = analyze(main.DATASETS["near_sorted"])
+        assert (near["inversions"], near["runs"], near["rem"], near["max_displacement"]) == (1, 2, 1, 1)
+        equal = analyze(main.DATASETS["all_equal"])
+        assert equal["distinct"] == 1 and equal["key_range"] == 0 and equal["longest_run"] == 5
+
+    def test_matches_brute_force(self):
+        """Merge-counted inversions, Osc and Rem match their definitions."""
+        rng = random.Random(0)
+        for _ in range(200):
+            values = [rng.randrange(rng.choice([2, 5, 100])) for _ in range(rng.randrange(40))]
+            measures = analyze(values)
+            assert (measures["inversions"], measures["osc"], measures["rem"]) == brute_force(values)
+            assert measures["distinct"] == len(set(values))
+
+    def test_strings_and_empty(self):
+        """Non-numeric keys have no key range; an empty input is all zeros."""
+        measures = analyze(["b", "a", "c"])
+        assert measures["inversions"] == 1 and measures["key_range"] is None
+        empty = analyze([])
+        assert list(empty) == list(MEASURES)
+        assert empty["n"] == 0 and empty["runs"] == 0 and empty["min"] is None
+
+    def test_numpy_path_matches_python(self):
+        """Vectorized measures equal the pure-Python ones."""
+        np = pytest.importorskip("numpy")
+        rng = random.Random(1)
+        values = [rng.randrange(500) for _ in range(NUMPY_MIN)]
+        values[100:900] = sorted(values[100:900])
+        expected = analyze(values[:NUMPY_MIN - 1])  # below NUMPY_MIN: pure Python
+        measures = analyze(np.array(values[:NUMPY_MIN - 1]))
+        assert measures == expected
+        assert analyze(values) == analyze(np.array(values))
+
+    def test_sampling_estimates(self):
+        """Sampled inputs report the sample size and close estimates."""
+        rng = random.Random(2)
+        values = [rng.randrange(10**6) for _ in range(20000)]
+        exact = analyze(values)
+        sampled = analyze(values, sample_max=4000, rng=random.Random(3))
+        assert exact["sampled"] is None and sampled["sampled"] == 4000
+        assert sampled["runs"] == exact["runs"] and sampled["key_range"] == exact["key_range"]
+        assert sampled["inversion_ratio"] == pytest.approx(exact["inversion_ratio"], abs=0.02)
+        assert sampled["distinct"] == exact["distinct"]
+
+        # Few distinct keys: the sample sees them all, and so does the count
+        few = [rng.randrange(5) for _ in range(20000)]
+        for keys in (few, [str(key) for key in few]):
+            sampled = analyze(keys, sample_max=5000, rng=random.Random(4))
+            assert sampled["sampled"] == 5000
+            assert sampled["distinct"] == 5 and sampled["distinct_ratio"] == 5 / 20000
+
+    def test_text_report_line(self):
+        """format_analysis prints one ANALYSIS line per dataset."""
+        line = main.format_analysis("near_sorted", analyze(main.DATASETS["near_sorted"]))
+        assert line.startswith("ANALYSIS DATASET=near_sorted N=7 INV=1 INV_RATIO=0.048 RUNS=2")
+        assert "RANGE=6" in line and "SAMPLED" not in line
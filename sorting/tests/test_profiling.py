@@ -0,0 +1,67 @@
+"""
+Unit tests for the harness profiling hooks.
+"""
+
+import pstats
+import pytest
+import subprocess
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.profiling import Profiler, count_lines
+
+
+def read_collapsed(path):
+    """Parse a collapsed stack file into {stack: count}."""
+    with open(path) as f:
+        return {stack: int(count) for stack, count in (line.rsplit(" ", 1) for line in f)}
+
+
+class TestProfiling:
+    """Test class for cProfile, sampling and line-count output."""
+
+    def test_cprofile_writes_pstats_and_collapsed(self, tmp_path):
+        """cprofile mode writes a loadable pstats dump and collapsed stacks."""
+        profiler = Profiler("cprofile", str(tmp_path), lines=True)
+        output = profiler.run("bubble", "rev/200", ALGORITHMS["bubble"], list(range(200, 0, -1)))
+        assert output == list(range(1, 201))
+        prefix = tmp_path / "bubble-rev_200"
+        pstats.Stats(str(prefix) + ".pstats")
+        stacks = read_collapsed(str(prefix) + ".collapsed")
+        assert any(stack.startswith("bubble_sort (bubble_sort.py") for stack in stacks)
+        assert (tmp_path / "bubble-rev_200.lines").exists()
+
+    def test_sampling_writes_collapsed(self, tmp_path):
+        """sampling mode writes a collapsed file rooted at the algorithm."""
+        profiler = Profiler("sampling", str(tmp_path), interval=0.0005)
+        profiler.run("selection", "rev", ALGORITHMS["selection"], list(range(600, 0, -1)))
+        stacks = read_collapsed(str(tmp_path / "selection-rev.collapsed"))
+        assert all(stack.startswith("selection_sort") for stack in stacks)
+
+    def test_line_counts_cover_inner_loop(self):
+        """The inner comparison line runs n*(n-1)/2 times in selection sort."""
+        n = 50
+        func = ALGORITHMS["selection"]
+        output, hits = count_lines(func, list(range(n, 0, -1)))
+        assert output == list(range(1, n + 1))
+        assert n * (n - 1) // 2 in hits.values()
+
+    def test_profile_and_memory_are_exclusive(self, tmp_path):
+        """--memory would silently replace --profile, so the pair is a usage error."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run([sys.executable, "main.py", "--algo", "bubble", "--memory",
+                               "--profile", "cprofile", "--profile-dir", str(tmp_path)],
+                              cwd=root, capture_output=True, text=True, timeout=60)
+        assert proc.returncode == 2 and "--profile cannot be combined with --memory" in proc.stderr
+        assert not os.listdir(tmp_path)
+
+    @pytest.mark.parametrize("option", [["--profile", "cprofile"], ["--memory"]])
+    def test_visualize_excludes_measurements(self, option):
+        """--visualize would take precedence and drop the measurement, so it is a usage error."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run([sys.executable, "main.py", "--algo", "bubble", "--visualize", *option],
+                              cwd=root, capture_output=True, text=True, timeout=60)
+        assert proc.returncode == 2
+        assert f"--visualize cannot be combined with {option[0]}" in proc.stderr
@@ -0,0 +1,77 @@
+"""
+Unit tests for the capability-aware algorithm registry and harness routing.
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS, element_types
+import main
+
+
+class TestRegistry:
+    """Test class for registry metadata and routing."""
+
+    def test_specs_match_names(self):
+        """Every registered name has a spec and a callable."""
+        assert [spec.name for spec in ALGORITHMS.specs()] == list(ALGORITHMS)
+        for name in ALGORITHMS:
+            assert callable(ALGORITHMS[name])
+
+    def test_capability_filters(self):
+        """Filters select by declared capabilities."""
+        assert "bubble" in ALGORITHMS.names(stable=True)
+        assert "selection" not in ALGORITHMS.names(stable=True)
+        assert "merge" not in ALGORITHMS.names(in_place=True)
+        # bubble and selection return a sorted copy
+        assert ALGORITHMS.names(in_place=True) == ["quick", "block"]
+
+    def test_submodule_import_keeps_function(self):
+        """Importing an algorithm's submodule first still binds the function on the package."""
+        code = ("import sorting_algorithms.selection_sort\n"
+                "from sorting_algorithms import selection_sort, ALGORITHMS\n"
+                "assert selection_sort is ALGORITHMS['selection'], selection_sort\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+    @pytest.mark.parametrize("values,expected", [
+        ([3, 1, 2], {"int"}),
+        (["b", "a"], {"str"}),
+        ([], set()),
+        ([True, 2], {"int"}),
+        ([1.5, 2.0], {"float"}),
+        ([bytearray(b"a"), b"b"], {"bytes"}),
+        ([None], {"NoneType"}),
+    ])
+    def test_element_types(self, values, expected):
+        """Element types are derived from the values."""
+        assert element_types(values) == expected
+
+    def test_numpy_scalars_are_base_types(self):
+        """NumPy scalars in a list count as int or float, so they are not skipped."""
+        np = pytest.importorskip("numpy")
+        values = list(np.array([3, 1, 2]))
+        assert element_types(values) == {"int"}
+        assert element_types([np.float32(1.5), 2.0]) == {"float"}
+        assert ALGORITHMS.unsupported_reason("bubble", values) is None
+
+    def test_oversize_quadratic_is_skipped(self, capsys):
+        """Quadratic algorithms skip inputs longer than their max_n."""
+        limit = ALGORITHMS.spec("bubble").max_n
+        datasets = {"big": list(range(limit + 1, 0, -1)), "small": [2, 1]}
+        results = main.run_algorithm_on_datasets("bubble", ALGORITHMS["bubble"], datasets=datasets)
+        assert results[0] == {"dataset": "big", "passed": None, "skipped": f"n>{limit}"}
+        assert results[1]["passed"] is True
+        assert "RESULT=SKIP" in capsys.readouterr().out
+        assert main.summarize(results) == (1, 1, 1)
+
+    def test_oversize_truncate(self):
+        """With oversize=truncate the dataset is cut down to max_n."""
+        limit = ALGORITHMS.spec("selection").max_n
+        datasets = {"big": list(range(limit + 10, 0, -1))}
+        results = main.run_algorithm_on_datasets("selection", ALGORITHMS["selection"], "json",
+                                                 datasets=datasets, oversize="truncate")
+        assert results == [{"dataset": "big", "truncated_to": limit, "passed": True}]
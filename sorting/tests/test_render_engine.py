@@ -0,0 +1,424 @@
+"""
+Unit tests for the dirty-region rendering engine used by the visualizers.
+"""
+
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+np = pytest.importorskip("numpy")
+import matplotlib.pyplot as plt
+
+from render_engine import (RASTER_THRESHOLD, BarChart, PlaybackSchedule, RasterChart,
+                           StreamingTracePlayer, TimelineControls, TracePlayer, make_chart)
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.trace import TraceProducer, record, replay
+
+COLORS = {'default': '#2E86AB', 'comparing': '#A23B72', 'swapping': '#F18F01',
+          'sorted': '#C73E1D', 'current': '#7209B7', 'minimum_tracked': '#28A745'}
+
+
+def make_player(algorithm, arr, labels=True):
+    """Build a chart and player for arr on a fresh Agg figure and draw it once."""
+    _, trace = record(ALGORITHMS[algorithm], arr)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.set_xlim(-0.5, len(arr) - 0.5)
+    ax.set_ylim(0, max(arr) + 10)
+    chart = BarChart(ax, arr, COLORS, labels=labels, bar_kwargs=dict(edgecolor='black'))
+    player = TracePlayer(chart, trace.words)
+    fig.canvas.draw()
+    return fig, ax, chart, player
+
+
+def play(ax, player, limit=None):
+    """Step the player like FuncAnimation does, drawing only returned artists."""
+    for count, event in enumerate(player.frames()):
+        if limit is not None and count >= limit:
+            break
+        for artist in player.step(event):
+            ax.draw_artist(artist)
+
+
+class TestRenderEngine:
+    """Test class for dirty tracking and incremental drawing."""
+
+    def test_frame_touches_only_changed_bars(self):
+        """A compare frame restyles two bars, not the whole chart."""
+        fig, ax, chart, player = make_player("bubble", list(range(200, 0, -1)), labels=False)
+        touched = chart.touched
+        play(ax, player, limit=1)
+        assert chart.touched - touched == 2
+        play(ax, player, limit=1)
+        # The swap frame re-colours the same two bars
+        assert chart.touched - touched == 4
+        plt.close(fig)
+
+    @pytest.mark.parametrize("algorithm", ["bubble", "selection"])
+    @pytest.mark.parametrize("labels", [True, False])
+    def test_incremental_frames_match_full_redraw(self, algorithm, labels):
+        """The blitted image equals a full redraw of the same state."""
+        arr = [(i * 37) % 41 + 1 for i in range(30)]
+        fig, ax, chart, player = make_player(algorithm, arr, labels)
+        play(ax, player, limit=400)
+        incremental = np.asarray(fig.canvas.buffer_rgba()).copy()
+        fig.canvas.draw()
+        full = np.asarray(fig.canvas.buffer_rgba())
+        assert (incremental == full).all()
+        plt.close(fig)
+
+    def test_replay_ends_sorted(self):
+        """Playing every event leaves the chart sorted and fully marked."""
+        arr = [5, 3, 9, 1, 1, 7]
+        fig, ax, chart, player = make_player("selection", arr)
+        play(ax, player)
+        assert chart.heights == sorted(arr)
+        assert all(chart.sorted)
+        assert player.finished
+        plt.close(fig)
+
+    def test_visualizer_uses_real_algorithm(self, monkeypatch):
+        """Visualizers replay the registry algorithm; stubs show a placeholder."""
+        import sorting_visualizer
+
+        monkeypatch.setattr(plt, "show", lambda *args, **kwargs: None)
+        visualizer = sorting_visualizer.SortingVisualizer("selection")
+        visualizer.visualize_sort([4, 2, 3, 1])
+        assert visualizer.player.total > 0
+        plt.close(visualizer.fig)
+
+        stub = sorting_visualizer.SortingVisualizer("merge")
+        stub.visualize_sort([3, 1, 2])
+        assert "Not yet implemented" in stub.ax.get_title()
+        plt.close(stub.fig)
+
+    def test_visualize_bubble_sort_wrapper(self, monkeypatch):
+        """The original visualize_bubble_sort entry point replays bubble sort."""
+        import sorting_visualizer
+
+        monkeypatch.setattr(plt, "show", lambda *args, **kwargs: None)
+        visualizer = sorting_visualizer.SortingVisualizer()
+        arr = [4, 2, 3, 1]
+        visualizer.visualize_bubble_sort(arr)
+        assert visualizer.player.total == len(record(ALGORITHMS["bubble"], arr)[1])
+        plt.close(visualizer.fig)
+
+
+def make_raster(arr):
+    """Build a raster chart for arr on a fresh Agg figure and draw it once."""
+    fig, ax = plt.subplots(figsize=(6, 3))
+    ax.set_xlim(-0.5, len(arr) - 0.5)
+    ax.set_ylim(min(arr) - 1, max(arr) + 1)
+    chart = make_chart(ax, arr, COLORS)
+    fig.canvas.draw()
+    return fig, ax, chart
+
+
+class TestRasterChart:
+    """Test class for the decimated large-array mode."""
+
+    def test_large_arrays_are_one_image(self):
+        """Past the threshold there is one image and no per-element artists."""
+        arr = list(range(20_000, 0, -1))
+        fig, ax, chart = make_raster(arr)
+        assert isinstance(chart, RasterChart)
+        assert not ax.patches and not ax.texts
+        assert chart.columns <= ax.bbox.width
+        plt.close(fig)
+
+    def test_columns_show_min_max(self):
+        """Each pixel column spans the value range of its elements."""
+        rng = np.random.default_rng(3)
+        arr = rng.integers(0, 1000, size=RASTER_THRESHOLD * 10).tolist()
+        fig, ax, chart = make_raster(arr)
+        bounds = chart._bounds
+        for c in (0, chart.columns // 2, chart.columns - 1):
+            values = np.array(arr[bounds[c]:bounds[c + 1]])
+            painted = np.flatnonzero(chart.pixels[:, c, 3])
+            assert painted[0] == chart._row(values.min())
+            assert painted[-1] == chart._row(values.max())
+        plt.close(fig)
+
+    def test_incremental_columns_match_full_repaint(self):
+        """Repainting only dirty columns gives the same pixels as repainting all."""
+        rng = np.random.default_rng(7)
+        n = 5_000
+        fig, ax, chart = make_raster(rng.permutation(n).tolist())
+        for _ in range(100):
+            i, j = rng.integers(0, n, size=2)
+            chart.clear_highlights()
+            chart.highlight("swapping", (i, j))
+            chart.swap(i, j)
+            chart.mark_sorted(int(i))
+            ax.draw_artist(chart.artist)
+        incremental = chart.pixels.copy()
+        chart.dirty.update(range(n))
+        chart.apply()
+        assert (incremental == chart.pixels).all()
+        plt.close(fig)
+
+    def test_replay_on_raster(self):
+        """A trace replays onto a raster chart like onto bars."""
+        arr = list(range(RASTER_THRESHOLD + 20, 0, -1))
+        _, trace = record(ALGORITHMS["selection"], arr)
+        fig, ax, chart = make_raster(arr)
+        player = TracePlayer(chart, trace.words)
+        for event in player.frames():
+            player.step(event)
+        ax.draw_artist(chart.artist)
+        assert chart.heights.tolist() == sorted(arr)
+        assert chart._sorted.all()
+        plt.close(fig)
+
+
+class FakeClock:
+    """Clock that advances by one frame each time it is read."""
+
+    def __init__(self, fps):
+        self.now = 0.0
+        self.step = 1 / fps
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestPlaybackSchedule:
+    """Test class for frame-rate-decoupled playback."""
+
+    def test_duration_sets_rate(self):
+        """A fixed duration spreads the trace evenly over the frames."""
+        schedule = PlaybackSchedule(10_000, duration=10, fps=30)
+        assert schedule.rate == 1000
+        assert schedule.due(0) == 1
+        assert schedule.due(1.0) == 1001
+        assert schedule.due(60) == 10_000
+        assert schedule.events_per_frame() == 34
+
+    def test_speed_is_capped_by_max_duration(self):
+        """Slow per-operation pacing is sped up for long traces."""
+        assert PlaybackSchedule(10, speed=0.5).rate == 2
+        assert PlaybackSchedule(10, speed=0.5).interval == 500
+        long = PlaybackSchedule(1_000_000, speed=0.3, max_duration=100)
+        assert long.rate == 10_000
+
+    def test_frames_coalesce_events(self):
+        """Playback takes about duration * fps frames and ends in the right state."""
+        arr = [(i * 37) % 101 for i in range(120)]
+        fig, ax, chart, _ = make_player("selection", arr, labels=False)
+        _, trace = record(ALGORITHMS["selection"], arr)
+        player = TracePlayer(chart, trace.words, duration=2, fps=30, clock=FakeClock(30))
+        frames = 0
+        for batch in player.frames():
+            for artist in player.step(batch):
+                ax.draw_artist(artist)
+            frames += 1
+        assert player.played == player.total
+        assert frames <= 2 * 30 + 2
+        assert chart.heights == sorted(arr)
+        plt.close(fig)
+
+    def test_batch_keeps_latest_state(self):
+        """A batch leaves the chart as replaying its events one by one would."""
+        arr = [9, 4, 7, 1, 8, 2, 6]
+        fig, ax, chart, player = make_player("bubble", arr)
+        steps = [(op, i, j, list(state)) for op, i, j, state in replay(arr, player.words)]
+        player.step([step[:3] for step in steps[:25]])
+        op, i, j, state = steps[24]
+        assert chart.heights == state
+        assert player.played == 25
+        # Only the last event of the batch is highlighted
+        assert set(chart.roles) == {i, j}
+        plt.close(fig)
+
+
+class TestStreamingPlayback:
+    """Test class for playing a trace while a producer thread records it."""
+
+    def test_streamed_playback_matches_recording(self):
+        """Frames consume the producer's queue; the chart ends sorted with every event played."""
+        arr = [(i * 37) % 101 for i in range(120)]
+        fig, ax, chart, _ = make_player("selection", arr, labels=False)
+        _, trace = record(ALGORITHMS["selection"], arr)
+        producer = TraceProducer(ALGORITHMS["selection"], arr, chunk_events=64, max_chunks=4).start()
+        player = StreamingTracePlayer(chart, producer, duration=2, fps=30, clock=FakeClock(30))
+        for batch in player.frames():
+            # Events are polled only as they fall due: the player never runs
+            # more than the queue plus one frame ahead
+            assert player.total - player.played <= 4 * 64 + 64 + 1
+            for artist in player.step(batch):
+                ax.draw_artist(artist)
+        assert player.finished and producer.exhausted
+        assert player.played == player.total == len(trace)
+        assert chart.heights == sorted(arr)
+        plt.close(fig)
+
+    def test_advanced_visualizer_streams_by_default(self, monkeypatch):
+        """Without a recorded trace the advanced visualizer plays a producer; stubs say so."""
+        from advanced_visualizer import AdvancedSortingVisualizer
+
+        monkeypatch.setattr(plt, "show", lambda *args, **kwargs: None)
+        visualizer = AdvancedSortingVisualizer("bubble")
+        visualizer.duration = 1
+        visualizer.visualize_sort([4, 2, 3, 1])
+        player = visualizer.player
+        assert isinstance(player, StreamingTracePlayer)
+        for batch in player.frames():
+            player.step(batch)
+        assert player.chart.heights == [1, 2, 3, 4]
+        assert "Complete" in visualizer.ax1.get_title()
+        plt.close(visualizer.fig)
+
+        stub = AdvancedSortingVisualizer("merge")
+        stub.visualize_sort([3, 1, 2])
+        for batch in stub.player.frames():
+            stub.player.step(batch)
+        assert "Coming Soon" in stub.ax1.get_title()
+        plt.close(stub.fig)
+
+
+class TestSeeking:
+    """Test class for pausing, seeking and the timeline controls."""
+
+    def test_seek_back_and_forward(self):
+        """A seek shows the replayed state; playback continues from there."""
+        arr = [(i * 37) % 41 for i in range(25)]
+        fig, ax, chart, player = make_player("bubble", arr, labels=False)
+        steps = [(list(state), (op, i, j)) for op, i, j, state in replay(arr, player.words)]
+        play(ax, player, limit=300)
+        for position in [10, 0, 299, 250, len(steps) - 1, 2000]:
+            player.seek(position)
+            position = min(position, len(steps))
+            assert player.played == sum(player.counts) == position
+            assert chart.heights == (steps[position - 1][0] if position else arr)
+        player.seek(120)
+        assert set(chart.roles) == set(steps[119][1][1:])
+        play(ax, player)
+        assert player.finished and player.played == player.total
+        assert chart.heights == sorted(arr)
+        plt.close(fig)
+
+    def test_pause_holds_position(self):
+        """Paused frames apply nothing; a finished replay can be sought and replayed."""
+        arr = [9, 4, 7, 1, 8, 2, 6]
+        fig, ax, chart, player = make_player("bubble", arr)
+        frames = player.frames()
+        player.step(next(frames))
+        player.pause()
+        assert [next(frames) for _ in range(3)] == [[], [], []]
+        assert player.played == 1
+        player.resume()
+        for batch in frames:
+            player.step(batch)
+        assert player.finished
+        player.seek(5)
+        assert not player.finished and player.paused and player.played == 5
+        player.resume()
+        play(ax, player)
+        assert player.finished and chart.heights == sorted(arr)
+        plt.close(fig)
+
+    def test_controls(self):
+        """Keys, the slider and the Go to box seek the player; the readout follows."""
+        from matplotlib.backend_bases import KeyEvent
+
+        arr = [(i * 37) % 101 for i in range(60)]
+        fig, ax, chart, player = make_player("bubble", arr, labels=False)
+        controls = TimelineControls(player)
+        assert player.controls is controls
+
+        def press(key):
+            fig.canvas.callbacks.process("key_press_event",
+                                         KeyEvent("key_press_event", fig.canvas, key))
+
+        play(ax, player, limit=20)
+        press(" ")
+        assert player.paused
+        press("right")
+        press("right")
+        assert player.played == 22
+        press("left")
+        assert player.played == 21
+        press("shift+right")
+        assert player.played == 21 + player.timeline.interval
+        press("home")
+        assert player.played == 0
+        press("end")
+        assert player.played == player.total
+        controls.slider.set_val(40)
+        assert player.played == 40 and player.paused
+        controls.goto.set_val("1,000")
+        assert player.played == 1000
+        assert controls.update()
+        assert controls.slider.val == 1000
+        assert controls.readout.get_text() == f"1,000 / {player.total:,} (paused)"
+
+        player.disconnect()
+        assert player.controls is None
+        assert controls.slider.ax not in fig.axes
+        press("home")
+        assert player.played == 1000
+        plt.close(fig)
+
+    def test_streaming_seek_back(self):
+        """A streaming player can seek back over the events it has played."""
+        arr = [(i * 37) % 101 for i in range(120)]
+        fig, ax, chart, _ = make_player("selection", arr, labels=False)
+        steps = [list(state) for *_, state in replay(arr, record(ALGORITHMS["selection"], arr)[1].words)]
+        producer = TraceProducer(ALGORITHMS["selection"], arr, chunk_events=64, max_chunks=4).start()
+        player = StreamingTracePlayer(chart, producer)
+        frames = player.frames()
+        while player.played < 500:
+            player.step(next(frames))
+        player.seek(100)
+        assert chart.heights == steps[99]
+        for batch in frames:
+            player.step(batch)
+        assert player.finished and chart.heights == sorted(arr)
+        player.seek(len(steps) - 1)
+        assert chart.heights == steps[-2]
+        plt.close(fig)
+
+
+class TestRace:
+    """Test class for the side-by-side race view."""
+
+    def test_lanes_share_the_operation_clock(self):
+        """Every lane replays the same number of events per tick; the shorter trace wins."""
+        from advanced_visualizer import RaceVisualizer
+
+        arr = list(range(20, 0, -1))
+        race = RaceVisualizer(["bubble", "selection", "merge"], clock=FakeClock(30))
+        race.duration = 1
+        race.setup_plot(arr)
+        assert set(race.players) == {"bubble", "selection"}
+        assert "not implemented" in race.axes[2].texts[0].get_text()
+        race._init()
+        race.fig.canvas.draw()
+        frames = 0
+        for tick in race.frames():
+            for artist in race.step(tick):
+                artist.axes.draw_artist(artist)
+            for player in race.players.values():
+                assert player.played == min(tick, player.total)
+            frames += 1
+        assert frames <= 30 + 3
+        assert race.finish_order == ["selection", "bubble"]
+        for name, player in race.players.items():
+            assert player.chart.heights == sorted(arr)
+            compares = record(ALGORITHMS[name], arr)[1].counts()["compare"]
+            assert f"{compares:,} comparisons" in race.lane_text(name, player)
+        assert "Selection wins" in race.fig._suptitle.get_text()
+        plt.close(race.fig)
+
+    def test_unknown_race_name_is_a_usage_error(self, monkeypatch, capsys):
+        """An unknown --race name exits through argparse instead of a traceback."""
+        import advanced_visualizer
+
+        monkeypatch.setattr(sys, "argv", ["advanced_visualizer.py", "--race", "bubble,bogus"])
+        with pytest.raises(SystemExit) as exc:
+            advanced_visualizer.main()
+        assert exc.value.code == 2
+        assert "unknown algorithm(s) bogus" in capsys.readouterr().err
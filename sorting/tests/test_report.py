@@ -0,0 +1,71 @@
+"""
+Unit tests for the streamed NDJSON harness report.
+"""
+
+import json
+import subprocess
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_main(*args):
+    """Run main.py and return (exit code, stdout lines)."""
+    proc = subprocess.run([sys.executable, "main.py", *args], cwd=ROOT,
+                          capture_output=True, text=True, timeout=60)
+    return proc.returncode, proc.stdout.splitlines()
+
+
+class TestNdjsonReport:
+    """Test class for per-cell NDJSON records and the trailing summary."""
+
+    def test_records_then_summary_match_json_report(self):
+        """One record per cell, then a summary equal to the JSON report's."""
+        code, lines = run_main("--algo", "all", "--report", "ndjson")
+        records = [json.loads(line) for line in lines]
+        json_code, json_lines = run_main("--algo", "all", "--report", "json")
+        report = json.loads(json_lines[0])
+
+        assert code == json_code
+        *cells, trailer = records
+        assert {r["type"] for r in cells} == {"result"}
+        expected = [dict(result, type="result", algorithm=algorithm["name"])
+                    for algorithm in report["algorithms"] for result in algorithm["results"]]
+        assert cells == expected
+        assert trailer == {
+            "type": "summary",
+            "algorithms": [{"name": a["name"], "summary": a["summary"]} for a in report["algorithms"]],
+            "status": report["status"],
+        }
+
+    def test_analysis_records_come_first(self):
+        """--analyze streams one analysis record per dataset before the results."""
+        code, lines = run_main("--algo", "bubble", "--report", "ndjson", "--analyze")
+        records = [json.loads(line) for line in lines]
+        assert code == 0
+        types = [r["type"] for r in records]
+        analyses = types.count("analysis")
+        assert analyses == types.count("result") and types[:analyses] == ["analysis"] * analyses
+        assert records[-1]["type"] == "summary" and records[-1]["status"] == "OK"
+
+    def test_failfast_still_ends_with_summary(self):
+        """A failfast stop is followed by a FAIL summary of the algorithms run so far."""
+        code, lines = run_main("--algo", "merge", "--report", "ndjson", "--failfast")
+        trailer = json.loads(lines[-1])
+        assert code == 1
+        assert trailer["type"] == "summary" and trailer["status"] == "FAIL"
+        assert [a["name"] for a in trailer["algorithms"]] == ["merge"]
+
+    def test_visualize_keeps_stdout_machine_readable(self):
+        """With --visualize the terminal view and banners go to stderr; stdout is only records."""
+        proc = subprocess.run([sys.executable, "main.py", "--algo", "bubble", "--report", "ndjson",
+                               "--visualize", "--fps", "1000"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=60)
+        records = [json.loads(line) for line in proc.stdout.splitlines()]
+        assert proc.returncode == 0 and records[-1]["type"] == "summary"
+        assert "Testing bubble on" in proc.stderr
+
+        code, lines = run_main("--algo", "bubble", "--report", "json", "--visualize", "--fps", "1000")
+        assert code == 0 and json.loads("\n".join(lines))["status"] == "OK"
@@ -0,0 +1,143 @@
+"""
+Unit tests for the local sort service.
+"""
+
+import asyncio
+import io
+import json
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms.serve import SortServer, _constant
+from sorting_algorithms.serve_bench import SortClient
+from sorting_algorithms.wire import FrameError, pack_frame, read_frame
+
+
+async def with_server(scenario, **options):
+    """Start a one-worker server on an ephemeral port, run scenario(address)."""
+    server = SortServer(workers=1, **options)
+    listener = await server.start("127.0.0.1", 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+    try:
+        return await scenario(f"{host}:{port}")
+    finally:
+        await server.close()
+
+
+class TestSortService:
+    """Test class for the JSON and binary protocols, batching and errors."""
+
+    @pytest.mark.parametrize("protocol", ["json", "binary"])
+    def test_concurrent_requests_are_batched_and_sorted(self, protocol):
+        """Many concurrent small requests all come back sorted."""
+        async def scenario(address):
+            clients = [await SortClient.connect(address, protocol=protocol) for _ in range(8)]
+            try:
+                return await asyncio.gather(*(c.sort([i, 3, -i, 2], "bubble")
+                                              for i, c in enumerate(clients)))
+            finally:
+                for client in clients:
+                    await client.close()
+
+        results = asyncio.run(with_server(scenario, batch_window=0.01))
+        assert results == [sorted([i, 3, -i, 2]) for i in range(8)]
+
+    def test_large_request_bypasses_batching(self):
+        """Requests over large_threshold go straight to the pool."""
+        async def scenario(address):
+            client = await SortClient.connect(address)
+            try:
+                return await client.sort(list(range(300, 0, -1)), "selection")
+            finally:
+                await client.close()
+
+        assert asyncio.run(with_server(scenario, large_threshold=100)) == list(range(1, 301))
+
+    def test_errors_are_reported_per_request(self):
+        """Unknown algorithms produce an error response, not a dropped connection."""
+        async def scenario(address):
+            client = await SortClient.connect(address)
+            try:
+                with pytest.raises(RuntimeError, match="unknown algorithm"):
+                    await client.sort([2, 1], "nope")
+                return await client.sort([2, 1], "bubble")
+            finally:
+                await client.close()
+
+        assert asyncio.run(with_server(scenario)) == [1, 2]
+
+    def test_unwritten_responses_hold_their_slots(self):
+        """A response keeps its slot until written, so a stalled client blocks reading."""
+        class StalledWriter:
+            def __init__(self):
+                self.written = []
+
+            def write(self, data):
+                self.written.append(data)
+
+            async def drain(self):
+                await asyncio.Event().wait()
+
+        async def scenario():
+            server = SortServer(workers=1, max_pending=2)
+            server._slots = asyncio.Semaphore(2)
+            responses = asyncio.Queue()
+            writer = StalledWriter()
+            sender = asyncio.create_task(server._send(responses, writer))
+            for i in range(2):
+                await server._submit(responses, lambda i=i: _constant(b"%d" % i))
+            third = asyncio.create_task(server._submit(responses, lambda: _constant(b"2")))
+            await asyncio.sleep(0.05)
+            blocked = not third.done()
+            third.cancel()
+            sender.cancel()
+            return blocked, writer.written
+
+        blocked, written = asyncio.run(scenario())
+        assert blocked
+        assert written == [b"0"]
+
+    def test_long_json_lines(self):
+        """Requests past 64 KiB are served; lines past the limit get an error reply."""
+        values = list(range(20_000, 0, -1))
+
+        async def scenario(address):
+            client = await SortClient.connect(address)
+            try:
+                result = await client.sort(values, "block")
+                with pytest.raises(RuntimeError, match="longer than"):
+                    await client.sort([1] * 500_000, "block")
+                return result, await client.sort([2, 1], "bubble")
+            finally:
+                await client.close()
+
+        assert asyncio.run(with_server(scenario, line_limit=1 << 20)) == (sorted(values), [1, 2])
+
+    def test_json_request_needs_algo(self):
+        """A JSON request without "algo" is an error, not a default algorithm."""
+        async def scenario(address):
+            reader, writer = await asyncio.open_connection(*address.rsplit(":", 1))
+            writer.write(b'{"id": 7, "data": [2, 1]}\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            writer.close()
+            await writer.wait_closed()
+            return response
+
+        assert asyncio.run(with_server(scenario)) == {"id": 7, "error": "request has no 'algo'"}
+
+
+class TestWire:
+    """Test class for binary frame encoding."""
+
+    def test_frame_round_trip(self):
+        """A packed frame reads back with its name, values and item size."""
+        frame = pack_frame("merge", [5, -1, 2**40])
+        assert read_frame(io.BytesIO(frame)) == ("merge", [5, -1, 2**40], 8)
+
+    def test_bad_magic(self):
+        """Frames without the magic prefix are rejected."""
+        with pytest.raises(FrameError):
+            read_frame(io.BytesIO(b"XX" + pack_frame("merge", [1])[2:]))
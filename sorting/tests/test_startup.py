@@ -0,0 +1,51 @@
+"""
+Import-time budget tests for the CLI and visualizer entry points.
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import budget for `import main`, in microseconds (-X importtime)
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("numpy", "matplotlib")
+
+
+def import_times(*args):
+    """Run python -X importtime with args and return {module: cumulative_us}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Test class for lazy loading and the import-time budget."""
+
+    def test_main_import_budget(self):
+        """Importing main stays within budget and skips heavy modules."""
+        times = import_times("-c", "import main")
+        assert times["main"] < IMPORT_BUDGET_US, f"import main took {times['main']}us"
+        assert not [m for m in times if m.split(".")[0] in HEAVY_MODULES]
+
+    def test_single_algorithm_run_imports_one_module(self):
+        """Running one algorithm imports only that algorithm's module."""
+        times = import_times("main.py", "--algo", "bubble", "--report", "json")
+        loaded = {m for m in times if m.startswith("sorting_algorithms.") and m.endswith("_sort")}
+        assert loaded == {"sorting_algorithms.bubble_sort"}
+
+    @pytest.mark.parametrize("module", ["sorting_visualizer", "advanced_visualizer",
+                                        "bubble_sort_visualizer", "selection_sort_visualizer"])
+    def test_visualizer_import_defers_plotting(self, module):
+        """Visualizer modules import matplotlib and NumPy only when rendering."""
+        times = import_times("-c", f"import {module}")
+        assert not [m for m in times if m.split(".")[0] in HEAVY_MODULES]
@@ -0,0 +1,77 @@
+"""
+Unit tests for the string-key sorting engine.
+"""
+
+import random
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS, string_sort
+from sorting_algorithms.trace import record, replay
+import main
+
+
+def url_keys(n, seed=0):
+    """Keys with a long shared prefix, like log keys and URLs."""
+    rng = random.Random(seed)
+    return [f"https://example.com/api/v1/users/{rng.randrange(1000):04d}/events/{rng.randrange(50)}"
+            for _ in range(n)]
+
+
+class TestStringSort:
+    """Test class for multikey quicksort and NumPy MSD radix."""
+
+    @pytest.mark.parametrize("values", [
+        [],
+        ["b"],
+        ["", "a", "", "ab", "a"],
+        url_keys(500),
+        ["é", "e", "z", "😀", "ß", "E", "\ud800"],
+        [bytes([i % 7, 255 - i % 3]) * (i % 4) for i in range(100)],
+    ])
+    def test_matches_sorted(self, values):
+        """Lists of str or bytes come out in Python's own order."""
+        assert string_sort(values) == sorted(values)
+
+    def test_input_is_not_modified(self):
+        """The input list is left as it was."""
+        values = url_keys(50)
+        before = list(values)
+        string_sort(values)
+        assert values == before
+
+    def test_rejects_mixed_and_non_string_elements(self):
+        """Only all-str or all-bytes inputs are accepted."""
+        with pytest.raises(TypeError):
+            string_sort(["a", b"a"])
+        with pytest.raises(TypeError):
+            string_sort([3, 1, 2])
+
+    def test_trace_replays_on_the_strings(self):
+        """The recorded swaps sort the original strings; every position ends final."""
+        values = url_keys(200, seed=3)
+        output, trace = record(string_sort, values)
+        for _, _, _, state in replay(values, trace.words):
+            pass
+        assert state == output == sorted(values)
+        assert trace.counts()["sorted"] == len(values)
+
+    @pytest.mark.parametrize("dtype", ["S", "U", ">U"])
+    def test_numpy_fixed_width(self, dtype):
+        """NumPy S and U arrays match np.sort, including NUL padding and byte order."""
+        np = pytest.importorskip("numpy")
+        keys = url_keys(3000, seed=5) + ["", "h", "https://"]
+        arr = np.array([k.encode() for k in keys] if dtype == "S" else keys).astype(dtype)
+        result = string_sort(arr)
+        assert result.dtype == arr.dtype
+        assert (result == np.sort(arr)).all()
+
+    def test_harness_routes_by_element_type(self):
+        """The harness runs string datasets and skips int ones."""
+        datasets = {"urls": url_keys(40), "ints": [3, 1, 2]}
+        results = main.run_algorithm_on_datasets("string", ALGORITHMS["string"], "json",
+                                                 datasets=datasets)
+        assert results[0] == {"dataset": "urls", "passed": True}
+        assert results[1]["skipped"] == "type=int"
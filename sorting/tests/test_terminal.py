@@ -0,0 +1,137 @@
+"""
+Unit tests for the incremental ANSI terminal view.
+"""
+
+import io
+import re
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.terminal import TerminalView, visualize
+from sorting_algorithms.trace import record
+
+ESCAPE = re.compile(r"\x1b\[(\??\d*)([A-Za-z])")
+
+
+class Screen:
+    """Minimal terminal that understands the escapes TerminalView writes."""
+
+    def __init__(self):
+        self.lines = {}
+        self.row = self.col = 0
+
+    def feed(self, text):
+        pos = 0
+        while pos < len(text):
+            match = ESCAPE.match(text, pos)
+            if match:
+                arg, command = match.groups()
+                count = int(arg) if arg.isdigit() else 1
+                if command == "A":
+                    self.row -= count
+                elif command == "B":
+                    self.row += count
+                elif command == "G":
+                    self.col = count - 1
+                elif command == "K":
+                    line = self.lines.get(self.row, {})
+                    self.lines[self.row] = {c: ch for c, ch in line.items() if c < self.col}
+                pos = match.end()
+                continue
+            char = text[pos]
+            if char == "\n":
+                self.row += 1
+                self.col = 0
+            elif char == "\r":
+                self.col = 0
+            else:
+                self.lines.setdefault(self.row, {})[self.col] = char
+                self.col += 1
+            pos += 1
+
+    def text(self):
+        return "\n".join("".join(line.get(c, " ") for c in range(max(line, default=-1) + 1)).rstrip()
+                         for _, line in sorted(self.lines.items()))
+
+
+class FakeClock:
+    """Clock that advances by a fixed step each time it is read."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def run_view(algorithm, arr, clock_step, **options):
+    """Sort arr through a view on an ANSI StringIO stream; return (view, stream)."""
+    stream = io.StringIO()
+    view = TerminalView(arr, stream, ansi=True, clock=FakeClock(clock_step), **options)
+    view.start()
+    output, _ = record(ALGORITHMS[algorithm], arr, sink=view.feed)
+    view.finish()
+    assert output == sorted(arr)
+    return view, stream
+
+
+class TestTerminalView:
+    """Test class for drawing once and redrawing only changed cells."""
+
+    @pytest.mark.parametrize("algorithm", ["bubble", "selection"])
+    @pytest.mark.parametrize("width", [60, 17])
+    def test_incremental_screen_matches_full_draw(self, algorithm, width):
+        """Replaying every partial redraw leaves the same screen as one full draw."""
+        arr = [(i * 37) % 41 for i in range(40)]
+        view, stream = run_view(algorithm, arr, clock_step=1.0, width=width, height=6)
+        screen = Screen()
+        screen.feed(stream.getvalue())
+
+        fresh = io.StringIO()
+        final = TerminalView(sorted(arr), fresh, ansi=True, width=width, height=6)
+        final.sorted[:] = b"\x01" * len(arr)
+        final.counts[:] = view.counts
+        final.start()
+        expected = Screen()
+        expected.feed(fresh.getvalue())
+        assert screen.text() == expected.text()
+        assert view.frames > 2
+
+    def test_frames_write_only_changed_cells(self):
+        """A frame after one swap rewrites the two swapped columns, not the chart."""
+        stream = io.StringIO()
+        view = TerminalView([3, 1, 2, 4], stream, ansi=True, height=4, clock=FakeClock(1.0))
+        view.start()
+        drawn = view.cells_written
+        view.feed([0 << 2 | 1, 1])
+        assert 0 < view.cells_written - drawn <= 2 * view.rows
+        assert len(stream.getvalue().split("\x1b[?25l", 1)[1]) < 400
+
+    def test_refresh_is_throttled(self):
+        """Batches arriving faster than the frame interval are coalesced."""
+        arr = list(range(200, 0, -1))
+        slow, _ = run_view("selection", arr, clock_step=1.0, width=50)
+        fast, _ = run_view("selection", arr, clock_step=0.001, fps=10)
+        # One frame per pass vs one per 100 passes, plus start and finish
+        assert slow.frames == len(arr) + 2
+        assert fast.frames <= len(arr) // 100 + 3
+
+    def test_plain_stream_prints_two_frames(self):
+        """Without a terminal the view prints the start and end states, no escapes."""
+        stream = io.StringIO()
+        output = visualize(ALGORITHMS["bubble"], [3, 1, 2], stream)
+        text = stream.getvalue()
+        assert output == [1, 2, 3]
+        assert "\x1b" not in text
+        assert text.count("sorted\n") == 2
+        assert text.rstrip().endswith("3/3 sorted")
+
+    def test_any_comparable_values(self):
+        """Strings are drawn by rank; the smallest value still gets a bar."""
+        view = TerminalView(["pear", "apple", "fig"], io.StringIO(), height=2)
+        assert sorted(view.heights) == [6, 11, 16]
@@ -0,0 +1,122 @@
+"""
+Unit tests for compact event traces recorded by the algorithms.
+"""
+
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms import bubble_sort, selection_sort
+from sorting_algorithms.trace import (COMPARE, SORTED, SWAP, Timeline, Trace, TraceProducer,
+                                      read_trace, record, replay)
+
+TRACEABLE = [bubble_sort, selection_sort]
+
+
+class TestTrace:
+    """Test class for trace recording, storage and replay."""
+
+    @pytest.mark.parametrize("func", TRACEABLE)
+    def test_replay_reproduces_output(self, func):
+        """Replaying the trace on the input yields the algorithm's output."""
+        arr = [5, -1, 3, 3, 0, 9, -7, 2]
+        output, trace = record(func, arr)
+        state = list(arr)
+        for _, _, _, state in replay(arr, trace.words):
+            pass
+        assert state == output == sorted(arr)
+
+    @pytest.mark.parametrize("func", TRACEABLE)
+    def test_untraced_output_unchanged(self, func):
+        """Tracing does not change the result."""
+        arr = [4, 2, 2, 8, -1]
+        assert func(arr) == record(func, arr)[0]
+
+    def test_events_are_eight_bytes(self):
+        """Each event is two int32 words."""
+        output, trace = record(bubble_sort, [3, 2, 1])
+        assert trace.words.typecode == "i"
+        assert len(trace.words) * trace.words.itemsize == 8 * len(trace)
+        assert list(trace.events())[:2] == [(COMPARE, 0, 1), (SWAP, 0, 1)]
+        assert trace.counts() == {"compare": 3, "swap": 3, "write": 0, "sorted": 3}
+
+    def test_file_backed_trace(self, tmp_path):
+        """A file-backed trace writes the same words it would hold in memory."""
+        arr = list(range(40, 0, -1))
+        _, in_memory = record(selection_sort, arr)
+        path = str(tmp_path / "selection.trace")
+        _, on_disk = record(selection_sort, arr, path=path)
+        assert read_trace(path) == in_memory.words
+        assert on_disk.written == len(in_memory)
+        assert len(on_disk) == 0
+
+    def test_ring_keeps_last_events(self):
+        """A ring trace keeps the newest events and counts the dropped ones."""
+        arr = list(range(30, 0, -1))
+        _, full = record(bubble_sort, arr)
+        _, ring = record(bubble_sort, arr, capacity=10)
+        assert len(ring) <= 10 + len(arr)
+        assert ring.dropped + len(ring) == len(full)
+        assert list(ring.events()) == list(full.events())[-len(ring):]
+        assert list(ring.events())[-1][0] == SORTED
+
+    def test_sink_receives_each_pass(self):
+        """A streamed trace hands every event to its sink and keeps none."""
+        arr = list(range(25, 0, -1))
+        _, full = record(selection_sort, arr)
+        batches = []
+        _, streamed = record(selection_sort, arr, sink=lambda words: batches.append(list(words)))
+        assert len(batches) == len(arr)
+        assert [word for batch in batches for word in batch] == list(full.words)
+        assert streamed.written == len(full)
+        assert len(streamed) == 0
+
+    def test_producer_queues_every_event(self):
+        """A producer thread delivers the whole trace, in chunks, with backpressure."""
+        arr = list(range(60, 0, -1))
+        _, full = record(bubble_sort, arr)
+        producer = TraceProducer(bubble_sort, arr, chunk_events=16, max_chunks=2).start()
+        words = []
+        while not producer.exhausted:
+            assert producer.queue.qsize() <= 2
+            for chunk in producer.poll(40):
+                assert len(chunk) <= 32
+                words.extend(chunk)
+        producer.thread.join(timeout=5)
+        assert words == list(full.words)
+        assert producer.output == sorted(arr) and producer.error is None
+
+    def test_producer_stop_abandons_algorithm(self):
+        """stop() unblocks a producer waiting on a full queue and ends its thread."""
+        producer = TraceProducer(bubble_sort, list(range(300, 0, -1)), max_chunks=1).start()
+        producer.poll(1)
+        producer.stop()
+        producer.thread.join(timeout=5)
+        assert not producer.thread.is_alive()
+        assert producer.output is None
+
+    def test_timeline_matches_replay(self):
+        """state_at agrees with a full replay at, between and past the snapshots."""
+        arr = [(i * 37) % 41 for i in range(40)]
+        _, trace = record(bubble_sort, arr)
+        timeline = Timeline(arr, trace.words, interval=50)
+        steps = [(list(state), (op, i, j)) for op, i, j, state in replay(arr, trace.words)]
+        # Seek backwards first, so the snapshots are built on demand
+        for position in [len(steps), 0, 1, 49, 50, 51, 333, len(steps) - 1, len(steps) + 9]:
+            values, done, counts, last = timeline.state_at(position)
+            clamped = min(position, len(steps))
+            expected = steps[clamped - 1] if clamped else (arr, None)
+            assert values == expected[0]
+            assert last == expected[1]
+            assert sum(counts) == clamped
+            assert done == bytearray(1 if (SORTED, k, k) in [step[1] for step in steps[:clamped]]
+                                     else 0 for k in range(len(arr)))
+        assert len(timeline.keyframes) == len(steps) // 50 + 1
+
+    def test_ring_and_file_are_exclusive(self, tmp_path):
+        """A trace cannot be both a ring and file-backed (or streamed)."""
+        with pytest.raises(ValueError):
+            Trace(capacity=10, path=str(tmp_path / "x.trace"))
+        with pytest.raises(ValueError):
+            Trace(capacity=10, sink=print)
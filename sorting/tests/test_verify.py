@@ -0,0 +1,60 @@
+"""
+Unit tests for linear-time output verification.
+"""
+
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorting_algorithms.verify import (fingerprint, is_non_decreasing, is_stable,
+                                       verify_file, verify_sorted, verify_stream)
+
+
+class TestVerify:
+    """Test class for the verifier module."""
+
+    @pytest.mark.parametrize("original,output,expected", [
+        ([3, 1, 2], [1, 2, 3], True),
+        ([], [], True),
+        ([2, 1], None, False),
+        ([2, 1], [2, 1], False),
+        ([1, 1, 2], [1, 2, 2], False),
+        ([1, 2, 3], [1, 2], False),
+    ])
+    def test_verify_sorted(self, original, output, expected):
+        """Order and multiset checks together match the sorted() oracle."""
+        assert verify_sorted(original, output) is expected
+
+    def test_fingerprint_is_order_independent(self):
+        """Permutations share a fingerprint; a changed element does not."""
+        assert fingerprint([5, -1, 3, 3]) == fingerprint([3, 3, 5, -1])
+        assert fingerprint([5, -1, 3, 3]) != fingerprint([5, -1, 3, 4])
+
+    def test_stream_checks_chunk_boundaries(self):
+        """Order is checked across chunk boundaries, not just within."""
+        expected = fingerprint([1, 2, 3, 4])
+        assert verify_stream([[1, 2], [3, 4]], expected)
+        assert not verify_stream([[1, 3], [2, 4]], expected)
+        assert not verify_stream([[1, 2], [3, 5]], expected)
+
+    def test_verify_file(self, tmp_path):
+        """Text output files are verified in small streamed chunks."""
+        path = tmp_path / "out.txt"
+        path.write_text("\n".join(str(v) for v in range(-50, 50)) + "\n")
+        assert verify_file(str(path), expected=fingerprint(list(range(-50, 50))), chunk_bytes=16)
+        assert not verify_file(str(path), expected=fingerprint(list(range(100))), chunk_bytes=16)
+
+    def test_is_stable(self):
+        """Stability holds only if equal keys keep their input order."""
+        records = [(1, "a"), (0, "b"), (1, "c")]
+        assert is_stable(records, [(0, "b"), (1, "a"), (1, "c")], key=lambda r: r[0])
+        assert not is_stable(records, [(0, "b"), (1, "c"), (1, "a")], key=lambda r: r[0])
+
+    def test_numpy_matches_list(self):
+        """NumPy arrays use the vectorized path with identical fingerprints."""
+        np = pytest.importorskip("numpy")
+        values = [7, -3, 2**40, 0, 7]
+        assert fingerprint(np.array(values)) == fingerprint(values)
+        assert is_non_decreasing(np.sort(np.array(values)))
+        assert verify_sorted(np.array(values), np.sort(np.array(values)))
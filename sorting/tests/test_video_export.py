@@ -0,0 +1,67 @@
+"""
+Unit tests for headless video/GIF export.
+"""
+
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+Image = pytest.importorskip("PIL.Image")
+
+import video_export
+from selection_sort_visualizer import SelectionSortVisualizer
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.trace import record
+from sorting_visualizer import SortingVisualizer
+
+ARR = [5, 3, 9, 1, 7, 2]
+
+
+def render_all(visualizer_class, algorithm, chunk_frames, stride=1):
+    """Render every frame in-process with the given chunking."""
+    _, trace = record(ALGORITHMS[algorithm], ARR)
+    tasks = video_export.chunk_tasks(visualizer_class, algorithm, ARR, trace.words,
+                                     stride, chunk_frames, False)
+    frames = [frame for task in tasks for frame in video_export.render_chunk(task)]
+    for visualizer in video_export._VISUALIZERS.values():
+        matplotlib.pyplot.close(visualizer.fig)
+    video_export._VISUALIZERS.clear()
+    return trace, frames
+
+
+class TestVideoExport:
+    """Test class for chunked offscreen rendering and the GIF writer."""
+
+    @pytest.mark.parametrize("visualizer_class", [SortingVisualizer, SelectionSortVisualizer])
+    def test_chunks_render_like_one_pass(self, visualizer_class):
+        """Starting workers from replayed snapshots gives the same frames."""
+        trace, whole = render_all(visualizer_class, "selection", chunk_frames=10_000)
+        _, chunked = render_all(visualizer_class, "selection", chunk_frames=7)
+        assert len(whole) == len(trace) + 1
+        assert chunked == whole
+
+    def test_stride_groups_events(self):
+        """With stride k each frame covers k events, plus the final frame."""
+        trace, frames = render_all(SortingVisualizer, "bubble", chunk_frames=4, stride=3)
+        assert len(frames) == -(-len(trace) // 3) + 1
+
+    def test_gif_export_with_workers(self, tmp_path):
+        """A multi-process export writes an animated, looping GIF."""
+        path = str(tmp_path / "run.gif")
+        frames = video_export.export_run(path, SortingVisualizer, "bubble", ARR,
+                                         fps=20, workers=2, chunk_frames=5)
+        gif = Image.open(path)
+        assert gif.n_frames == frames == len(record(ALGORITHMS["bubble"], ARR)[1]) + 1
+        assert gif.info["loop"] == 0
+        assert gif.info["duration"] == 50
+
+    def test_stub_and_missing_encoder(self, tmp_path, monkeypatch):
+        """Stubs have nothing to export; non-GIF formats need ffmpeg."""
+        with pytest.raises(ValueError):
+            video_export.export_run(str(tmp_path / "m.gif"), SortingVisualizer, "merge", ARR)
+        monkeypatch.setattr(video_export.shutil, "which", lambda name: None)
+        with pytest.raises(RuntimeError):
+            video_export.open_writer(str(tmp_path / "run.mp4"), 30)
@@ -0,0 +1,289 @@
+"""
+Headless video/GIF export of a visualizer's sorting run.
+
+The run's event trace is recorded once in the parent process and cut into
+chunks of frames.  For each chunk the parent replays the trace cheaply
+(plain lists, no drawing) to get the bar heights, sorted bitmap and counters
+at the chunk start, and sends that snapshot with the chunk's trace words to
+a worker process.  Workers render offscreen on the Agg backend with the
+visualizer's own setup_plot() and player, using the same dirty-region
+blitting as the interactive window, and return each frame as PNG bytes.
+
+Frames are written in order as chunks complete.  At most 2 * workers chunks
+are in flight, so memory stays bounded however long the run is.  .gif files
+are streamed frame by frame through Pillow (each frame with its own
+palette); other formats such as .mp4 are piped into ffmpeg.
+
+Usage (any visualizer):
+    python advanced_visualizer.py --algo selection --array 5,3,9,1 --export run.gif
+    python sorting_visualizer.py --export run.mp4 --fps 60 --duration 20 --workers 8
+"""
+
+import io
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from render_engine import DEFAULT_FPS, PlaybackSchedule
+from sorting_algorithms import ALGORITHMS
+from sorting_algorithms.lazy_import import lazy_import
+from sorting_algorithms.trace import SORTED, SWAP, WRITE, decode, record
+
+matplotlib = lazy_import("matplotlib")
+plt = lazy_import("matplotlib.pyplot")
+Image = lazy_import("PIL.Image")
+GifImagePlugin = lazy_import("PIL.GifImagePlugin")
+
+# Frames rendered per worker task
+CHUNK_FRAMES = 64
+
+# Per-process visualizers, keyed by (class, algorithm name)
+_VISUALIZERS = {}
+
+
+class GifWriter:
+    """Write a GIF one frame at a time instead of holding every frame."""
+
+    def __init__(self, path, fps):
+        self.file = open(path, "wb")
+        self.duration = 1000 / fps
+        self.frames = 0
+
+    def write(self, png):
+        """Append a palette ("P" mode) PNG frame."""
+        frame = Image.open(io.BytesIO(png))
+        if not self.frames:
+            # GIF89a header with a loop-forever extension
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0})
+            self.file.write(b"".join(header))
+        for data in GifImagePlugin.getdata(frame, duration=self.duration, include_color_table=True):
+            self.file.write(data)
+        self.frames += 1
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+class FFmpegWriter:
+    """Pipe PNG frames into an ffmpeg process."""
+
+    def __init__(self, path, fps, ffmpeg):
+        command = [ffmpeg, "-y", "-loglevel", "error",
+                   "-f", "image2pipe", "-c:v", "png", "-framerate", str(fps), "-i", "-"]
+        if path.lower().endswith(".mp4"):
+            # H.264 needs even dimensions and 4:2:0 for most players
+            command += ["-c:v", "libx264", "-pix_fmt", "yuv420p",
+                        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+        self.frames = 0
+
+    def write(self, png):
+        self.process.stdin.write(png)
+        self.frames += 1
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+def open_writer(path, fps):
+    """Return a frame writer for path's format."""
+    if path.lower().endswith(".gif"):
+        return GifWriter(path, fps)
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError(f"exporting '{path}' needs ffmpeg on PATH (or use a .gif path)")
+    return FFmpegWriter(path, fps, ffmpeg)
+
+
+def use_agg():
+    """Process-pool initializer: render offscreen."""
+    matplotlib.use("Agg")
+
+
+def chunk_tasks(visualizer_class, algorithm_name, arr, words, stride, chunk_frames, palette):
+    """
+    Cut a trace into render tasks, each with the chart state at its start.
+
+    Yields:
+        dict: One task per chunk of chunk_frames frames (stride events each)
+    """
+    heights = list(arr)
+    sorted_bits = bytearray(len(heights))
+    counts = [0, 0, 0, 0]
+    total = len(words) // 2
+    chunk_events = chunk_frames * stride
+    start = 0
+    while True:
+        end = min(start + chunk_events, total)
+        chunk = words[2 * start:2 * end]
+        yield {
+            "visualizer": visualizer_class,
+            "algorithm": algorithm_name,
+            "arr": arr,
+            "heights": list(heights),
+            "sorted": bytes(sorted_bits),
+            "counts": list(counts),
+            "played": start,
+            "total": total,
+            "words": chunk,
+            "stride": stride,
+            "last": end == total,
+            "palette": palette,
+        }
+        if end == total:
+            return
+        for op, i, j in decode(chunk):
+            if op == SWAP:
+                heights[i], heights[j] = heights[j], heights[i]
+            elif op == WRITE:
+                heights[i] = j
+            elif op == SORTED:
+                sorted_bits[i] = 1
+            counts[op] += 1
+        start = end
+
+
+def _visualizer(visualizer_class, algorithm_name):
+    """Create (once per process) the visualizer a worker draws with."""
+    key = (visualizer_class, algorithm_name)
+    if key not in _VISUALIZERS:
+        _VISUALIZERS[key] = visualizer_class(algorithm_name)
+    return _VISUALIZERS[key]
+
+
+def _grab(canvas, palette):
+    """Encode the canvas as PNG bytes, quantized to 256 colours if palette."""
+    image = Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(),
+                             "raw", "RGBA", 0, 1).convert("RGB")
+    if palette:
+        image = image.quantize(256)
+    out = io.BytesIO()
+    image.save(out, format="PNG", compress_level=1)
+    return out.getvalue()
+
+
+def render_chunk(task):
+    """
+    Render one chunk of frames offscreen.
+
+    Args:
+        task: A dict from chunk_tasks()
+
+    Returns:
+        list: PNG bytes, one per frame
+    """
+    visualizer = _visualizer(task["visualizer"], task["algorithm"])
+    visualizer.setup_plot(task["arr"])
+    chart = visualizer.chart
+    chart.heights[:] = task["heights"]
+    chart.sorted[:] = task["sorted"]
+    chart.dirty.update(range(len(chart)))
+
+    player = visualizer.make_player(task["words"])
+    player.total = task["total"]
+    player.counts[:] = task["counts"]
+    player.played = task["played"]
+    visualizer.player = player
+    player._init()
+    canvas = visualizer.fig.canvas
+    canvas.draw()
+    # Like a blitted FuncAnimation: restore each animated axes, then draw
+    backgrounds = {}
+    for artist in [chart.artist, *player._extra]:
+        if artist.axes not in backgrounds:
+            backgrounds[artist.axes] = canvas.copy_from_bbox(artist.axes.bbox)
+
+    frames = []
+    events = list(decode(task["words"]))
+    stride = task["stride"]
+    for start in range(0, len(events), stride):
+        artists = player.step(events[start:start + stride])
+        for background in backgrounds.values():
+            canvas.restore_region(background)
+        for artist in artists:
+            artist.axes.draw_artist(artist)
+        frames.append(_grab(canvas, task["palette"]))
+    if task["last"]:
+        player.step(None)
+        canvas.draw()
+        frames.append(_grab(canvas, task["palette"]))
+    player.disconnect()
+    return frames
+
+
+def export_run(path, visualizer_class, algorithm_name, arr, fps=DEFAULT_FPS, stride=1,
+               duration=None, workers=None, chunk_frames=CHUNK_FRAMES):
+    """
+    Record algorithm_name on arr and export its animation to path.
+
+    Args:
+        path: Output file; .gif is written with Pillow, anything else with ffmpeg
+        visualizer_class: Visualizer whose plot and player are rendered
+        algorithm_name: Registry name of the algorithm
+        arr: Input array
+        fps: Frames per second of the output
+        stride: Trace events per frame
+        duration: Seconds the exported animation should last (overrides stride)
+        workers: Render processes (default: CPU count); 1 renders in-process
+        chunk_frames: Frames per worker task
+
+    Returns:
+        int: Number of frames written
+    """
+    output, trace = record(ALGORITHMS[algorithm_name], arr)
+    if output is None:
+        raise ValueError(f"{algorithm_name} sort is not implemented yet; nothing to export")
+    if duration:
+        stride = PlaybackSchedule(len(trace), duration=duration, fps=fps).events_per_frame()
+    workers = workers or os.cpu_count() or 1
+    tasks = chunk_tasks(visualizer_class, algorithm_name, list(arr), trace.words,
+                        max(stride, 1), chunk_frames, path.lower().endswith(".gif"))
+    writer = open_writer(path, fps)
+    try:
+        if workers == 1:
+            use_agg()
+            try:
+                for task in tasks:
+                    for frame in render_chunk(task):
+                        writer.write(frame)
+            finally:
+                for visualizer in _VISUALIZERS.values():
+                    plt.close(visualizer.fig)
+                _VISUALIZERS.clear()
+        else:
+            with ProcessPoolExecutor(workers, initializer=use_agg) as pool:
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.submit(render_chunk, task))
+                    if len(pending) >= 2 * workers:
+                        for frame in pending.popleft().result():
+                            writer.write(frame)
+                while pending:
+                    for frame in pending.popleft().result():
+                        writer.write(frame)
+    finally:
+        writer.close()
+    return writer.frames
+
+
+def add_export_arguments(parser):
+    """Add --export and its options (see also add_playback_arguments())."""
+    parser.add_argument("--export", metavar="PATH",
+                        help="Render offscreen to PATH (.gif, or .mp4 etc. with ffmpeg) "
+                             "instead of opening a window")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="Trace events per exported frame (ignored with --duration)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Render processes for --export (default: CPU count)")
+
+
+def export_from_args(args, visualizer_class, arr):
+    """Run export_run() from parsed visualizer arguments and report the result."""
+    frames = export_run(args.export, visualizer_class, args.algo, arr, fps=args.fps,
+                        stride=args.stride, duration=args.duration, workers=args.workers)
+    print(f"Wrote {frames} frames to {args.export}")